@@ -165,6 +165,7 @@ class CircuitDesigner(ctk.CTkFrame):
         x = event.width - 100  # Button width + padding
         y = 10
         self.canvas.coords("reset_button", x, y)
+        self.canvas.coords("hydraulics", 10, event.height - 10)
     
     def _handle_reset(self):
         """Handle reset button click with confirmation"""
@@ -762,6 +763,7 @@ class CircuitDesigner(ctk.CTkFrame):
         self.update_component_label(to_id)
         
         print(f"Connection created: {actual_from_item['name']} -> {actual_to_item['name']}")
+        self._on_circuit_changed()
         return True
 
     def _determine_connection_direction(self, item1_id, item2_id):
@@ -837,6 +839,25 @@ class CircuitDesigner(ctk.CTkFrame):
         """Update connection parameters"""
         connection['parameters'] = new_params
         print(f"Updated connection parameters: {new_params}")
+        self._on_circuit_changed()
+
+    def _on_circuit_changed(self):
+        """Let the circuits page re-solve the hydraulics of this circuit"""
+        if self.circuits_controller and hasattr(self.circuits_controller, 'on_circuit_edited'):
+            self.circuits_controller.on_circuit_edited(self)
+
+    def show_hydraulics(self, text):
+        """Show a one-line hydraulic summary in the bottom-left corner of the canvas"""
+        self.canvas.delete("hydraulics")
+        if text:
+            self.canvas.create_text(
+                10, self.canvas.winfo_height() - 10,
+                text=text,
+                anchor="sw",
+                fill="#243783",
+                font=("Arial", 10),
+                tags=("hydraulics",)
+            )
     
     def update_component_label(self, item_id):
         """Update component label with connection info"""
@@ -869,6 +890,7 @@ class CircuitDesigner(ctk.CTkFrame):
         # Remove from list
         self.connectors.remove(connection)
         print(f"Deleted connection between {connection.get('from_name', 'Unknown')} and {connection.get('to_name', 'Unknown')}")
+        self._on_circuit_changed()
     
     def delete_item(self, item_id):
         """Delete a component and its connections"""
@@ -913,6 +935,7 @@ class CircuitDesigner(ctk.CTkFrame):
                 self.detail_list.mark_component_available(component_id)
         
         del self.placed_items[item_id]
+        self._on_circuit_changed()
     
     def highlight_item(self, item_id, highlight=True):
         """Highlight or unhighlight an item"""
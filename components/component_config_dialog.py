@@ -4,6 +4,8 @@ from components.custom_button import CustomButton
 from utils.appearance_manager import AppearanceManager
 from utils.open_image import open_icon
 from utils.data_manager import DataManager
+from utils.search_index import SearchIndex
+from components.search_picker import SearchPicker
 
 class ComponentConfigDialog(ctk.CTkToplevel):
     """
@@ -34,6 +36,10 @@ class ComponentConfigDialog(ctk.CTkToplevel):
         # Register with appearance manager
         AppearanceManager.register(self)
         
+        # Refresh the component list if the catalog is edited while open
+        self.controller.data_manager.subscribe(self)
+        self.nozzle_catalog = self.controller.data_manager.get_nozzle_catalog()
+        
         # Create UI
         self._create_ui()
         
@@ -184,34 +190,38 @@ class ComponentConfigDialog(ctk.CTkToplevel):
         field_widget.grid(row=row, column=1, sticky="ew", pady=10)
     
     def _create_component_dropdown(self):
-        """Create component dropdown"""
+        """Create the type-ahead component picker"""
         self.component_var = ctk.StringVar(value="Select component")
         
-        # Get component data from DataManager
-        component_data = self.controller.data_manager.get_component_data()
-
-        # Extract component names for dropdown
-        component_names = []
-        if component_data:
-            for item in component_data:
-                name = item.get('Component Name')
-                if name:
-                    component_names.append(str(name))
-        
-        # Fallback to default values if no data found
-        if not component_names:
-            component_names = ["Component A", "Component B", "Component C", "Component D"]
-        
-        dropdown = ctk.CTkOptionMenu(
+        picker = SearchPicker(
             self.form_frame,
+            search_index=self._component_index(),
             variable=self.component_var,
-            values=component_names,
+            placeholder="Select component",
             font=self.controller.fonts.get("default", None),
             dropdown_font=self.controller.fonts.get("default", None),
             width=250
         )
-        self.component_dropdown = dropdown
-        return dropdown
+        self.component_dropdown = picker
+        return picker
+    
+    def _component_index(self) -> SearchIndex:
+        """Search index over the component names of the DataManager catalog"""
+        index = self.controller.data_manager.get_search_index('washing_components', 'Component Name')
+        
+        # Fallback to default values if no data found
+        if not len(index):
+            index = SearchIndex(["Component A", "Component B", "Component C", "Component D"])
+        return index
+    
+    def on_catalog_changed(self, file_keys):
+        """Refresh the pickers after the component or nozzle catalog was reloaded"""
+        if 'washing_components' in file_keys:
+            self.component_dropdown.set_index(self._component_index())
+        if 'nozzles' in file_keys:
+            self.nozzle_catalog = self.controller.data_manager.get_nozzle_catalog()
+            self.nozzle_ref_dropdown.configure(values=self.nozzle_catalog.names() or ["No data"])
+            self._on_nozzle_ref_change(self.nozzle_ref_var.get())
     
     def _create_nozzle_ref_dropdown(self):
         """Create nozzle reference dropdown"""
@@ -219,12 +229,13 @@ class ComponentConfigDialog(ctk.CTkToplevel):
         dropdown = ctk.CTkOptionMenu(
             self.form_frame,
             variable=self.nozzle_ref_var,
-            values=["Nozzle Type A", "Nozzle Type B", "Nozzle Type C"],
+            values=self.nozzle_catalog.names() or ["No data"],
             font=self.controller.fonts.get("default", None),
             dropdown_font=self.controller.fonts.get("default", None),
             width=250,
             command=self._on_nozzle_ref_change
         )
+        self.nozzle_ref_dropdown = dropdown
         return dropdown
     
     def _create_info_labels_row(self, row: int):
@@ -325,18 +336,15 @@ class ComponentConfigDialog(ctk.CTkToplevel):
         return frame
     
     def _on_nozzle_ref_change(self, value):
-        """Update supplier based on nozzle reference selection"""
-        # Simulate supplier lookup based on nozzle type
-        supplier_map = {
-            "Nozzle Type A": "Supplier ABC",
-            "Nozzle Type B": "Supplier XYZ",
-            "Nozzle Type C": "Supplier DEF"
-        }
-        self.supplier_value = supplier_map.get(value, "XXXXXX")
+        """Update supplier and type from the nozzle catalog"""
+        info = self.nozzle_catalog.info(value)
+        self.supplier_value = info.supplier if info else "XXXXXX"
         
-        # Update the supplier label
+        # Update the supplier and type labels
         if hasattr(self, 'supplier_label'):
             self.supplier_label.configure(text=f"Supplier: {self.supplier_value}")
+        if hasattr(self, 'type_label'):
+            self.type_label.configure(text=f"Type: {info.type if info else 'fixed'}")
     
     def _show_tooltip(self, event, text):
         """Show tooltip (simplified version)"""
@@ -366,6 +374,7 @@ class ComponentConfigDialog(ctk.CTkToplevel):
         
         # Set nozzle ref
         self.nozzle_ref_var.set(self.edit_data.get("Nozzle Ref", ""))
+        self._on_nozzle_ref_change(self.nozzle_ref_var.get())
     
     def _convert_to_mm(self, value: float, unit: str) -> float:
         """Convert a distance value to millimeters"""
@@ -389,7 +398,7 @@ class ComponentConfigDialog(ctk.CTkToplevel):
             self._show_error("Please select a component")
             return
         
-        if self.nozzle_ref_var.get() == "Select reference":
+        if self.nozzle_ref_var.get() in ("Select reference", "No data"):
             self._show_error("Please select nozzle reference")
             return
         
@@ -467,4 +476,5 @@ class ComponentConfigDialog(ctk.CTkToplevel):
     def destroy(self):
         """Clean up when destroying"""
         AppearanceManager.unregister(self)
+        self.controller.data_manager.unsubscribe(self)
         super().destroy()
\ No newline at end of file
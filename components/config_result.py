@@ -1,5 +1,10 @@
 import customtkinter as ctk
+import numpy as np
+from PIL import Image
 from components.custom_button import CustomButton
+from components.temperature_plot import TemperaturePlot
+from utils.hydraulics import circuit_entries, operating_temperature
+from utils.pump_catalog import LITRES_PER_MINUTE
 
 
 class ConfigResult(ctk.CTkFrame):
@@ -16,9 +21,123 @@ class ConfigResult(ctk.CTkFrame):
         self._create_general_settings_block()
 
         # --- Circuits Blocks ---
-        circuits = self.config.get("circuits", [])
-        for idx, circuit in enumerate(circuits):
-            self._create_circuit_block(circuit, idx+1)
+        self.results = self._solve_circuits()
+        self.nozzles = self._evaluate_nozzles()
+        self.cleaning = self._predict_cleanliness()
+        for idx, result in enumerate(self.results):
+            self._create_circuit_block(result, idx+1)
+
+        # --- Spray coverage ---
+        self.coverage = self._spray_coverage()
+        if self.coverage:
+            self._create_coverage_block()
+
+        # --- Temperature envelope ---
+        self.sweeps = self._sweep_temperatures()
+        if self.sweeps:
+            self._create_temperature_block()
+
+    def _solve_circuits(self):
+        """Steady-state hydraulics of every saved circuit"""
+        if not circuit_entries(self.config):
+            return []
+        try:
+            return self.controller.get_hydraulic_solver().solve_configuration(self.config)
+        except Exception as e:
+            print(f"Error solving circuits: {e}")
+            return []
+
+    def _evaluate_nozzles(self):
+        """Jet of every nozzle of the solved circuits, keyed by (pump index, output, item id)"""
+        solver = self.controller.get_hydraulic_solver()
+        if not self.results or solver.nozzle_catalog is None:
+            return {}
+        try:
+            performance = solver.nozzle_catalog.evaluate_configuration(self.config, self.results, solver.fluid_table)
+        except Exception as e:
+            print(f"Error evaluating nozzles: {e}")
+            return {}
+        return {(nozzle.pump_index, nozzle.output, nozzle.component): nozzle for nozzle in performance}
+
+    def _predict_cleanliness(self):
+        """Cleanliness each sequence task reaches, grouped by (pump index, output)"""
+        if not self.results:
+            return {}
+        try:
+            cleaning = self.controller.get_cleanliness_model().evaluate(self.config, self.results)
+        except Exception as e:
+            print(f"Error predicting cleanliness: {e}")
+            return {}
+        grouped = {}
+        for item in cleaning:
+            grouped.setdefault((item.pump_index, item.output), []).append(item)
+        return grouped
+
+    def _spray_coverage(self):
+        """Footprint of every washing component's nozzle, by component name"""
+        try:
+            return self.controller.get_coverage_engine().configuration_coverage(self.config)
+        except Exception as e:
+            print(f"Error computing spray coverage: {e}")
+            return {}
+
+    def _create_coverage_block(self):
+        block = ctk.CTkFrame(self.main_container, corner_radius=10, border_width=1, border_color="#cccccc", fg_color="transparent")
+        block.pack(fill="x", pady=(0, 10), padx=5)
+
+        title = ctk.CTkLabel(block, text="Spray coverage", font=self.controller.fonts.get("subtitle", None), anchor="w")
+        title.grid(row=0, column=0, sticky="w", padx=10, pady=(8, 2), columnspan=6)
+
+        for i, (name, raster) in enumerate(self.coverage.items()):
+            cell = ctk.CTkFrame(block, fg_color="transparent")
+            cell.grid(row=1 + i // 6, column=i % 6, padx=10, pady=(0, 10), sticky="n")
+            # Keep the surface's aspect ratio within a 120 px box
+            scale = 120.0 / max(raster.width, raster.height)
+            size = (max(int(raster.width * scale), 1), max(int(raster.height * scale), 1))
+            image = ctk.CTkImage(light_image=_heat_map(raster.flux), size=size)
+            ctk.CTkLabel(cell, text="", image=image).pack()
+            ctk.CTkLabel(cell, text=f"{name}\ncoverage {raster.coverage:.0%}, on target {raster.captured:.0%}",
+                         font=("Arial", 10), justify="center").pack()
+
+    def _sweep_temperatures(self):
+        """Every circuit over the operating temperature envelope, in one batch"""
+        if not circuit_entries(self.config):
+            return []
+        try:
+            return self.controller.get_hydraulic_solver().sweep_temperatures(self.config)
+        except Exception as e:
+            print(f"Error sweeping temperatures: {e}")
+            return []
+
+    def _create_temperature_block(self):
+        block = ctk.CTkFrame(self.main_container, corner_radius=10, border_width=1, border_color="#cccccc", fg_color="transparent")
+        block.pack(fill="x", pady=(0, 10), padx=5)
+
+        title = ctk.CTkLabel(block, text="Temperature envelope", font=self.controller.fonts.get("subtitle", None), anchor="w")
+        title.grid(row=0, column=0, sticky="w", padx=10, pady=(8, 2), columnspan=2)
+
+        temperatures = self.sweeps[0].temperatures
+        if self.sweeps[0].clamped.any():
+            fluid_table = self.controller.get_hydraulic_solver().fluid_table
+            warning = fluid_table.range_warning(self.sweeps[0].liquid_name, temperatures)
+            ctk.CTkLabel(block, text=f"⚠ {warning}", text_color="orange", font=("Arial", 10),
+                         anchor="w").grid(row=2, column=0, sticky="w", padx=10, pady=(0, 8), columnspan=2)
+        flow, nozzle_pressure = [], []
+        for sweep in self.sweeps:
+            for output in sweep.outputs:
+                label = f"P{sweep.pump_index + 1} out {output.output}"
+                flow.append((label, output.flow / LITRES_PER_MINUTE))
+                if output.nozzles:
+                    # The weakest nozzle decides whether the output still washes
+                    nozzle_pressure.append((label, output.nozzle_pressure.min(axis=1) / 1000.0))
+
+        marker = operating_temperature(self.config.get("general_settings", {}) or {})
+        flow_plot = TemperaturePlot(block, self.controller, title="Output flow", unit="L/min")
+        flow_plot.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+        flow_plot.plot(temperatures, flow, marker)
+        pressure_plot = TemperaturePlot(block, self.controller, title="Lowest nozzle pressure", unit="kPa")
+        pressure_plot.grid(row=1, column=1, padx=10, pady=(0, 10), sticky="nsew")
+        pressure_plot.plot(temperatures, nozzle_pressure, marker)
 
     def _create_general_settings_block(self):
         general = self.config.get("general_settings", {})
@@ -47,53 +166,111 @@ class ConfigResult(ctk.CTkFrame):
             ctk.CTkLabel(block, text=label, font=self.controller.fonts.get("bold", None)).grid(row=3, column=i, sticky="w", padx=10, pady=(8,2))
             ctk.CTkLabel(block, text=general.get(key, ""), font=self.controller.fonts.get("default", None)).grid(row=4, column=i, sticky="w", padx=10)
 
-    def _create_circuit_block(self, circuit, idx):
+    def _create_circuit_block(self, result, idx):
         block = ctk.CTkFrame(self.main_container, corner_radius=10, border_width=1, border_color="#cccccc", fg_color="#f8f8f8")
         block.pack(fill="x", pady=(0, 10), padx=5)
 
         # Circuit title
         ctk.CTkLabel(block, text=f"CIRCUIT {idx}", font=self.controller.fonts.get("subtitle", None), anchor="w").pack(anchor="w", padx=10, pady=(8, 2))
 
-        # Horizontal layout for the circuit diagram
+        for warning in result.warnings:
+            ctk.CTkLabel(block, text=f"⚠ {warning}", text_color="orange", font=("Arial", 10), anchor="w").pack(anchor="w", padx=10)
+
+        for output in result.outputs:
+            self._create_output_diagram(block, result, output)
+
+    def _create_output_diagram(self, block, result, output):
+        # Horizontal layout for the circuit diagram of one pump output
         diagram = ctk.CTkFrame(block, fg_color="#f8f8f8")
         diagram.pack(fill="x", padx=10, pady=8)
 
+        first_pipe = output.pipes[0] if output.pipes else None
+        other_pipes = output.pipes[1:]
+        connectors = output.connectors()
+        nozzles = output.nozzles()
+
         # --- Pump ---
         pump_frame = ctk.CTkFrame(diagram, fg_color="transparent")
         pump_frame.pack(side="left", padx=(0, 20))
         ctk.CTkLabel(pump_frame, text="🦾", font=("Arial", 22)).pack()
         ctk.CTkLabel(pump_frame, text="Pump", text_color="#2a3a6c", font=("Arial", 11, "bold")).pack()
-        # ctk.CTkLabel(pump_frame, text=circuit.get("pump_name", "PpumpOUT"), font=("Arial", 10)).pack()
+        ctk.CTkLabel(pump_frame, text=f"{result.pump_name}\nOutput {output.output}: {_kpa(output.pressure)}", font=("Arial", 10)).pack()
 
         # --- Flow rate & Pressure loss (left) ---
         left_info = ctk.CTkFrame(diagram, fg_color="transparent")
         left_info.pack(side="left", padx=(0, 10))
-        ctk.CTkLabel(left_info, text="Flow rate", text_color="green", font=("Arial", 10)).pack(anchor="w")
-        ctk.CTkLabel(left_info, text="perte de pression", text_color="red", font=("Arial", 10)).pack(anchor="w")
+        ctk.CTkLabel(left_info, text=f"Flow rate {_lpm(output.flow)}", text_color="green", font=("Arial", 10)).pack(anchor="w")
+        ctk.CTkLabel(left_info, text=f"perte de pression {_kpa(first_pipe.pressure_drop if first_pipe else 0.0)}", text_color="red", font=("Arial", 10)).pack(anchor="w")
 
         # --- Connector ---
         connector_frame = ctk.CTkFrame(diagram, fg_color="transparent")
         connector_frame.pack(side="left", padx=(0, 10))
         ctk.CTkLabel(connector_frame, text="⎯■⎯", font=("Arial", 18)).pack()
-        ctk.CTkLabel(connector_frame, text="Connector", text_color="#2a3a6c", font=("Arial", 11, "bold")).pack()
-        ctk.CTkLabel(connector_frame, text="perte de pression", text_color="red", font=("Arial", 10)).pack()
+        ctk.CTkLabel(connector_frame, text=f"Connector ×{len(connectors)}", text_color="#2a3a6c", font=("Arial", 11, "bold")).pack()
+        ctk.CTkLabel(connector_frame, text=f"perte de pression {_kpa(sum(node.pressure_drop for node in connectors))}", text_color="red", font=("Arial", 10)).pack()
 
         # --- Flow rate & Pressure loss (right) ---
         right_info = ctk.CTkFrame(diagram, fg_color="transparent")
         right_info.pack(side="left", padx=(0, 10))
-        ctk.CTkLabel(right_info, text="Flow rate", text_color="green", font=("Arial", 10)).pack(anchor="w")
-        ctk.CTkLabel(right_info, text="perte de pression", text_color="red", font=("Arial", 10)).pack(anchor="w")
+        branch_flow = max((pipe.flow for pipe in other_pipes), default=0.0)
+        ctk.CTkLabel(right_info, text=f"Flow rate ≤ {_lpm(branch_flow)}", text_color="green", font=("Arial", 10)).pack(anchor="w")
+        ctk.CTkLabel(right_info, text=f"perte de pression {_kpa(sum(pipe.pressure_drop for pipe in other_pipes))}", text_color="red", font=("Arial", 10)).pack(anchor="w")
 
         # --- Nozzle ---
         nozzle_frame = ctk.CTkFrame(diagram, fg_color="transparent")
         nozzle_frame.pack(side="left", padx=(0, 10))
         ctk.CTkLabel(nozzle_frame, text="))", font=("Arial", 18)).pack()
         ctk.CTkLabel(nozzle_frame, text="Nozzle", text_color="#2a3a6c", font=("Arial", 11, "bold")).pack()
-        ctk.CTkLabel(nozzle_frame, text="Pression IN\nvitesse en sortie\nvitesse sortie / v max\nliquid consumed", font=("Arial", 10), anchor="w", justify="left").pack()
+        ctk.CTkLabel(nozzle_frame, text="\n".join(
+            self._nozzle_text(result, output, nozzle) for nozzle in nozzles
+        ) or "-", font=("Arial", 10), anchor="w", justify="left").pack()
 
         # --- Component WC ---
         wc_frame = ctk.CTkFrame(diagram, fg_color="transparent")
         wc_frame.pack(side="left", padx=(0, 10))
         ctk.CTkLabel(wc_frame, text="◆◆\n◆◆", font=("Arial", 18)).pack()
         ctk.CTkLabel(wc_frame, text="component WC", text_color="#2a3a6c", font=("Arial", 11, "bold")).pack()
-        ctk.CTkLabel(wc_frame, text="Cleanliness", font=("Arial", 10)).pack()
+        ctk.CTkLabel(wc_frame, text="\n".join(
+            f"{item.component}: Cleanliness {item.achieved:.0%}"
+            + (f" / {item.target:.0%} {'✓' if item.meets_target else '✗'}" if item.target == item.target else "")
+            for item in self.cleaning.get((result.pump_index, output.output), [])
+        ) or "Cleanliness -", font=("Arial", 10), justify="left").pack()
+
+    def _nozzle_text(self, result, output, nozzle):
+        jet = self.nozzles.get((result.pump_index, output.output, nozzle.id))
+        if jet is None:
+            return (f"{nozzle.name}: Pression IN {_kpa(nozzle.inlet_pressure)}, "
+                    f"vitesse en sortie {nozzle.outlet_velocity:.1f} m/s, liquid consumed {_lpm(nozzle.flow)}")
+        ratio = f"{jet.velocity_ratio:.2f}" if jet.velocity_ratio == jet.velocity_ratio else "-"
+        return (f"{nozzle.name} ({jet.ref or 'default nozzle'}): Pression IN {_kpa(jet.inlet_pressure)}, "
+                f"vitesse en sortie {jet.outlet_velocity:.1f} m/s, vitesse sortie / v max {ratio}, "
+                f"impact {jet.impact_velocity:.1f} m/s at {jet.distance * 1000:.0f} mm, "
+                f"liquid consumed {jet.flow * 1e6:.2f} mL/s")
+
+
+# Heat map colors from no spray to the densest cell
+HEAT_MAP_STOPS = np.array([
+    [255, 255, 255],
+    [107, 138, 199],
+    [76, 175, 80],
+    [255, 152, 0],
+    [244, 67, 54],
+], dtype=float)
+
+
+def _heat_map(flux):
+    """RGB image of a coverage raster, scaled to its densest cell"""
+    level = flux / flux.max() if flux.max() > 0 else flux
+    position = level * (len(HEAT_MAP_STOPS) - 1)
+    lower = np.minimum(position.astype(int), len(HEAT_MAP_STOPS) - 2)
+    weight = (position - lower)[..., None]
+    rgb = HEAT_MAP_STOPS[lower] * (1.0 - weight) + HEAT_MAP_STOPS[lower + 1] * weight
+    return Image.fromarray(rgb.astype(np.uint8), mode="RGB")
+
+
+def _kpa(pressure):
+    return f"{pressure / 1000.0:.1f} kPa"
+
+
+def _lpm(flow):
+    return f"{flow / LITRES_PER_MINUTE:.2f} L/min"
@@ -35,15 +35,15 @@ class PipeConfigDialog(ctk.CTkToplevel):
         # Register with appearance manager
         AppearanceManager.register(self)
         
+        # Refresh the dropdowns if the pipe catalog is edited while open
+        self.controller.data_manager.subscribe(self)
+        
         # Initialize pipe data
         self.ref_number = "xxx-xxx-xxx"
         self.supplier_value = "xxxxxxxx"
         
-        # Get pipe data from DataManager
-        self.pipe_data = self.controller.data_manager.get_pipes_data()
-        
-        # Store filtered data
-        self.filtered_data = self.pipe_data.copy() if self.pipe_data else []
+        # Get the indexed pipe catalog from DataManager
+        self.pipe_index = self.controller.data_manager.get_pipe_index()
         
         # Create UI
         self._create_ui()
@@ -189,14 +189,8 @@ class PipeConfigDialog(ctk.CTkToplevel):
         """Create diameter dropdown field"""
         self.diameter_var = ctk.StringVar(value="Select diameter")
         
-        # Get unique diameters from pipe data
-        diameters = set()
-        for pipe in self.filtered_data:
-            diameter = pipe.get('Diam. (mm)')
-            if diameter is not None:
-                diameters.add(str(diameter))
-        
-        diameter_options = sorted(list(diameters), key=lambda x: float(x)) if diameters else ["No data"]
+        # Get unique diameters from the pipe index
+        diameter_options = self._diameter_options()
         
         dropdown = ctk.CTkOptionMenu(
             self.form_frame,
@@ -214,14 +208,8 @@ class PipeConfigDialog(ctk.CTkToplevel):
         """Create pipe type dropdown"""
         self.type_var = ctk.StringVar(value="Select type")
         
-        # Get unique pipe types from pipe data
-        pipe_types = set()
-        for pipe in self.filtered_data:
-            pipe_type = pipe.get('Pipe Type')
-            if pipe_type is not None:
-                pipe_types.add(str(pipe_type))
-        
-        type_options = sorted(list(pipe_types)) if pipe_types else ["No data"]
+        # Get unique pipe types from the pipe index
+        type_options = self._type_options()
         
         dropdown = ctk.CTkOptionMenu(
             self.form_frame,
@@ -388,16 +376,42 @@ class PipeConfigDialog(ctk.CTkToplevel):
             self.bend_radius_label.grid(row=5, column=0, sticky="w", pady=8, padx=(0, 10))
             self.bend_radius_frame.grid(row=5, column=1, sticky="ew", pady=8)
     
+    def _selected_type(self) -> Optional[str]:
+        """Currently selected pipe type, or None if nothing is selected"""
+        value = self.type_var.get()
+        return None if value in ("Select type", "No data", "") else value
+    
+    def _selected_diameter(self) -> Optional[float]:
+        """Currently selected diameter in mm, or None if nothing is selected"""
+        try:
+            return float(self.diameter_var.get())
+        except ValueError:
+            return None
+    
+    def _diameter_options(self, pipe_type: Optional[str] = None):
+        """Diameter dropdown values, optionally restricted to a pipe type"""
+        diameters = self.pipe_index.diameters(pipe_type)
+        return [self._format_diameter(diameter) for diameter in diameters] if diameters else ["No data"]
+
+    @staticmethod
+    def _format_diameter(diameter) -> str:
+        """Dropdown label of a diameter: 8 rather than 8.0"""
+        try:
+            return f"{float(diameter):g}"
+        except (TypeError, ValueError):
+            return str(diameter)
+    
+    def _type_options(self, diameter: Optional[float] = None):
+        """Type dropdown values, optionally restricted to a diameter"""
+        return self.pipe_index.types(diameter) or ["No data"]
+    
     def _on_type_change(self, value):
         """Update diameter options and ref/supplier based on type selection"""
         if value == "Select type":
             return
-            
-        # Filter pipe data by selected type
-        self.filtered_data = [pipe for pipe in self.pipe_data if pipe.get('Pipe Type') == value]
         
         # Update diameter dropdown options
-        self._update_diameter_options()
+        self._update_diameter_options(value)
         
         # Update ref and supplier info
         self._update_pipe_info()
@@ -407,43 +421,29 @@ class PipeConfigDialog(ctk.CTkToplevel):
         if value == "Select diameter":
             return
             
-        # Filter pipe data by selected diameter
         try:
             selected_diameter = float(value)
-            self.filtered_data = [pipe for pipe in self.pipe_data if pipe.get('Diam. (mm)') == selected_diameter]
-            
-            # Update type dropdown options
-            self._update_type_options()
-            
-            # Update ref and supplier info
-            self._update_pipe_info()
         except ValueError:
-            pass
+            return
+        
+        # Update type dropdown options
+        self._update_type_options(selected_diameter)
+        
+        # Update ref and supplier info
+        self._update_pipe_info()
     
-    def _update_diameter_options(self):
-        """Update diameter dropdown options based on filtered data"""
-        diameters = set()
-        for pipe in self.filtered_data:
-            diameter = pipe.get('Diam. (mm)')
-            if diameter is not None:
-                diameters.add(str(diameter))
-        
-        diameter_options = sorted(list(diameters), key=lambda x: float(x)) if diameters else ["No data"]
+    def _update_diameter_options(self, pipe_type: Optional[str] = None):
+        """Update diameter dropdown options for the given pipe type"""
+        diameter_options = self._diameter_options(pipe_type)
         self.diameter_dropdown.configure(values=diameter_options)
         
         # Reset diameter selection if current is not in new options
         if self.diameter_var.get() not in diameter_options:
             self.diameter_var.set("Select diameter")
     
-    def _update_type_options(self):
-        """Update type dropdown options based on filtered data"""
-        pipe_types = set()
-        for pipe in self.filtered_data:
-            pipe_type = pipe.get('Pipe Type')
-            if pipe_type is not None:
-                pipe_types.add(str(pipe_type))
-        
-        type_options = sorted(list(pipe_types)) if pipe_types else ["No data"]
+    def _update_type_options(self, diameter: Optional[float] = None):
+        """Update type dropdown options for the given diameter"""
+        type_options = self._type_options(diameter)
         self.type_dropdown.configure(values=type_options)
         
         # Reset type selection if current is not in new options
@@ -452,23 +452,12 @@ class PipeConfigDialog(ctk.CTkToplevel):
     
     def _update_pipe_info(self):
         """Update ref and supplier info based on current selection"""
-        # Find matching pipe data
-        matching_pipes = []
-        current_type = self.type_var.get()
-        current_diameter = self.diameter_var.get()
-        
-        for pipe in self.filtered_data:
-            type_match = current_type == "Select type" or pipe.get('Pipe Type') == current_type
-            diameter_match = current_diameter == "Select diameter" or str(pipe.get('Diam. (mm)')) == current_diameter
-            
-            if type_match and diameter_match:
-                matching_pipes.append(pipe)
+        reference = self.pipe_index.reference(self._selected_type(), self._selected_diameter())
         
         # Update info with first matching pipe
-        if matching_pipes:
-            pipe = matching_pipes[0]
-            self.ref_number = str(pipe.get('Pipe Ref', 'xxx-xxx-xxx'))
-            self.supplier_value = str(pipe.get('Supplier', 'xxxxxxxx'))
+        if reference:
+            self.ref_number = reference.ref
+            self.supplier_value = reference.supplier
         else:
             self.ref_number = "xxx-xxx-xxx"
             self.supplier_value = "xxxxxxxx"
@@ -477,11 +466,19 @@ class PipeConfigDialog(ctk.CTkToplevel):
         self.ref_label.configure(text=f"Ref n° : {self.ref_number}")
         self.supplier_label.configure(text=f"Supplier: {self.supplier_value}")
     
+    def on_catalog_changed(self, file_keys):
+        """Rebuild the dropdown options after the pipe catalog was reloaded"""
+        if 'pipes' not in file_keys:
+            return
+        self.pipe_index = self.controller.data_manager.get_pipe_index()
+        
+        # Keep the current selection when it still exists in the new catalog
+        self._update_diameter_options(self._selected_type())
+        self._update_type_options(self._selected_diameter())
+        self._update_pipe_info()
+    
     def reset_selection(self):
         """Reset type and diameter selections to show all options"""
-        # Reset filtered data to show all pipe data
-        self.filtered_data = self.pipe_data.copy() if self.pipe_data else []
-        
         # Update both dropdowns to show all options
         self._update_diameter_options()
         self._update_type_options()
@@ -513,7 +510,7 @@ class PipeConfigDialog(ctk.CTkToplevel):
         
         diameter_value = params.get('diameter', '')
         if diameter_value:
-            self.diameter_var.set(str(diameter_value))
+            self.diameter_var.set(self._format_diameter(diameter_value))
     
         self.type_var.set(params.get('type', 'Select type'))
         self._on_type_change(params.get('type', ''))
@@ -652,4 +649,5 @@ class PipeConfigDialog(ctk.CTkToplevel):
     def destroy(self):
         """Clean up when destroying"""
         AppearanceManager.unregister(self)
+        self.controller.data_manager.unsubscribe(self)
         super().destroy()
\ No newline at end of file
@@ -38,6 +38,9 @@ class PumpConfigDialog(ctk.CTkToplevel):
         self.supplier_value = "XXXXXXX"
         self.num_outputs = "X"
         
+        # Pump identities and curves from DataManager
+        self.pump_catalog = self.controller.data_manager.get_pump_catalog()
+        
         # Create UI
         self._create_ui()
         
@@ -172,10 +175,11 @@ class PumpConfigDialog(ctk.CTkToplevel):
         dropdown = ctk.CTkOptionMenu(
             self.form_frame,
             variable=self.category_var,
-            values=["Category A", "Category B", "Category C"],
+            values=self.pump_catalog.categories() or ["No data"],
             font=self.controller.fonts.get("default", None),
             dropdown_font=self.controller.fonts.get("default", None),
-            width=250
+            width=250,
+            command=self._on_category_change
         )
         self.category_dropdown = dropdown
         return dropdown
@@ -186,12 +190,13 @@ class PumpConfigDialog(ctk.CTkToplevel):
         dropdown = ctk.CTkOptionMenu(
             self.form_frame,
             variable=self.pump_name_var,
-            values=["AWEKL 123133112 DE", "BWEKL 456789123 FR", "CWEKL 789456123 UK"],
+            values=self.pump_catalog.names() or ["No data"],
             font=self.controller.fonts.get("default", None),
             dropdown_font=self.controller.fonts.get("default", None),
             width=250,
             command=self._on_pump_name_change
         )
+        self.pump_name_dropdown = dropdown
         return dropdown
     
     def _create_output_dropdown(self, output_id: str):
@@ -267,31 +272,32 @@ class PumpConfigDialog(ctk.CTkToplevel):
         )
         self.outputs_label.grid(row=0, column=2, sticky="e", padx=10, pady=10)
     
+    def _on_category_change(self, value):
+        """Restrict the pump names to the selected category"""
+        names = self.pump_catalog.names(value) or ["No data"]
+        self.pump_name_dropdown.configure(values=names)
+        
+        # Reset pump selection if it is not in the category
+        if self.pump_name_var.get() not in names:
+            self.pump_name_var.set("Select pump")
+            self._on_pump_name_change("Select pump")
+    
     def _on_pump_name_change(self, value):
         """Update pump info based on pump name selection"""
-        # Simulate pump data lookup
-        pump_data = {
-            "AWEKL 123133112 DE": {
-                "ref": "123-133-112",
-                "supplier": "Bosch DE",
-                "outputs": "2"
-            },
-            "BWEKL 456789123 FR": {
-                "ref": "456-789-123",
-                "supplier": "Valeo FR",
-                "outputs": "1"
-            },
-            "CWEKL 789456123 UK": {
-                "ref": "789-456-123",
-                "supplier": "Dyson UK",
-                "outputs": "2"
-            }
-        }
-        
-        data = pump_data.get(value, {"ref": "xxx-xxx-xxx", "supplier": "XXXXXXX", "outputs": "X"})
-        self.ref_number = data["ref"]
-        self.supplier_value = data["supplier"]
-        self.num_outputs = data["outputs"]
+        info = self.pump_catalog.info(value)
+        if info:
+            self.ref_number = info.ref
+            self.supplier_value = info.supplier
+            self.num_outputs = str(info.outputs)
+            
+            # Selecting a pump also selects its category
+            if self.category_var.get() != info.category:
+                self.category_var.set(info.category)
+                self.pump_name_dropdown.configure(values=self.pump_catalog.names(info.category))
+        else:
+            self.ref_number = "xxx-xxx-xxx"
+            self.supplier_value = "XXXXXXX"
+            self.num_outputs = "X"
         
         # Update labels
         if hasattr(self, 'ref_label'):
@@ -0,0 +1,225 @@
+import customtkinter as ctk
+from typing import Callable, List, Optional
+from utils.search_index import SearchIndex
+
+
+class SearchPicker(ctk.CTkFrame):
+    """
+    Type-ahead replacement for CTkOptionMenu on large catalogs.
+
+    Typing queries a SearchIndex; matches are shown in a popup list that
+    only ever creates `visible_rows` row widgets and scrolls by rewriting
+    their text, so opening it costs the same for 10 or 100,000 values.
+    """
+    def __init__(self, master, search_index: SearchIndex, variable: Optional[ctk.StringVar] = None,
+                 command: Optional[Callable[[str], None]] = None, placeholder: str = "Select",
+                 font=None, dropdown_font=None, width: int = 250, visible_rows: int = 8,
+                 row_height: int = 28, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.search_index = search_index
+        self.variable = variable or ctk.StringVar(value=placeholder)
+        self.command = command
+        self.placeholder = placeholder
+        self.visible_rows = visible_rows
+        self.row_height = row_height
+        self.dropdown_font = dropdown_font or font
+
+        self._results: List[str] = []
+        self._offset = 0
+        self._highlight = 0
+        self._popup = None
+        self._rows = []
+        self._query_job = None
+        self._close_job = None
+
+        self.entry = ctk.CTkEntry(self, font=font, width=width)
+        self.entry.pack(fill="x")
+        self._show_value()
+        # Keep the entry in sync when the variable is set from outside
+        self.variable.trace_add("write", lambda *args: self._popup is None and self._show_value())
+
+        # The list opens on a click or a keypress, not on focus: dialogs focus
+        # their first field when they appear and must not drop the list over the form
+        self.entry.bind("<FocusIn>", self._on_focus_in)
+        self.entry.bind("<Button-1>", lambda e: self._open(), add="+")
+        self.entry.bind("<FocusOut>", lambda e: self._schedule_close())
+        self.entry.bind("<KeyRelease>", self._on_key_release)
+        self.entry.bind("<Return>", lambda e: self._select_highlighted())
+        self.entry.bind("<Escape>", lambda e: self.close())
+        self.entry.bind("<Down>", lambda e: self._move_highlight(1) if self._popup is not None else self._open())
+        self.entry.bind("<Up>", lambda e: self._move_highlight(-1))
+
+    # --- CTkOptionMenu compatible API ---
+
+    def get(self) -> str:
+        return self.variable.get()
+
+    def set(self, value: str):
+        self.variable.set(value)
+
+    def focus(self):
+        self.entry.focus()
+
+    def set_index(self, search_index: SearchIndex):
+        """Swap in a rebuilt index (catalog reload) and refresh the open list"""
+        self.search_index = search_index
+        if self._popup is not None:
+            self._run_query()
+
+    # --- Entry ---
+
+    def _show_value(self):
+        """Display the selected value (or the placeholder) in the entry"""
+        self.entry.delete(0, "end")
+        self.entry.insert(0, self.variable.get())
+
+    def _on_focus_in(self, event=None):
+        if self.entry.get() == self.placeholder:
+            self.entry.delete(0, "end")
+        else:
+            self.entry.select_range(0, "end")
+
+    def _on_key_release(self, event):
+        if event.keysym in ("Return", "Escape", "Up", "Down", "Tab"):
+            return
+        # Debounce so fast typing only queries the index once
+        if self._query_job is not None:
+            self.after_cancel(self._query_job)
+        self._query_job = self.after(80, self._run_query)
+
+    def _run_query(self):
+        self._query_job = None
+        if self._popup is None:
+            self._open()
+            return
+        self._results = self.search_index.search(self.entry.get())
+        self._offset = 0
+        self._highlight = 0
+        self._render()
+
+    # --- Popup ---
+
+    def _open(self):
+        if self._close_job is not None:
+            self.after_cancel(self._close_job)
+            self._close_job = None
+        if self._popup is None:
+            self._build_popup()
+        self._run_query()
+
+    def _build_popup(self):
+        toplevel = self.winfo_toplevel()
+        self._popup = ctk.CTkFrame(toplevel, border_width=1, corner_radius=6)
+        self._popup.grid_columnconfigure(0, weight=1)
+
+        self._rows = []
+        for i in range(self.visible_rows):
+            row = ctk.CTkButton(
+                self._popup,
+                text="",
+                font=self.dropdown_font,
+                height=self.row_height,
+                anchor="w",
+                fg_color="transparent",
+                text_color=("gray10", "gray90"),
+                hover_color=("gray80", "gray30"),
+                command=lambda i=i: self._select_row(i)
+            )
+            row.grid(row=i, column=0, sticky="ew", padx=(4, 0), pady=0)
+            self._bind_wheel(row)
+            self._rows.append(row)
+
+        self._scrollbar = ctk.CTkScrollbar(self._popup, command=self._on_scrollbar)
+        self._scrollbar.grid(row=0, column=1, rowspan=self.visible_rows, sticky="ns", padx=2, pady=4)
+        self._bind_wheel(self._popup)
+
+        # Place the popup right under the entry, on top of the other widgets
+        self.update_idletasks()
+        x = self.entry.winfo_rootx() - toplevel.winfo_rootx()
+        y = self.entry.winfo_rooty() - toplevel.winfo_rooty() + self.entry.winfo_height()
+        self._popup.place(x=x, y=y, width=self.entry.winfo_width())
+        self._popup.lift()
+
+    def _schedule_close(self):
+        # Clicking a row moves the focus away first; let the click land
+        self._close_job = self.after(150, self.close)
+
+    def close(self):
+        """Hide the result list and show the current selection again"""
+        self._close_job = None
+        if self._popup is not None:
+            self._popup.destroy()
+            self._popup = None
+            self._rows = []
+        self._show_value()
+
+    # --- Virtualized rendering ---
+
+    def _render(self):
+        """Write the visible slice of the results into the row pool"""
+        total = len(self._results)
+        for i, row in enumerate(self._rows):
+            index = self._offset + i
+            if index < total:
+                highlighted = index == self._highlight
+                row.configure(
+                    text=self._results[index],
+                    state="normal",
+                    fg_color=("gray75", "gray25") if highlighted else "transparent"
+                )
+            else:
+                row.configure(
+                    text="No match" if total == 0 and i == 0 else "",
+                    state="disabled",
+                    fg_color="transparent"
+                )
+        if total:
+            self._scrollbar.set(self._offset / total, min(1.0, (self._offset + self.visible_rows) / total))
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int):
+        max_offset = max(0, len(self._results) - self.visible_rows)
+        self._offset = max(0, min(offset, max_offset))
+        self._render()
+
+    def _on_scrollbar(self, action, *args):
+        """Handle the Tk yview protocol sent by the scrollbar"""
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * len(self._results)))
+        elif action == "scroll":
+            step = self.visible_rows if args[1] == "pages" else 1
+            self._scroll_to(self._offset + int(args[0]) * step)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self._scroll_to(self._offset - (1 if e.delta > 0 else -1) * 3))
+        widget.bind("<Button-4>", lambda e: self._scroll_to(self._offset - 3))
+        widget.bind("<Button-5>", lambda e: self._scroll_to(self._offset + 3))
+
+    def _move_highlight(self, step: int):
+        if not self._results:
+            return
+        self._highlight = max(0, min(self._highlight + step, len(self._results) - 1))
+        if self._highlight < self._offset:
+            self._offset = self._highlight
+        elif self._highlight >= self._offset + self.visible_rows:
+            self._offset = self._highlight - self.visible_rows + 1
+        self._render()
+
+    # --- Selection ---
+
+    def _select_row(self, i: int):
+        index = self._offset + i
+        if index < len(self._results):
+            self._select(self._results[index])
+
+    def _select_highlighted(self):
+        if self._results:
+            self._select(self._results[self._highlight])
+
+    def _select(self, value: str):
+        self.variable.set(value)
+        self.close()
+        self.master.focus_set()
+        if self.command:
+            self.command(value)
@@ -7,6 +7,7 @@ from components.custom_button import CustomButton
 import math
 from PIL import Image, ImageTk
 from utils.open_image import open_image
+from utils.circuit_graph import CONNECTOR_TYPES, CircuitGraph
 
 class Synthesis(ctk.CTkFrame):
     def __init__(self, parent, controller, circuits):
@@ -416,13 +417,14 @@ class Synthesis(ctk.CTkFrame):
         
         # Process each output
         component_positions = {}  # Track positions of all components
+        graph = CircuitGraph(circuit)
         
         for output_num, components in outputs.items():
             if not components:
                 continue
                 
             # Get connectors from circuit data
-            connectors = self._find_connectors_for_output(circuit, pump_name, components)
+            connectors = self._find_connectors_for_output(graph, pump_name, components)
             
             # Layout components for this output
             output_start_y = output_positions.get(output_num, start_y)
@@ -479,18 +481,14 @@ class Synthesis(ctk.CTkFrame):
         
         return circuit_height
 
-    def _find_connectors_for_output(self, circuit, pump_name, output_components):
+    def _find_connectors_for_output(self, graph, pump_name, output_components):
         """Find connectors between pump and components for a specific output"""
         connectors = []
-        components = circuit.get('components', [])
-        connections = circuit.get('connections', [])
         
-        # Find all connector components
-        connector_comps = [c for c in components if c.get('type') in ['t_connector', 'y_connector', 'straight_connector']]
-        
-        # Simple heuristic: assign connectors based on connection patterns
-        # This is a simplified version - you might need more sophisticated logic
-        for connector in connector_comps:
+        # Walk back from the output's components to the pump, keeping the connectors passed on the way
+        component_ids = [comp.get('id') for comp in output_components if comp.get('id') in graph.components]
+        for connector_id in graph.upstream(component_ids, CONNECTOR_TYPES):
+            connector = graph.components[connector_id]
             connectors.append({
                 'name': connector.get('name'),
                 'type': connector.get('type')
@@ -0,0 +1,155 @@
+import customtkinter as ctk
+import tkinter as tk
+from utils.appearance_manager import AppearanceManager
+
+
+class TemperaturePlot(ctk.CTkFrame):
+    """
+    Line chart of quantities versus liquid temperature, drawn on a plain
+    canvas. Each series is one curve; an optional marker shows the
+    General Settings operating temperature.
+    """
+
+    def __init__(self, parent, controller, title="", unit="", width=420, height=220, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.controller = controller
+        self.title = title
+        self.unit = unit
+        self.width = width
+        self.height = height
+
+        AppearanceManager.register(self)
+
+        # Plot data
+        self.temperatures = []
+        self.series = []
+        self.marker = None
+
+        # Visual settings
+        self.margin_left = 55
+        self.margin_right = 15
+        self.margin_top = 15
+        self.margin_bottom = 35
+        self.colors = [
+            "#6B8AC7",  # Secondary blue
+            "#4CAF50",  # Green
+            "#FF9800",  # Orange
+            "#9C27B0",  # Purple
+            "#F44336",  # Red
+            "#00BCD4",  # Cyan
+            "#795548",  # Brown
+        ]
+
+        self._create_ui()
+        self.update_appearance()
+
+    def _create_ui(self):
+        """Create the plot UI"""
+        self.title_label = ctk.CTkLabel(
+            self,
+            text=f"{self.title} ({self.unit})" if self.unit else self.title,
+            font=self.controller.fonts.get("bold", None) if hasattr(self.controller, 'fonts') else None,
+            anchor="center"
+        )
+        self.title_label.pack(pady=(0, 1))
+
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0, width=self.width, height=self.height)
+        self.canvas.pack(fill="both", expand=True, padx=5, pady=5)
+
+        self.legend_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.legend_frame.pack(pady=(1, 0))
+
+    def plot(self, temperatures, series, marker=None):
+        """
+        Draw `series`, a list of (label, values) with one value per entry of
+        `temperatures` (°C); `marker` is a temperature to highlight
+        """
+        self.temperatures = [float(t) for t in temperatures]
+        self.series = [(label, [float(v) for v in values]) for label, values in series]
+        self.marker = marker
+        self._draw()
+        self._update_legend()
+
+    def _draw(self):
+        self.canvas.delete("all")
+        values = [v for _, curve in self.series for v in curve if v == v]
+        if len(self.temperatures) < 2 or not values:
+            self.canvas.create_text(self.width // 2, self.height // 2, text="No results",
+                                    font=("Arial", 12), fill="gray", anchor="center")
+            return
+
+        t_min, t_max = self.temperatures[0], self.temperatures[-1]
+        v_min, v_max = min(values), max(values)
+        if v_max - v_min < 1e-9 * max(abs(v_max), 1.0):
+            v_min, v_max = v_min - 1.0, v_max + 1.0
+        pad = (v_max - v_min) * 0.05
+        v_min, v_max = v_min - pad, v_max + pad
+
+        left, right = self.margin_left, self.width - self.margin_right
+        top, bottom = self.margin_top, self.height - self.margin_bottom
+
+        def x_of(t):
+            return left + (t - t_min) / (t_max - t_min) * (right - left)
+
+        def y_of(v):
+            return bottom - (v - v_min) / (v_max - v_min) * (bottom - top)
+
+        # Axes, grid and tick labels
+        self.canvas.create_line(left, bottom, right, bottom, width=2, fill="black")
+        self.canvas.create_line(left, top, left, bottom, width=2, fill="black")
+        t = 10.0 * (t_min // 10.0 + 1.0) if t_min % 10.0 else t_min
+        while t <= t_max + 1e-9:
+            x = x_of(t)
+            self.canvas.create_line(x, top, x, bottom, fill="#E0E0E0")
+            self.canvas.create_line(x, bottom, x, bottom + 5, fill="black")
+            self.canvas.create_text(x, bottom + 15, text=f"{t:.0f}", font=("Arial", 9), fill="black")
+            t += 10.0
+        for i in range(5):
+            v = v_min + (v_max - v_min) * i / 4
+            y = y_of(v)
+            self.canvas.create_line(left, y, right, y, fill="#E0E0E0")
+            self.canvas.create_text(left - 5, y, text=f"{v:.3g}", font=("Arial", 9), fill="black", anchor="e")
+        self.canvas.create_text((left + right) / 2, self.height - 5, text="Liquid temperature (°C)",
+                                font=("Arial", 9), fill="black", anchor="s")
+
+        if self.marker is not None and t_min <= self.marker <= t_max:
+            x = x_of(self.marker)
+            self.canvas.create_line(x, top, x, bottom, fill="gray", dash=(4, 2))
+
+        for i, (_, curve) in enumerate(self.series):
+            points = []
+            for t, v in zip(self.temperatures, curve):
+                if v == v:
+                    points.extend((x_of(t), y_of(v)))
+            if len(points) >= 4:
+                self.canvas.create_line(*points, width=2, fill=self.colors[i % len(self.colors)])
+
+    def _update_legend(self):
+        """Update the legend with the series colors"""
+        for widget in self.legend_frame.winfo_children():
+            widget.destroy()
+
+        for i, (label, _) in enumerate(self.series):
+            item = ctk.CTkFrame(self.legend_frame, fg_color="transparent")
+            item.grid(row=i // 4, column=i % 4, padx=5, pady=1, sticky="w")
+            ctk.CTkLabel(item, text="", width=12, height=12, corner_radius=2,
+                         fg_color=self.colors[i % len(self.colors)]).pack(side="left", padx=(0, 4))
+            ctk.CTkLabel(item, text=label, font=("Arial", 10)).pack(side="left")
+
+    def update_appearance(self, mode=None):
+        """Update appearance based on theme"""
+        bg_color = "#F8F8F8" if ctk.get_appearance_mode() == "Dark" else "white"
+        if hasattr(self, 'canvas'):
+            self.canvas.configure(bg=bg_color)
+
+        text_color = "#F8F8F8" if ctk.get_appearance_mode() == "Dark" else "#0D0D0D"
+        if hasattr(self, 'title_label'):
+            self.title_label.configure(text_color=text_color)
+
+        if self.series:
+            self._draw()
+
+    def destroy(self):
+        """Clean up when destroying"""
+        AppearanceManager.unregister(self)
+        super().destroy()
@@ -1,5 +1,8 @@
+import multiprocessing
 from main_controller import MainController
 
 if __name__ == "__main__":
+    # Needed for the catalog loading process pool in frozen builds
+    multiprocessing.freeze_support()
     main_controller = MainController()
     main_controller.start()
\ No newline at end of file
@@ -7,12 +7,19 @@ import uuid
 from pages.welcome_window import WelcomeWindow
 from app import App
 from utils.data_manager import DataManager
+from utils.hydraulics import HydraulicSolver
+from utils.operating_point import OperatingPointSolver
+from utils.cleanliness import CleanlinessModel
+from utils.spray_coverage import CoverageEngine
 
 class MainController:
     """
     A unified controller that manages the entire application lifecycle,
     from the welcome screen to page navigation and data management within the main app.
     """
+    # How often the Tk loop picks up catalog reloads
+    CATALOG_POLL_MS = 1000
+
     def __init__(self):
         # --- Initialization from AppController ---
         ctk.set_appearance_mode("Dark")
@@ -35,7 +42,14 @@ class MainController:
         self.config_file = "washing_system_config.json"
 
         # --- Data Management ---
+        # Catalogs are loaded lazily; start() prefetches them in the background
         self.data_manager = DataManager()
+        # Shared so its per-output cache survives page switches; dropped when a catalog it uses changes
+        self.hydraulic_solver = None
+        self.operating_point_solver = None
+        self.coverage_engine = None
+        self.cleanliness_model = None
+        self.data_manager.subscribe(self)
 
     def _get_initial_config_data(self):
         """Returns the default empty structure for the application's configuration data."""
@@ -52,6 +66,9 @@ class MainController:
     def start(self):
         """Starts the application by showing the welcome window."""
         self.welcome_window = WelcomeWindow(self)
+        # Warm the catalogs while the user is still on the welcome screen;
+        # workbooks missing from the cache are parsed in a process pool
+        self.welcome_window.after_idle(lambda: self.data_manager.start_prefetch(parallel=True))
         self.welcome_window.mainloop()
 
     def handle_new_config_request(self):
@@ -86,8 +103,55 @@ class MainController:
         # Show the first page to ensure proper navigation state
         self.show_page("general_settings")
         
+        # Pick up catalog edits made while the app is running
+        self.data_manager.start_watching()
+        self._poll_catalog_changes()
+        
         self.main_app.mainloop()
 
+    def _poll_catalog_changes(self):
+        """Forward catalog reloads from the watcher thread to the open pages and dialogs."""
+        if not self.main_app:
+            return
+        self.data_manager.dispatch_changes()
+        self.main_app.after(self.CATALOG_POLL_MS, self._poll_catalog_changes)
+
+    def get_hydraulic_solver(self):
+        """Hydraulic solver over the current catalogs, created on first use"""
+        if self.hydraulic_solver is None:
+            self.hydraulic_solver = HydraulicSolver.from_data_manager(self.data_manager)
+        return self.hydraulic_solver
+
+    def get_operating_point_solver(self):
+        """Operating-point solver sharing the hydraulic solver, created on first use"""
+        if self.operating_point_solver is None:
+            self.operating_point_solver = OperatingPointSolver(self.get_hydraulic_solver())
+        return self.operating_point_solver
+
+    def get_coverage_engine(self):
+        """Spray coverage rasterizer over the nozzle and component catalogs, created on first use"""
+        if self.coverage_engine is None:
+            self.coverage_engine = CoverageEngine.from_data_manager(self.data_manager)
+        return self.coverage_engine
+
+    def get_cleanliness_model(self):
+        """Dirt removal model over the current solver, coverage engine and dirt catalog"""
+        if self.cleanliness_model is None:
+            self.cleanliness_model = CleanlinessModel.from_data_manager(
+                self.data_manager, self.get_hydraulic_solver(), self.get_coverage_engine()
+            )
+        return self.cleanliness_model
+
+    def on_catalog_changed(self, file_keys):
+        """Rebuild the solver (and its cache) when a catalog it depends on is reloaded"""
+        if set(file_keys) & {'pumps', 'fluids', 'bends', 'connectors', 'nozzles'}:
+            self.hydraulic_solver = None
+            self.operating_point_solver = None
+        if set(file_keys) & {'nozzles', 'washing_components'}:
+            self.coverage_engine = None
+        if set(file_keys) & {'pumps', 'fluids', 'bends', 'connectors', 'nozzles', 'washing_components', 'dirt'}:
+            self.cleanliness_model = None
+
     # --- Page & Data Management Methods (Previously in PageController) ---
 
     def set_container_and_fonts(self, container, fonts):
@@ -8,6 +8,8 @@ from components.detail_list import DetailList
 from components.mode_selector import ModeSelector
 import uuid
 from components.synthesis import Synthesis
+from utils.circuit_graph import CircuitGraph
+from utils.pump_catalog import LITRES_PER_MINUTE
 
 class Circuits(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -28,6 +30,9 @@ class Circuits(ctk.CTkFrame):
         self._polling_active = False
         self._last_circuit_state = None
         
+        # Designers waiting for a hydraulic re-solve (edits are batched per Tk idle)
+        self._pending_hydraulics = set()
+        
         # Get configuration from controller (from previous pages)
         self.config = self._get_config_from_controller()
 
@@ -249,76 +254,44 @@ class Circuits(ctk.CTkFrame):
         
         return path
     
-    def _get_pump_outputs_ids(self, pump_comp, circuit_data, pump_config):
+    def _get_pump_outputs_ids(self, pump_comp, graph, pump_config):
         """
         Return a list of (output_index, to_id) for each output connection from the pump,
         ordered left-to-right by the x position of the 'to' component.
         """
-        pump_id = pump_comp.get('id')
-        # Get all direct connections from the pump
-        direct_conns = [conn for conn in circuit_data.get('connections', []) if conn['from'] == pump_id]
-        # Sort connections left-to-right by the x position of the 'to' component if possible
-        components_by_id = {comp['id']: comp for comp in circuit_data['components']}
-        def get_x(conn):
-            comp = components_by_id.get(conn['to'])
-            if comp and isinstance(comp.get('position'), (list, tuple)) and len(comp['position']) > 0:
-                return comp['position'][0]
-            return 0
-        direct_conns_sorted = sorted(direct_conns, key=get_x)
-        # Each connection is a separate output, index starting from 1
-        output_map = []
-        for idx, conn in enumerate(direct_conns_sorted, 1):
-            output_map.append((idx, [conn['to']]))
-        return output_map
+        return [(idx, [graph.connections[conn]['to']]) for idx, conn in graph.pump_outputs(pump_comp.get('id'))]
 
-    def _follow_output_path(self, start_id, circuit_data, components_by_id, visited=None):
+    def _follow_output_path(self, start_id, graph):
         """
-        Recursively follow the path from a given id, collecting all reachable 'component' type names.
+        Follow the path from a given id, collecting all reachable 'component' type names.
         Always explore further through connectors.
         """
-        if visited is None:
-            visited = set()
-        result = []
-        if start_id in visited:
-            return result
-        visited.add(start_id)
-        comp = components_by_id.get(start_id)
-        if comp:
-            if comp.get('type') == 'component':
-                result.append(comp['name'])
-            # Always continue through connectors and any other node
-            for conn in circuit_data.get('connections', []):
-                if conn['from'] == start_id:
-                    result += self._follow_output_path(conn['to'], circuit_data, components_by_id, visited)
-        return result
+        return [graph.node_name(comp_id) for comp_id in graph.reachable(start_id, ['component'])]
 
     def _generate_circuit_summary(self, circuit_data, pump_config):
         """Generate a summary of components connected to each pump output using IDs for tracking."""
         if not circuit_data or 'components' not in circuit_data:
             return {}
         
-        components_by_id = {comp['id']: comp for comp in circuit_data['components']}
+        # One adjacency pass per circuit; every output is then followed without rescanning connections
+        graph = CircuitGraph(circuit_data)
         
         # Find the pump component
-        pump_comp = None
-        for comp in circuit_data['components']:
-            if comp.get('type') == 'pump':
-                pump_comp = comp
-                break
-        if not pump_comp:
+        if graph.pump_id is None:
             return {}
+        pump_comp = graph.components[graph.pump_id]
         
         # Create a mapping of used component IDs to avoid duplicates
         used_component_ids = set()
         
         # For each output, follow its path and collect component IDs and names
         output_map = {}
-        outputs = self._get_pump_outputs_ids(pump_comp, circuit_data, pump_config)
+        outputs = self._get_pump_outputs_ids(pump_comp, graph, pump_config)
         for idx, to_ids in outputs:
             comp_list = []
             comp_ids_seen = set()  # Track circuit IDs to avoid duplicates
             for to_id in to_ids:
-                path_components = self._follow_output_path_with_ids(to_id, circuit_data, components_by_id, visited=set())
+                path_components = self._follow_output_path_with_ids(to_id, graph)
                 for comp_info in path_components:
                     comp_id = comp_info['id']
                     # Only add if we haven't seen this specific circuit component ID
@@ -794,28 +767,46 @@ class Circuits(ctk.CTkFrame):
         
         return {"pumps": [], "washing_components": []}
 
-    def _follow_output_path_with_ids(self, start_id, circuit_data, components_by_id, visited=None):
-        """Recursively follow the path from a given id, collecting component info with IDs."""
-        if visited is None:
-            visited = set()
-        result = []
-        if start_id in visited:
-            return result
-        visited.add(start_id)
-        
-        comp = components_by_id.get(start_id)
-        if comp and comp.get('type') == 'component':
-            result.append({
-                'id': comp['id'],
-                'name': comp['name'],
-                'type': comp['type']
-            })
-        
-        # Follow all outgoing connections
-        for conn in circuit_data.get('connections', []):
-            if conn['from'] == start_id:
-                result += self._follow_output_path_with_ids(conn['to'], circuit_data, components_by_id, visited)
-        return result
+    def _follow_output_path_with_ids(self, start_id, graph):
+        """Follow the path from a given id, collecting component info with IDs."""
+        return [
+            {
+                'id': comp_id,
+                'name': graph.components[comp_id]['name'],
+                'type': 'component'
+            }
+            for comp_id in graph.reachable(start_id, ['component'])
+        ]
+
+    def on_circuit_edited(self, designer):
+        """Schedule a hydraulic re-solve of the edited pump circuit once the current burst of edits is done"""
+        if designer in self._pending_hydraulics:
+            return
+        self._pending_hydraulics.add(designer)
+        self.after_idle(lambda: self._solve_edited_circuit(designer))
+
+    def _solve_edited_circuit(self, designer):
+        """Re-solve one pump circuit; unchanged outputs come back from the solver cache"""
+        self._pending_hydraulics.discard(designer)
+        if designer not in self.circuit_designers:
+            return
+        index = self.circuit_designers.index(designer)
+        try:
+            config = self.controller.get_config_data()
+            result = self.controller.get_hydraulic_solver().solve_configuration({
+                'general_settings': config.get('general_settings', {}),
+                'pumps': config.get('pumps', []),
+                'circuits': [{'pump_index': index, 'circuit': designer.get_circuit_data()}],
+            })[0]
+        except Exception as e:
+            print(f"Error solving circuit hydraulics: {e}")
+            return
+        
+        print(f"Hydraulics of pump {index + 1}: recomputed outputs {list(result.recomputed)}, cached {list(result.cached)}")
+        designer.show_hydraulics("   ".join(
+            f"Output {output.output}: {output.flow / LITRES_PER_MINUTE:.2f} L/min at {output.pressure / 1000:.0f} kPa"
+            for output in result.outputs
+        ))
 
     def save_current_configuration(self):
         """Save the configuration via the controller"""
@@ -1310,26 +1301,23 @@ class Circuits(ctk.CTkFrame):
                 print(f"❌ Circuit designer {i+1} has no components")
                 return False
             
-            components = circuit_data.get('components', [])
-            connections = circuit_data.get('connections', [])
+            graph = CircuitGraph(circuit_data)
             
-            print(f"  - Components: {len(components)}")
-            print(f"  - Connections: {len(connections)}")
+            print(f"  - Components: {len(graph)}")
+            print(f"  - Connections: {len(graph.connections)}")
             
             # Check if there's at least one pump component
-            pump_components = [comp for comp in components if comp.get('type') == 'pump']
-            if not pump_components:
+            if not graph.pumps:
                 print(f"❌ Circuit {i+1} has no pump component")
                 return False
             
             # Check if pump has at least one output connected
             pump_connected = False
-            for pump_comp in pump_components:
-                pump_id = pump_comp.get('id')
-                pump_connections = [conn for conn in connections if conn.get('from') == pump_id]
+            for pump_id in graph.pumps:
+                pump_connections = graph.outgoing.get(pump_id, [])
                 if pump_connections:
                     pump_connected = True
-                    print(f"  ✓ Pump {pump_comp.get('name', 'Unknown')} has {len(pump_connections)} connections")
+                    print(f"  ✓ Pump {graph.components[pump_id].get('name', 'Unknown')} has {len(pump_connections)} connections")
                     break
             
             if not pump_connected:
@@ -1337,7 +1325,7 @@ class Circuits(ctk.CTkFrame):
                 return False
             
             # Check if there are washing components
-            washing_components = [comp for comp in components if comp.get('type') == 'component']
+            washing_components = graph.washing_components
             if washing_components:
                 print(f"  ✓ Circuit {i+1} has {len(washing_components)} washing components")
             else:
@@ -1,6 +1,10 @@
 import customtkinter as ctk
+import threading
 from tkinter import messagebox
 from components.custom_button import CustomButton
+from components.search_picker import SearchPicker
+from utils.search_index import SearchIndex
+from utils.pump_catalog import LITRES_PER_MINUTE
 
 
 class GeneralSettings(ctk.CTkFrame):
@@ -89,16 +93,11 @@ class GeneralSettings(ctk.CTkFrame):
         )
         self.liquid_name_label.grid(row=0, column=0, sticky="w", pady=10)
 
-        # Get unique fluid names from DataManager
-        fluid_names = controller.data_manager.get_unique_fluid_names()
-        
-        # Fallback to default values if no data found
-        if not fluid_names:
-            fluid_names = ["Water", "Detergent", "Solvent"]
-        
-        self.liquid_name_dropdown = ctk.CTkOptionMenu(
+        # Type-ahead picker over the fluid names from DataManager
+        self.liquid_name_dropdown = SearchPicker(
             self.form_container,
-            values=fluid_names,
+            search_index=self._fluid_index(),
+            placeholder="Select liquid",
             font=controller.fonts.get("default", None),
             dropdown_font=controller.fonts.get("default", None),
             width=230
@@ -163,7 +162,8 @@ class GeneralSettings(ctk.CTkFrame):
         
         # Add bindings to update the Fahrenheit value
         self.liquid_temp_entry.bind("<KeyRelease>", self.update_fahrenheit)
-        self.temp_unit_dropdown.configure(command=self.update_fahrenheit)
+        self.temp_unit_dropdown.configure(command=self._on_temperature_unit_changed)
+        self.liquid_temp_entry.bind("<KeyRelease>", self.schedule_operating_points, add="+")
 
         # self.tank_ref_label = ctk.CTkLabel(
         #     self.form_container, 
@@ -264,6 +264,26 @@ class GeneralSettings(ctk.CTkFrame):
         self.voltage_unit_dropdown.set("V")
         self.voltage_unit_dropdown.pack(side="left")
 
+        # Live pump operating points at the entered voltage and temperature
+        self.operating_point_label = ctk.CTkLabel(
+            self.form_container,
+            text="",
+            font=controller.fonts.get("default", None),
+            text_color="gray",
+            justify="left",
+            anchor="w"
+        )
+        self.operating_point_label.grid(row=5, column=0, columnspan=5, sticky="w", pady=(0, 10))
+        self._operating_point_job = None
+        # Solves run on a worker thread; a solve requested while one runs waits for it,
+        # and results of a solve overtaken by a reset are dropped
+        self._operating_point_thread = None
+        self._operating_points_stale = False
+        self._operating_point_request = 0
+
+        self.power_voltage_entry.bind("<KeyRelease>", self.schedule_operating_points)
+        self.voltage_unit_dropdown.configure(command=self.schedule_operating_points)
+
         self.dirt_type_label = ctk.CTkLabel(
             self.form_container, 
             text="Dirt type", 
@@ -272,18 +292,8 @@ class GeneralSettings(ctk.CTkFrame):
         )
         self.dirt_type_label.grid(row=1, column=3, sticky="w", pady=10)
 
-        # Get dirt data from DataManager
-        dirt_data = controller.data_manager.get_dirt_data()
-        dirt_types = []
-        if dirt_data:
-            for item in dirt_data:
-                dirt_type = item.get('Dirt Type')
-                if dirt_type:
-                    dirt_types.append(str(dirt_type))
-        
-        # Fallback to default values if no data found
-        if not dirt_types:
-            dirt_types = ["Dirt", "Autre"]
+        # Get dirt types from DataManager
+        dirt_types = self._dirt_types()
         
         self.dirt_type_dropdown = ctk.CTkOptionMenu(
             self.form_container,
@@ -295,8 +305,42 @@ class GeneralSettings(ctk.CTkFrame):
         self.dirt_type_dropdown.set("Select dirt type")
         self.dirt_type_dropdown.grid(row=1, column=4, sticky="w", pady=10)  
 
+        # Refresh the fluid and dirt dropdowns when their catalogs are edited
+        controller.data_manager.subscribe(self)
+
     
     # =========================== Methodes ==========================
+    def _fluid_index(self):
+        """Search index over the fluid names for the liquid picker"""
+        index = self.controller.data_manager.get_search_index('fluids', 'LLG Name')
+        
+        # Fallback to default values if no data found
+        if not len(index):
+            index = SearchIndex(["Water", "Detergent", "Solvent"])
+        return index
+
+    def _dirt_types(self):
+        """Dirt types for the dirt dropdown"""
+        dirt_data = self.controller.data_manager.get_dirt_data()
+        dirt_types = []
+        if dirt_data:
+            for item in dirt_data:
+                dirt_type = item.get('Dirt Type')
+                if dirt_type:
+                    dirt_types.append(str(dirt_type))
+        
+        # Fallback to default values if no data found
+        if not dirt_types:
+            dirt_types = ["Dirt", "Autre"]
+        return dirt_types
+
+    def on_catalog_changed(self, file_keys):
+        """Refresh only the dropdowns whose catalog was reloaded"""
+        if 'fluids' in file_keys:
+            self.liquid_name_dropdown.set_index(self._fluid_index())
+        if 'dirt' in file_keys:
+            self.dirt_type_dropdown.configure(values=self._dirt_types())
+
     def get_configuration(self):
         """Get the current configuration from the form"""
         return {
@@ -409,6 +453,78 @@ class GeneralSettings(ctk.CTkFrame):
             except:
                 self.fareniheit_label.configure(text="0.0°F")
 
+    def _on_temperature_unit_changed(self, *args):
+        self.update_fahrenheit()
+        self.schedule_operating_points()
+
+    def schedule_operating_points(self, *args):
+        """Refresh the operating points once typing pauses"""
+        if self._operating_point_job is not None:
+            self.after_cancel(self._operating_point_job)
+        self._operating_point_job = self.after(250, self.update_operating_points)
+
+    def update_operating_points(self):
+        """Solve where each pump output settles at the voltage and temperature in the form, off the Tk thread"""
+        self._operating_point_job = None
+        if self._operating_point_thread is not None and self._operating_point_thread.is_alive():
+            # Solve again with the latest form once the running solve is done
+            self._operating_points_stale = True
+            return
+        self._operating_points_stale = False
+        self._operating_point_request += 1
+
+        config = dict(self.controller.get_config_data() or {})
+        if not config.get('circuits'):
+            self.operating_point_label.configure(text="")
+            return
+        config['general_settings'] = self.get_configuration()
+        try:
+            solver = self.controller.get_operating_point_solver()
+        except Exception as e:
+            print(f"Error computing operating points: {e}")
+            self.operating_point_label.configure(text="")
+            return
+
+        # A cold solve builds the system curves of every circuit, which takes seconds
+        outcome = {}
+        self._operating_point_thread = threading.Thread(
+            target=self._solve_operating_points, args=(solver, config, outcome),
+            name="operating-points", daemon=True
+        )
+        self._operating_point_thread.start()
+        self.after(50, self._poll_operating_points, self._operating_point_request, outcome)
+
+    @staticmethod
+    def _solve_operating_points(solver, config, outcome):
+        """Worker thread: never touches widgets, the poll shows the outcome"""
+        try:
+            outcome['points'] = solver.operating_points(config)
+        except Exception as e:
+            outcome['error'] = e
+
+    def _poll_operating_points(self, request, outcome):
+        """Show the operating points once the worker is done"""
+        if self._operating_point_thread is not None and self._operating_point_thread.is_alive():
+            self.after(50, self._poll_operating_points, request, outcome)
+            return
+        if self._operating_points_stale:
+            self.update_operating_points()
+            return
+        if request != self._operating_point_request:
+            return
+        if 'error' in outcome:
+            print(f"Error computing operating points: {outcome['error']}")
+            self.operating_point_label.configure(text="")
+            return
+
+        points = outcome.get('points', [])
+        lines = [
+            f"Pump {point.pump_index + 1} ({point.pump_name}) output {point.output}: "
+            f"{point.flow / LITRES_PER_MINUTE:.2f} L/min at {point.pressure / 1000:.0f} kPa"
+            for point in points
+        ]
+        self.operating_point_label.configure(text="\n".join(lines))
+
     # def update_tank_details(self, selected_tank):
     #     """Update supplier and volume labels based on selected tank"""
     #     if selected_tank in self.tank_data:
@@ -460,6 +576,7 @@ class GeneralSettings(ctk.CTkFrame):
     
     def on_show_page(self):
         """Called when the page is shown"""
+        self.schedule_operating_points()
         # Check if the form is still complete
         if self.is_form_completed():
             self.controller.mark_page_completed("general_settings")
@@ -483,5 +600,9 @@ class GeneralSettings(ctk.CTkFrame):
         self.volume_unit_dropdown.set("L")
         self.voltage_unit_dropdown.set("V")
         self.fareniheit_label.configure(text="0.0°F")
+        # Drop the result of a solve still running for the old form
+        self._operating_point_request += 1
+        self._operating_points_stale = False
+        self.operating_point_label.configure(text="")
         # self.supplier_label.configure(text="Supplier : XXXXXX")
         # self.volume_label.configure(text="Volume : X L")
\ No newline at end of file
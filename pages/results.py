@@ -3,6 +3,8 @@ from tkinter import messagebox
 from components.custom_button import CustomButton
 from components.tabview import ThemedTabview
 from components.config_result import ConfigResult
+from utils.pump_catalog import LITRES_PER_MINUTE
+from utils.tolerance_analysis import ToleranceAnalysis
 
 class Results(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -73,6 +75,18 @@ class Results(ctk.CTkFrame):
         
         self.config_result = ConfigResult(self.scrollable_frame, controller)
         self.config_result.pack(fill="both", expand=True)
+
+        # Monte Carlo tolerance bands, filled in while the analysis runs
+        self.tolerance_analysis = None
+        self.tolerance_label = ctk.CTkLabel(
+            self.scrollable_frame,
+            text="",
+            font=controller.fonts.get("default", None),
+            text_color="gray",
+            justify="left",
+            anchor="w"
+        )
+        self.tolerance_label.pack(fill="x", pady=(10, 0))
         
         # Bottom frame for buttons in tab1
         self.bottom_frame_tab1 = ctk.CTkFrame(self.tab1, fg_color="transparent")
@@ -91,6 +105,18 @@ class Results(ctk.CTkFrame):
         )
         self.next_button.pack(side="right")
 
+        # Tolerance analysis button
+        self.tolerance_button = CustomButton(
+            self.bottom_frame_tab1,
+            text="Tolerance analysis",
+            font=controller.fonts.get("default", None),
+            icon_path="assets/icons/refresh.png",
+            icon_side="left",
+            outlined=True,
+            command=self.start_tolerance_analysis
+        )
+        self.tolerance_button.pack(side="right", padx=(0, 10))
+
 
 
         # ======================== TAB 2 - Comparative Analysis ========================
@@ -152,6 +178,54 @@ class Results(ctk.CTkFrame):
         # If you have any appearance-dependent elements, update them here
         pass
 
+    def load_configuration(self, config_data):
+        """Rebuild the results block so it reflects the current configuration"""
+        try:
+            self.config_result.destroy()
+            self.config_result = ConfigResult(self.scrollable_frame, self.controller)
+            self.config_result.pack(fill="both", expand=True, before=self.tolerance_label)
+            if self.tolerance_analysis is not None:
+                self.tolerance_analysis.cancel()
+                self.tolerance_analysis = None
+            self.tolerance_label.configure(text="")
+        except Exception as e:
+            print(f"Error loading results configuration: {e}")
+
+    def start_tolerance_analysis(self):
+        """Start the Monte Carlo analysis in the background and poll it"""
+        if self.tolerance_analysis is not None and self.tolerance_analysis.is_running():
+            return
+        self.tolerance_analysis = ToleranceAnalysis(self.controller.get_hydraulic_solver())
+        self.tolerance_analysis.start(self.controller.get_config_data())
+        self.tolerance_label.configure(text="Tolerance analysis: starting...")
+        self.after(200, self._poll_tolerance_analysis)
+
+    def _poll_tolerance_analysis(self):
+        """Show progress, then the percentile bands once the analysis is done"""
+        analysis = self.tolerance_analysis
+        if analysis is None:
+            return
+        if analysis.is_running():
+            done, total = analysis.progress()
+            self.tolerance_label.configure(text=f"Tolerance analysis: {done}/{total} variants")
+            self.after(200, self._poll_tolerance_analysis)
+            return
+
+        result = analysis.result()
+        if result is None:
+            self.tolerance_label.configure(text=f"Tolerance analysis failed: {analysis.error() or 'cancelled'}")
+            return
+        low, mid, high = result.percentiles
+        lines = [f"Tolerance analysis ({result.variants} variants, P{low:.0f} / P{mid:.0f} / P{high:.0f}):"]
+        for nozzle in result.nozzles:
+            line = (f"Pump {nozzle.pump_index + 1} output {nozzle.output} - {nozzle.name}: "
+                    f"{' / '.join(f'{p / 1000:.0f}' for p in nozzle.pressure)} kPa, "
+                    f"{' / '.join(f'{q / LITRES_PER_MINUTE:.2f}' for q in nozzle.flow)} L/min")
+            if nozzle.consumption[1] == nozzle.consumption[1]:
+                line += f", {' / '.join(f'{v * 1e6:.0f}' for v in nozzle.consumption)} mL"
+            lines.append(line)
+        self.tolerance_label.configure(text="\n".join(lines))
+
     def save_configuration(self):
         """Save the configuration via the controller"""
         if self.controller.save_whole_configuration():
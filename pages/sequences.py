@@ -1,10 +1,13 @@
 import customtkinter as ctk
 import tkinter
+import numpy as np
 from tkinter import messagebox
 from components.custom_button import CustomButton
 from utils.open_image import open_icon
 from components.priority_selector import PrioritySelector
 from components.sequence_visualizer import SequenceVisualizer
+from utils.sequence_simulation import LITRE, SequenceSimulator
+from utils.pump_catalog import LITRES_PER_MINUTE
 
 class Sequences(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -222,6 +225,22 @@ class Sequences(ctk.CTkFrame):
             )
             self.clear_button.grid(row=0, column=1, padx=(5, 10), pady=10, sticky="ew")
 
+            # Fill every duration with the shortest spray reaching its washing performance target
+            self.size_button = CustomButton(
+                self.button_container_frame,
+                text="Size durations",
+                font=self.controller.fonts.get("default", None),
+                icon_path="assets/icons/refresh.png",
+                icon_side="left",
+                outlined=True,
+                custom_fg_color="#F8F8F8",
+                custom_text_color="#243783",
+                custom_hover_color="#C8C8C8",
+                custom_border_color="#243783",
+                command=self.size_durations,
+            )
+            self.size_button.grid(row=1, column=0, columnspan=2, padx=10, pady=(0, 10), sticky="ew")
+
             # Create sequence visualizer
             self.sequence_visualizer = SequenceVisualizer(
                 self.content_frame,
@@ -230,6 +249,17 @@ class Sequences(ctk.CTkFrame):
                 height=300
             )
             self.sequence_visualizer.grid(row=0, column=1, sticky="nsew", padx=(20, 0))
+
+            # Summary of the simulated sequence (liquid, power, tank)
+            self.simulation_label = ctk.CTkLabel(
+                self.content_frame,
+                text="",
+                font=self.controller.fonts.get("default", None),
+                text_color="gray",
+                justify="left",
+                anchor="w"
+            )
+            self.simulation_label.grid(row=1, column=1, sticky="w", padx=(20, 0), pady=(10, 0))
             
             # Mark UI as initialized only after all components are created
             self.ui_initialized = True
@@ -745,6 +775,7 @@ class Sequences(ctk.CTkFrame):
         
         # Clear the visualization
         self.sequence_visualizer.clear_visualization()
+        self.simulation_label.configure(text="")
     
     def on_priority_change(self, task_name, new_priority):
         """Handle priority change with pump output constraints"""
@@ -858,12 +889,82 @@ class Sequences(ctk.CTkFrame):
         
         # Update the sequence visualizer
         self.sequence_visualizer.update_visualization(tasks_data)
+        self.update_simulation()
         if self.is_completed():
             self.controller.mark_page_completed("sequence")
         else:
             self.controller.mark_page_incomplete("sequence")
             self.controller.show_page("sequence")
     
+    def size_durations(self):
+        """Fill in the minimum duration of every task from the cleanliness model, then update"""
+        config = dict(self.controller.get_config_data() or {})
+        if not config.get('circuits') or not self.task_rows:
+            return
+        tasks = [{
+            'name': row['task_name'],
+            'component_id': row.get('component_id'),
+            'pump_index': row.get('pump_index'),
+            'output_num': row.get('output_num'),
+        } for row in self.task_rows]
+        try:
+            sized = self.controller.get_cleanliness_model().size_durations(config, tasks)
+        except Exception as e:
+            print(f"Error sizing durations: {e}")
+            return
+
+        unreachable = []
+        for row, item in zip(self.task_rows, sized):
+            if item.target != item.target:
+                # No Targeted Washing Preformance set: nothing to size, keep the entered duration
+                continue
+            if item.duration != item.duration:
+                unreachable.append(row['task_name'])
+                continue
+            row['duration_entry'].delete(0, 'end')
+            row['duration_entry'].insert(0, f"{item.duration:g}")
+            row['unit_dropdown'].set("s")
+        for task_name in unreachable:
+            print(f"Duration sizing: {task_name} cannot reach its washing performance target")
+        self.update_sequence()
+        if unreachable:
+            self.simulation_label.configure(
+                text=self.simulation_label.cget("text") + f"\nTarget out of reach: {', '.join(unreachable)}"
+            )
+
+    def update_simulation(self):
+        """Simulate the sequence against the circuits and summarise it under the timeline"""
+        config = dict(self.controller.get_config_data() or {})
+        config['sequences'] = self.get_configuration()
+        if not config.get('circuits'):
+            self.simulation_label.configure(text="")
+            return
+        try:
+            results = self.controller.get_hydraulic_solver().solve_configuration(config)
+            simulation = SequenceSimulator(self.controller.get_hydraulic_solver()).simulate(config, results)
+            cleaning = self.controller.get_cleanliness_model().evaluate(config, results)
+        except Exception as e:
+            print(f"Error simulating sequence: {e}")
+            self.simulation_label.configure(text="")
+            return
+
+        for warning in simulation.warnings:
+            print(f"Sequence simulation: {warning}")
+        lines = [
+            f"Liquid sprayed: {simulation.consumed[-1] / LITRE:.3f} L, "
+            f"peak flow {simulation.total_flow().max() / LITRES_PER_MINUTE:.2f} L/min",
+            f"Peak pump power: {simulation.pump_power.sum(axis=1).max():.1f} W",
+        ]
+        if simulation.empty_at is not None:
+            lines.append(f"Tank runs dry at {simulation.empty_at:.1f} s")
+        elif not np.isnan(simulation.tank_volume[-1]):
+            lines.append(f"Left in tank: {simulation.tank_volume[-1] / LITRE:.3f} L")
+        if cleaning:
+            missed = [item for item in cleaning if not item.meets_target]
+            lines.append(f"Cleanliness on target: {len(cleaning) - len(missed)}/{len(cleaning)} components"
+                         + (f", lowest {min(missed, key=lambda i: i.achieved - i.target).component}" if missed else ""))
+        self.simulation_label.configure(text="\n".join(lines))
+
     def update_appearance(self):
         """Update any appearance-dependent elements"""
         # Update the sequence visualizer appearance
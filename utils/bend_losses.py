@@ -0,0 +1,128 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from utils.catalog_columns import find_column
+
+Array = Union[float, np.ndarray]
+
+# Crane TP-410 resistance of 90° pipe bends, K = multiplier * f_T, by r/D
+CRANE_RATIO = [1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0, 16.0, 20.0]
+CRANE_MULTIPLIER = [20.0, 14.0, 12.0, 12.0, 14.0, 17.0, 24.0, 30.0, 34.0, 38.0, 42.0, 50.0]
+# Fully turbulent friction factor of the small smooth tubes used on the washing circuits
+DEFAULT_TURBULENT_FRICTION = 0.025
+
+
+class BendLossTable:
+    """
+    Loss coefficient K of a pipe bend as a function of r/D.
+
+    The reference curve (Crane, 90° bend) is replaced by the Bend_Radius
+    catalog when it carries r/D and K columns. Either way it is resampled
+    once onto a uniform grid in log(r/D), so evaluating any number of bends
+    is an index computation and one linear blend on NumPy arrays. r/D is
+    clamped to the sampled range; K scales linearly with the bend angle.
+    """
+
+    GRID_SIZE = 256
+
+    def __init__(self, records: Optional[List[Dict[str, Any]]] = None,
+                 turbulent_friction: float = DEFAULT_TURBULENT_FRICTION):
+        ratio = np.asarray(CRANE_RATIO)
+        coefficient = np.asarray(CRANE_MULTIPLIER) * turbulent_friction
+        self.radii: List[float] = []
+
+        if records:
+            columns = list(records[0].keys())
+            ratio_column = find_column(columns, ['r/D', 'R/D', 'Ratio'], ['r/d', 'ratio'])
+            k_column = find_column(columns, ['K', 'Loss Coefficient'], ['coefficient', 'loss'])
+            radius_column = find_column(columns, ['Bend Radius (mm)', 'Bend Radius'], ['radius'])
+
+            if radius_column:
+                # The catalog radii are the ones the bending tools can make
+                self.radii = sorted({
+                    float(record[radius_column]) for record in records
+                    if _is_number(record.get(radius_column))
+                })
+            if ratio_column and k_column:
+                points = sorted(
+                    (float(record[ratio_column]), float(record[k_column])) for record in records
+                    if _is_number(record.get(ratio_column)) and _is_number(record.get(k_column))
+                    and float(record[ratio_column]) > 0
+                )
+                if len(points) >= 2:
+                    ratio, coefficient = (np.asarray(values) for values in zip(*points))
+
+        self.min_ratio = float(ratio[0])
+        self.max_ratio = float(ratio[-1])
+        self._log_min = np.log(self.min_ratio)
+        self._log_step = (np.log(self.max_ratio) - self._log_min) / (self.GRID_SIZE - 1)
+        grid = np.exp(self._log_min + self._log_step * np.arange(self.GRID_SIZE))
+        self._grid = np.interp(np.log(grid), np.log(ratio), coefficient)
+        # Slopes per grid cell, padded so the last index is valid too
+        self._slope = np.append(np.diff(self._grid), 0.0)
+
+    def coefficient_for_ratio(self, ratio: Array) -> Array:
+        """K of a 90° bend for scalar or array r/D"""
+        position = (np.log(np.clip(ratio, self.min_ratio, self.max_ratio)) - self._log_min) / self._log_step
+        index = np.minimum(position.astype(np.int64) if np.ndim(position) else int(position), self.GRID_SIZE - 1)
+        k = self._grid[index] + self._slope[index] * (position - index)
+        return float(k) if np.ndim(k) == 0 else k
+
+    def coefficient(self, bend_radius_mm: Array, diameter_mm: Array, angle_deg: Array = 90.0) -> Array:
+        """K of bends given their radius and pipe diameter in mm; radius 0 means straight (K = 0)"""
+        bend_radius_mm = np.asarray(bend_radius_mm, dtype=float)
+        diameter_mm = np.asarray(diameter_mm, dtype=float)
+        bent = (bend_radius_mm > 0) & (diameter_mm > 0)
+        ratio = np.where(bent, bend_radius_mm / np.where(diameter_mm > 0, diameter_mm, 1.0), self.min_ratio)
+        k = np.where(bent, self.coefficient_for_ratio(ratio) * (np.asarray(angle_deg, dtype=float) / 90.0), 0.0)
+        return float(k) if k.ndim == 0 else k
+
+    def connection_coefficients(self, connections: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """K of every connection of a circuit (see CircuitDesigner.get_circuit_data) in one pass"""
+        radius = np.zeros(len(connections))
+        diameter = np.zeros(len(connections))
+        for i, connection in enumerate(connections):
+            parameters = connection.get('parameters', {})
+            if parameters.get('inclination') == 'bent':
+                radius[i] = _as_float(parameters.get('bend_radius'))
+            diameter[i] = _as_float(parameters.get('diameter'))
+        return self.coefficient(radius, diameter)
+
+    def nearest_radius(self, bend_radius_mm: float) -> Optional[float]:
+        """Closest bend radius offered by the catalog, if it lists any"""
+        if not self.radii:
+            return None
+        return min(self.radii, key=lambda radius: abs(radius - bend_radius_mm))
+
+
+def _is_number(value: Any) -> bool:
+    try:
+        return float(value) == float(value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _as_float(value: Any) -> float:
+    return float(value) if _is_number(value) else 0.0
+
+
+if __name__ == "__main__":
+    table = BendLossTable()
+    for ratio in [0.5, 1.0, 2.0, 5.0, 20.0]:
+        print(f"r/D = {ratio:>5}: K = {table.coefficient_for_ratio(ratio):.3f}")
+
+    rng = np.random.default_rng(0)
+    radius = rng.uniform(0, 200, 100_000)
+    diameter = rng.choice([4.0, 6.0, 8.0, 10.0], 100_000)
+
+    start = time.perf_counter()
+    table.coefficient(radius, diameter)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for r, d in zip(radius[:10_000], diameter[:10_000]):
+        np.interp(np.log(r / d), np.log(CRANE_RATIO), CRANE_MULTIPLIER)
+    per_pipe = (time.perf_counter() - start) * 10
+    print(f"100k bends: grid {vectorized * 1e3:.2f} ms, per-pipe np.interp {per_pipe * 1e3:.0f} ms")
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+# Bump when the on-disk layout changes so stale caches are rebuilt
+CACHE_FORMAT_VERSION = 1
+
+
+class CatalogCache:
+    """
+    Compiled on-disk cache for catalog workbooks.
+
+    Each workbook is stored as one binary pandas pickle (column blocks, no
+    openpyxl involved on read). Entries are keyed by the absolute source
+    path and validated against its size, mtime and SHA-256 content hash.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_folder: str):
+        self.cache_folder = cache_folder
+        self._lock = threading.Lock()
+        self._index = None
+
+    # --- Index handling ---
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_folder, self.INDEX_FILE)
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Read the index from disk once, discarding it if the format changed"""
+        if self._index is not None:
+            return self._index
+
+        index = {}
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if (stored.get("format") == CACHE_FORMAT_VERSION and
+                    stored.get("pandas") == pd.__version__):
+                index = stored.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+        self._index = index
+        return self._index
+
+    def _save_index(self):
+        """Atomically write the index so a crash never leaves it half written"""
+        os.makedirs(self.cache_folder, exist_ok=True)
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "format": CACHE_FORMAT_VERSION,
+                "pandas": pd.__version__,
+                "entries": self._index
+            }, f, indent=2)
+        os.replace(tmp_path, self._index_path())
+
+    # --- Keys ---
+
+    @staticmethod
+    def file_signature(file_path: str) -> Dict[str, int]:
+        """Return the cheap part of the cache key (size and mtime)"""
+        stat = os.stat(file_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """Return the SHA-256 of the file contents"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def snapshot(cls, file_path: str) -> Dict[str, Any]:
+        """Return the full cache key (size, mtime and SHA-256); take it before parsing the file"""
+        entry = cls.file_signature(file_path)
+        entry["sha256"] = cls.file_hash(file_path)
+        return entry
+
+    def _blob_path(self, source_path: str) -> str:
+        name = hashlib.sha1(source_path.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_folder, f"{name}.pkl")
+
+    # --- Public API ---
+
+    def load(self, file_path: str) -> Optional[pd.DataFrame]:
+        """
+        Return the cached DataFrame for a workbook, or None on a miss.
+
+        Size and mtime are checked first; if they differ the content hash
+        decides, so a touched but unchanged file is still a hit.
+        """
+        loaded = self.load_entry(file_path)
+        return loaded[0] if loaded is not None else None
+
+    def load_entry(self, file_path: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Like load(), with the key (size, mtime, SHA-256) of the file contents the frame was parsed from"""
+        source_path = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._load_index().get(source_path)
+            if not entry:
+                return None
+
+            signature = self.file_signature(source_path)
+            if (entry.get("size") != signature["size"] or
+                    entry.get("mtime_ns") != signature["mtime_ns"]):
+                if entry.get("sha256") != self.file_hash(source_path):
+                    return None
+                # Same content, new timestamp: refresh the cheap key
+                entry.update(signature)
+                self._save_index()
+
+            blob_path = entry.get("blob", "")
+            if not os.path.exists(blob_path):
+                return None
+            key = {name: entry[name] for name in ("size", "mtime_ns", "sha256")}
+
+        try:
+            return pd.read_pickle(blob_path), key
+        except Exception as e:
+            print(f"Discarding unreadable catalog cache for '{file_path}': {e}")
+            self.invalidate(file_path)
+            return None
+
+    def store(self, file_path: str, df: pd.DataFrame, snapshot: Optional[Dict[str, Any]] = None):
+        """
+        Write a parsed workbook to the cache under `snapshot`, the key taken
+        before parsing. Keying it after the parse would file the old rows
+        under the new contents if the workbook was saved in between.
+        """
+        source_path = os.path.abspath(file_path)
+        blob_path = self._blob_path(source_path)
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+        entry = dict(snapshot) if snapshot is not None else self.snapshot(source_path)
+        entry["blob"] = blob_path
+
+        tmp_path = blob_path + ".tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, blob_path)
+
+        with self._lock:
+            self._load_index()[source_path] = entry
+            self._save_index()
+
+    def invalidate(self, file_path: str):
+        """Drop the cache entry of one workbook"""
+        source_path = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._load_index().pop(source_path, None)
+            if entry is None:
+                return
+            self._save_index()
+        try:
+            os.remove(entry.get("blob", ""))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Drop every cache entry"""
+        with self._lock:
+            entries = self._load_index()
+            for entry in entries.values():
+                try:
+                    os.remove(entry.get("blob", ""))
+                except OSError:
+                    pass
+            entries.clear()
+            self._save_index()
@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+# Lookup keys of each catalog: key -> (known column names, keywords to
+# recognise a renamed column). Suppliers do not always use the same headers.
+LOOKUP_COLUMNS: Dict[str, Dict[str, Tuple[Sequence[str], Sequence[str]]]] = {
+    'washing_components': {
+        'name': (['Component Name', 'Component'], ['component']),
+    },
+    'nozzles': {
+        'name': (['Nozzle Ref', 'Nozzle Reference', 'Ref'], ['ref']),
+    },
+    'pipes': {
+        'type': (['Pipe Type', 'Type'], ['type']),
+        'diameter': (['Diam. (mm)', 'Diameter (mm)', 'Diameter'], ['diam']),
+    },
+    'connectors': {
+        'type': (['Connector Type', 'Type'], ['type']),
+    },
+    'fluids': {
+        'name': (['LLG Name', 'Name'], ['name']),
+    },
+    'dirt': {
+        'type': (['Dirt Type', 'Type'], ['dirt', 'type']),
+    },
+    'bends': {
+        'radius': (['Bend Radius (mm)', 'Bend Radius', 'Radius (mm)', 'Radius'], ['radius']),
+    },
+}
+
+
+def find_column(columns: Iterable[str], candidates: Sequence[str] = (),
+                keywords: Sequence[str] = ()) -> Optional[str]:
+    """
+    Pick the column holding a value from a sheet header.
+
+    Exact candidate names win, then case-insensitive candidates, then the
+    first column whose name contains one of the keywords.
+    """
+    columns = [str(column) for column in columns]
+    for candidate in candidates:
+        if candidate in columns:
+            return candidate
+
+    lowered = {column.strip().lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate.lower() in lowered:
+            return lowered[candidate.lower()]
+
+    for keyword in keywords:
+        for column in columns:
+            if keyword.lower() in column.lower():
+                return column
+    return None
+
+
+def lookup_column(file_key: str, key: str, columns: Iterable[str]) -> Optional[str]:
+    """Resolve one of the LOOKUP_COLUMNS keys against an actual sheet header"""
+    candidates, keywords = LOOKUP_COLUMNS.get(file_key, {}).get(key, ((), ()))
+    return find_column(columns, candidates, keywords)
@@ -0,0 +1,100 @@
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class PipeReference(NamedTuple):
+    """Reference number and supplier of a catalog pipe"""
+    ref: str
+    supplier: str
+
+
+def _is_missing(value: Any) -> bool:
+    """True for None and NaN cells coming from pandas"""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class PipeCatalogIndex:
+    """
+    Multi-key index over the pipe catalog records.
+
+    Built once per catalog load so every dropdown query is a dictionary
+    lookup instead of a scan of the whole catalog.
+    """
+
+    TYPE_COLUMN = 'Pipe Type'
+    DIAMETER_COLUMN = 'Diam. (mm)'
+    REF_COLUMN = 'Pipe Ref'
+    SUPPLIER_COLUMN = 'Supplier'
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._rows_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        self._rows_by_diameter: Dict[float, List[Dict[str, Any]]] = {}
+        self._rows_by_key: Dict[Tuple[str, float], List[Dict[str, Any]]] = {}
+        self._rows: List[Dict[str, Any]] = []
+
+        for row in records or []:
+            pipe_type = row.get(self.TYPE_COLUMN)
+            diameter = row.get(self.DIAMETER_COLUMN)
+            pipe_type = None if _is_missing(pipe_type) else str(pipe_type)
+            try:
+                diameter = None if _is_missing(diameter) else float(diameter)
+            except (TypeError, ValueError):
+                diameter = None
+
+            self._rows.append(row)
+            if pipe_type is not None:
+                self._rows_by_type.setdefault(pipe_type, []).append(row)
+            if diameter is not None:
+                self._rows_by_diameter.setdefault(diameter, []).append(row)
+            if pipe_type is not None and diameter is not None:
+                self._rows_by_key.setdefault((pipe_type, diameter), []).append(row)
+
+        # Sorted option lists are precomputed per key
+        types_by_diameter: Dict[float, set] = {}
+        diameters_by_type: Dict[str, set] = {}
+        for pipe_type, diameter in self._rows_by_key:
+            types_by_diameter.setdefault(diameter, set()).add(pipe_type)
+            diameters_by_type.setdefault(pipe_type, set()).add(diameter)
+
+        self._all_types = sorted(self._rows_by_type)
+        self._all_diameters = sorted(self._rows_by_diameter)
+        self._types_by_diameter = {d: sorted(types) for d, types in types_by_diameter.items()}
+        self._diameters_by_type = {t: sorted(diameters) for t, diameters in diameters_by_type.items()}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def types(self, diameter: Optional[float] = None) -> List[str]:
+        """Pipe types available, optionally only those sold in the given diameter"""
+        if diameter is None:
+            return list(self._all_types)
+        return list(self._types_by_diameter.get(float(diameter), []))
+
+    def diameters(self, pipe_type: Optional[str] = None) -> List[float]:
+        """Diameters (mm) available, optionally only those of the given pipe type"""
+        if pipe_type is None:
+            return list(self._all_diameters)
+        return list(self._diameters_by_type.get(pipe_type, []))
+
+    def find(self, pipe_type: Optional[str] = None, diameter: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Catalog rows matching the given type and/or diameter, in catalog order"""
+        if pipe_type is not None and diameter is not None:
+            return self._rows_by_key.get((pipe_type, float(diameter)), [])
+        if pipe_type is not None:
+            return self._rows_by_type.get(pipe_type, [])
+        if diameter is not None:
+            return self._rows_by_diameter.get(float(diameter), [])
+        return self._rows
+
+    def reference(self, pipe_type: Optional[str] = None, diameter: Optional[float] = None) -> Optional[PipeReference]:
+        """Ref and supplier of the first catalog row matching the selection"""
+        rows = self.find(pipe_type, diameter)
+        if not rows:
+            return None
+        row = rows[0]
+        ref = row.get(self.REF_COLUMN)
+        supplier = row.get(self.SUPPLIER_COLUMN)
+        return PipeReference(
+            ref='xxx-xxx-xxx' if _is_missing(ref) else str(ref),
+            supplier='xxxxxxxx' if _is_missing(supplier) else str(supplier)
+        )
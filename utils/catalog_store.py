@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from utils.catalog_cache import CatalogCache
+from utils.catalog_columns import LOOKUP_COLUMNS, lookup_column
+
+
+def _quote(name: str) -> str:
+    """Quote an identifier; catalog headers contain spaces, dots and brackets"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class CatalogStore:
+    """
+    SQLite copy of the catalog workbooks.
+
+    Each file key becomes one table, indexed on its lookup keys (see
+    LOOKUP_COLUMNS), plus a catalog_meta row holding the size, mtime and
+    SHA-256 of the workbook it was imported from. The database runs in WAL
+    mode so several app instances can read it while one re-imports.
+    """
+
+    META_TABLE = "catalog_meta"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.META_TABLE} ("
+                "file_key TEXT PRIMARY KEY, source TEXT, size INTEGER, "
+                "mtime_ns INTEGER, sha256 TEXT, imported_at REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection committed on success, so any thread can use the store"""
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    # --- Freshness ---
+
+    def meta(self, file_key: str) -> Optional[Dict[str, Any]]:
+        """Source path, size, mtime and SHA-256 of the workbook a table was imported from"""
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT source, size, mtime_ns, sha256 FROM {self.META_TABLE} WHERE file_key = ?",
+                (file_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"source": row[0], "size": row[1], "mtime_ns": row[2], "sha256": row[3]}
+
+    def is_current(self, file_key: str, file_path: str) -> bool:
+        """True if the table was imported from the workbook as it is on disk now"""
+        meta = self.meta(file_key)
+        source_path = os.path.abspath(file_path)
+        if meta is None or meta["source"] != source_path:
+            return False
+
+        signature = CatalogCache.file_signature(source_path)
+        if meta["size"] == signature["size"] and meta["mtime_ns"] == signature["mtime_ns"]:
+            return True
+        if meta["sha256"] != CatalogCache.file_hash(source_path):
+            return False
+
+        # Same content, new timestamp: refresh the cheap key
+        with self._write_lock, self._connect() as connection:
+            connection.execute(
+                f"UPDATE {self.META_TABLE} SET size = ?, mtime_ns = ? WHERE file_key = ?",
+                (signature["size"], signature["mtime_ns"], file_key)
+            )
+        return True
+
+    # --- Import ---
+
+    def import_frame(self, file_key: str, file_path: str, df: pd.DataFrame,
+                     snapshot: Optional[Dict[str, Any]] = None):
+        """
+        Replace the table of a catalog and index its lookup columns. The
+        table is keyed by `snapshot` (CatalogCache.snapshot), taken before
+        the workbook was parsed; keying it now would file the old rows
+        under the new contents if the workbook was saved in between.
+        """
+        source_path = os.path.abspath(file_path)
+        snapshot = snapshot if snapshot is not None else CatalogCache.snapshot(source_path)
+        staging = f"{file_key}__import"
+
+        with self._write_lock, self._connect() as connection:
+            df.to_sql(staging, connection, if_exists='replace', index=False)
+            connection.execute(f"DROP TABLE IF EXISTS {_quote(file_key)}")
+            connection.execute(f"ALTER TABLE {_quote(staging)} RENAME TO {_quote(file_key)}")
+
+            columns = []
+            for key in LOOKUP_COLUMNS.get(file_key, {}):
+                column = lookup_column(file_key, key, df.columns)
+                if column is not None:
+                    columns.append(column)
+                    connection.execute(
+                        f"CREATE INDEX {_quote(f'idx_{file_key}_{key}')} "
+                        f"ON {_quote(file_key)} ({_quote(column)})"
+                    )
+            if len(columns) > 1:
+                # Compound index for the combined filters (pipe type + diameter)
+                connection.execute(
+                    f"CREATE INDEX {_quote(f'idx_{file_key}_lookup')} ON {_quote(file_key)} "
+                    f"({', '.join(_quote(column) for column in columns)})"
+                )
+
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.META_TABLE} VALUES (?, ?, ?, ?, ?, ?)",
+                (file_key, source_path, snapshot["size"], snapshot["mtime_ns"], snapshot["sha256"], time.time())
+            )
+
+    def drop(self, file_key: str):
+        with self._write_lock, self._connect() as connection:
+            connection.execute(f"DROP TABLE IF EXISTS {_quote(file_key)}")
+            connection.execute(f"DELETE FROM {self.META_TABLE} WHERE file_key = ?", (file_key,))
+
+    # --- Queries ---
+
+    def load_frame(self, file_key: str, file_path: str) -> Optional[pd.DataFrame]:
+        """Whole table in workbook row order, or None if it is missing or stale"""
+        if not self.is_current(file_key, file_path):
+            return None
+        with self._connect() as connection:
+            return pd.read_sql_query(f"SELECT * FROM {_quote(file_key)} ORDER BY rowid", connection)
+
+    @staticmethod
+    def _where(conditions: Optional[Dict[str, Any]]):
+        if not conditions:
+            return "", []
+        clause = " AND ".join(f"{_quote(column)} = ?" for column in conditions)
+        return f" WHERE {clause}", list(conditions.values())
+
+    def lookup(self, file_key: str, conditions: Optional[Dict[str, Any]] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows whose columns equal the given values, in workbook order"""
+        where, params = self._where(conditions)
+        sql = f"SELECT * FROM {_quote(file_key)}{where} ORDER BY rowid"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._connect() as connection:
+            cursor = connection.execute(sql, params)
+            names = [description[0] for description in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def distinct(self, file_key: str, column: str,
+                 conditions: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Distinct non-empty values of a column, in order of first appearance"""
+        where, params = self._where(conditions)
+        where = f"{where} AND" if where else " WHERE"
+        sql = (
+            f"SELECT {_quote(column)} FROM {_quote(file_key)}{where} {_quote(column)} IS NOT NULL "
+            f"GROUP BY {_quote(column)} ORDER BY MIN(rowid)"
+        )
+        with self._connect() as connection:
+            return [row[0] for row in connection.execute(sql, params).fetchall()]
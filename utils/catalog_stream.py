@@ -0,0 +1,155 @@
+import os
+import time
+import tracemalloc
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+# Workbooks above this size are streamed instead of parsed with pd.read_excel
+STREAMING_THRESHOLD_BYTES = 5 * 1024 * 1024
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+CSV_EXTENSIONS = ('.csv',)
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def is_streamable(file_path: str) -> bool:
+    """True for every catalog format iter_catalog_chunks can read"""
+    return file_path.lower().endswith(EXCEL_EXTENSIONS + CSV_EXTENSIONS + JSON_LINES_EXTENSIONS)
+
+
+def should_stream(file_path: str) -> bool:
+    """Text catalogs are always streamed, workbooks only when they are large"""
+    if not file_path.lower().endswith(EXCEL_EXTENSIONS):
+        return is_streamable(file_path)
+    return os.path.getsize(file_path) >= STREAMING_THRESHOLD_BYTES
+
+
+def _header(row) -> List[str]:
+    """Column names from the first sheet row, named like pandas does for blank cells"""
+    return [
+        str(value) if value is not None else f"Unnamed: {i}"
+        for i, value in enumerate(row)
+    ]
+
+
+def _iter_excel_chunks(file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    # read_only parses the sheet XML lazily, row by row, instead of
+    # building the whole cell tree in memory
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = None
+        for row in rows:
+            if any(value is not None for value in row):
+                columns = _header(row)
+                break
+        if columns is None:
+            return
+
+        chunk = []
+        for row in rows:
+            if not any(value is not None for value in row):
+                continue
+            chunk.append(row[:len(columns)])
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame.from_records(chunk, columns=columns)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame.from_records(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_catalog_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Yield a catalog as DataFrames of at most chunk_size rows.
+
+    Accepts .xlsx/.xlsm (first sheet, first non-empty row as header),
+    .csv and JSON-lines (.jsonl/.ndjson). Only one chunk is held at a time.
+    """
+    lower = file_path.lower()
+    if lower.endswith(EXCEL_EXTENSIONS):
+        yield from _iter_excel_chunks(file_path, chunk_size)
+    elif lower.endswith(CSV_EXTENSIONS):
+        with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+            yield from reader
+    elif lower.endswith(JSON_LINES_EXTENSIONS):
+        with pd.read_json(file_path, lines=True, chunksize=chunk_size) as reader:
+            yield from reader
+    else:
+        raise ValueError(f"Unsupported catalog format: '{file_path}'")
+
+
+def read_catalog(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Read a whole catalog through the row reader. The chunks are
+    concatenated, so peak memory is still the whole sheet.
+    """
+    chunks = list(iter_catalog_chunks(file_path, chunk_size))
+    if not chunks:
+        return pd.DataFrame()
+    df = pd.concat(chunks, ignore_index=True)
+    # Chunks are typed independently; let pandas settle mixed object columns
+    return df.infer_objects()
+
+
+def _write_synthetic_workbook(file_path: str, rows: int):
+    """Supplier-dump sized pipe workbook, written in write-only mode"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['Pipe Type', 'Diam. (mm)', 'Pipe Ref', 'Supplier', 'Price (EUR/m)'])
+    types = ['PVC', 'PA12', 'EPDM', 'Silicone', 'TPE']
+    for i in range(rows):
+        sheet.append([types[i % 5], float(3 + i % 10), f"P-{i:07d}", f"Supplier {i % 7}", round(0.5 + (i % 97) / 10, 2)])
+    workbook.save(file_path)
+
+
+def _measure(label: str, load):
+    # Timed and traced in separate runs; tracemalloc slows openpyxl down a lot
+    start = time.perf_counter()
+    first = load()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34}{elapsed:>10.2f} s{first:>12.3f} s{peak / 1e6:>12.1f} MB")
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Compare pd.read_excel with the streaming catalog reader")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "big_pipes.xlsx")
+        _write_synthetic_workbook(path, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB on disk")
+        print(f"{'':<34}{'Total':>12}{'First rows':>14}{'Peak':>15}")
+
+        def full_read():
+            start = time.perf_counter()
+            pd.read_excel(path, engine='openpyxl')
+            return time.perf_counter() - start
+
+        def streamed():
+            start = time.perf_counter()
+            first: Optional[float] = None
+            for _ in iter_catalog_chunks(path):
+                if first is None:
+                    first = time.perf_counter() - start
+            return first or 0.0
+
+        _measure("pd.read_excel", full_read)
+        _measure("iter_catalog_chunks (5000 rows)", streamed)
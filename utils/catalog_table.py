@@ -0,0 +1,283 @@
+import sys
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class CategoryColumn:
+    """
+    Dictionary-encoded string column.
+
+    Values are stored once in `categories`; each row only keeps an int32
+    code into that list (-1 for a missing cell).
+    """
+
+    def __init__(self, codes: np.ndarray, categories: List[Any]):
+        self.codes = codes
+        self.categories = categories
+        self._code_of = {value: code for code, value in enumerate(categories)}
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> "CategoryColumn":
+        categorical = pd.Categorical(pd.Series(values, dtype=object))
+        return cls(categorical.codes.astype(np.int32), list(categorical.categories))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code_of(self, value: Any) -> int:
+        """Code of a value, or -1 if it never appears in the column"""
+        return self._code_of.get(value, -1)
+
+    def value(self, index: int) -> Any:
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    def take(self, indices: np.ndarray) -> "CategoryColumn":
+        return CategoryColumn(self.codes[indices], self.categories)
+
+    def to_list(self) -> List[Any]:
+        return [None if code < 0 else self.categories[code] for code in self.codes.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(sys.getsizeof(value) for value in self.categories)
+
+
+class CatalogRow(Mapping):
+    """Read-only dict-like view of one table row; values are decoded on access"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "CatalogTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, column: str) -> Any:
+        return self._table._cell(column, self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.columns)
+
+    def __len__(self) -> int:
+        return len(self._table.columns)
+
+    def __repr__(self) -> str:
+        return f"CatalogRow({dict(self)})"
+
+
+class CatalogTable:
+    """
+    Column-oriented catalog sheet.
+
+    Numeric columns are NumPy arrays (float64 when the column has gaps),
+    everything else is a CategoryColumn. Rows are only materialized on
+    demand through CatalogRow, so filters run on whole columns at once.
+    """
+
+    def __init__(self, columns: Dict[str, Any], length: int):
+        self._columns = columns
+        self._length = length
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CatalogTable":
+        columns = {}
+        for name in df.columns:
+            series = df[name]
+            if pd.api.types.is_numeric_dtype(series):
+                columns[str(name)] = series.to_numpy()
+            else:
+                columns[str(name)] = CategoryColumn.from_values(series.where(series.notna(), None).tolist())
+        return cls(columns, len(df))
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "CatalogTable":
+        return cls.from_frame(pd.DataFrame.from_records(records or []))
+
+    # --- Shape ---
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def is_numeric(self, column: str) -> bool:
+        return isinstance(self._columns[column], np.ndarray)
+
+    # --- Access ---
+
+    def _cell(self, column: str, index: int) -> Any:
+        data = self._columns[column]
+        if isinstance(data, CategoryColumn):
+            return data.value(index)
+        value = data[index].item()
+        return None if isinstance(value, float) and value != value else value
+
+    def row(self, index: int) -> CatalogRow:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Row {index} out of range for a table of {self._length} rows")
+        return CatalogRow(self, index)
+
+    def __iter__(self) -> Iterator[CatalogRow]:
+        for index in range(self._length):
+            yield CatalogRow(self, index)
+
+    def column(self, name: str) -> np.ndarray:
+        """Numeric columns as they are stored, category columns as the int32 codes"""
+        data = self._columns[name]
+        return data.codes if isinstance(data, CategoryColumn) else data
+
+    def categories(self, name: str) -> List[Any]:
+        """Distinct values of a category column, in code order"""
+        data = self._columns[name]
+        if not isinstance(data, CategoryColumn):
+            raise TypeError(f"Column '{name}' is numeric, not category-coded")
+        return list(data.categories)
+
+    def values(self, name: str) -> List[Any]:
+        """Decoded Python values of a column"""
+        data = self._columns[name]
+        return data.to_list() if isinstance(data, CategoryColumn) else data.tolist()
+
+    # --- Filtering ---
+
+    def mask(self, **equals: Any) -> np.ndarray:
+        """
+        Boolean row mask for column == value conditions.
+
+        Column names with spaces or dots can be passed through a dict:
+        table.mask(**{'Pipe Type': 'PVC', 'Diam. (mm)': 8.0})
+        """
+        result = np.ones(self._length, dtype=bool)
+        for name, value in equals.items():
+            data = self._columns[name]
+            if isinstance(data, CategoryColumn):
+                code = data.code_of(value)
+                if code < 0:
+                    return np.zeros(self._length, dtype=bool)
+                result &= data.codes == code
+            else:
+                result &= data == value
+        return result
+
+    def take(self, indices: np.ndarray) -> "CatalogTable":
+        """New table holding only the given rows (category dictionaries are shared)"""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        columns = {
+            name: data.take(indices) if isinstance(data, CategoryColumn) else data[indices]
+            for name, data in self._columns.items()
+        }
+        return CatalogTable(columns, len(indices))
+
+    def where(self, **equals: Any) -> "CatalogTable":
+        return self.take(self.mask(**equals))
+
+    def first(self, **equals: Any) -> Optional[CatalogRow]:
+        """First row matching the conditions, or None"""
+        matches = np.flatnonzero(self.mask(**equals))
+        return CatalogRow(self, int(matches[0])) if len(matches) else None
+
+    # --- Conversion ---
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize the list-of-dicts form used by the record API"""
+        decoded = {name: self.values(name) for name in self._columns}
+        return [
+            {name: values[index] for name, values in decoded.items()}
+            for index in range(self._length)
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(data.nbytes for data in self._columns.values())
+
+
+def _synthetic_pipe_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Pipe catalog shaped like Pipes.xlsx with the given number of rows"""
+    rng = np.random.default_rng(seed)
+    types = np.array(['PVC', 'PA12', 'EPDM', 'Silicone', 'TPE', 'PU', 'PE', 'PTFE'])
+    diameters = np.array([3.0, 4.0, 5.0, 6.0, 8.0, 10.0, 12.0, 16.0, 20.0])
+    suppliers = np.array(['Supplier A', 'Supplier B', 'Supplier C', 'Supplier D'])
+    return pd.DataFrame({
+        'Pipe Ref': [f"P-{i:06d}" for i in range(rows)],
+        'Pipe Type': types[rng.integers(0, len(types), rows)],
+        'Diam. (mm)': diameters[rng.integers(0, len(diameters), rows)],
+        'Supplier': suppliers[rng.integers(0, len(suppliers), rows)],
+        'Cost (EUR/m)': rng.uniform(0.5, 12.0, rows).round(2),
+    })
+
+
+def _records_nbytes(records: List[Dict[str, Any]]) -> int:
+    """Deep size of a list of dicts, counting each distinct object once"""
+    seen = set()
+    total = sys.getsizeof(records)
+    for record in records:
+        total += sys.getsizeof(record)
+        for value in record.values():
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total
+
+
+def _benchmark(rows: int = 100_000, repeats: int = 20):
+    """Compare memory and filter throughput of list-of-dicts against CatalogTable"""
+    df = _synthetic_pipe_frame(rows)
+
+    start = time.perf_counter()
+    records = df.to_dict(orient='records')
+    records_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = CatalogTable.from_frame(df)
+    table_build = time.perf_counter() - start
+
+    query = {'Pipe Type': 'PVC', 'Diam. (mm)': 8.0}
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        matches = [r for r in records if r['Pipe Type'] == query['Pipe Type'] and r['Diam. (mm)'] == query['Diam. (mm)']]
+    records_filter = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        mask = table.mask(**query)
+    table_filter = (time.perf_counter() - start) / repeats
+    assert int(mask.sum()) == len(matches)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        records_cost = sum(r['Cost (EUR/m)'] for r in records)
+    records_sum = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        table_cost = float(table.column('Cost (EUR/m)').sum())
+    table_sum = (time.perf_counter() - start) / repeats
+    assert abs(records_cost - table_cost) < 1e-6 * max(1.0, abs(records_cost))
+
+    records_mb = _records_nbytes(records) / 1e6
+    table_mb = table.nbytes / 1e6
+
+    print(f"Synthetic pipe catalog: {rows} rows")
+    print(f"{'':<22}{'list-of-dicts':>16}{'CatalogTable':>16}{'Ratio':>10}")
+    print(f"{'Memory (MB)':<22}{records_mb:>16.2f}{table_mb:>16.2f}{records_mb / table_mb:>9.1f}x")
+    print(f"{'Build (ms)':<22}{records_build * 1e3:>16.2f}{table_build * 1e3:>16.2f}"
+          f"{records_build / table_build:>9.1f}x")
+    print(f"{'Filter type+diam (ms)':<22}{records_filter * 1e3:>16.3f}{table_filter * 1e3:>16.3f}"
+          f"{records_filter / table_filter:>9.1f}x")
+    print(f"{'Sum cost column (ms)':<22}{records_sum * 1e3:>16.3f}{table_sum * 1e3:>16.3f}"
+          f"{records_sum / table_sum:>9.1f}x")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,150 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CONNECTOR_TYPES = ('t_connector', 'y_connector', 'straight_connector')
+
+
+class CircuitGraph:
+    """
+    Adjacency of one pump circuit, built once from CircuitDesigner.get_circuit_data.
+
+    Items are keyed by their circuit id. `outgoing` and `incoming` hold the
+    indexes of the connections leaving and entering each item, in drawing
+    order, so following the circuit never rescans the connection list.
+    """
+
+    def __init__(self, circuit_data: Dict[str, Any]):
+        self.components: Dict[Any, Dict[str, Any]] = {comp['id']: comp for comp in circuit_data.get('components', [])}
+        self.connections: List[Dict[str, Any]] = list(circuit_data.get('connections', []))
+        self.outgoing: Dict[Any, List[int]] = {}
+        self.incoming: Dict[Any, List[int]] = {}
+        for index, connection in enumerate(self.connections):
+            self.outgoing.setdefault(connection['from'], []).append(index)
+            self.incoming.setdefault(connection['to'], []).append(index)
+        # Item ids by type, in drawing order
+        self.by_type: Dict[str, List[Any]] = {}
+        for comp_id, comp in self.components.items():
+            self.by_type.setdefault(comp.get('type', ''), []).append(comp_id)
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    # --- Items ---
+
+    def of_type(self, *types: str) -> List[Any]:
+        return [comp_id for comp_type in types for comp_id in self.by_type.get(comp_type, [])]
+
+    @property
+    def pumps(self) -> List[Any]:
+        return self.by_type.get('pump', [])
+
+    @property
+    def pump_id(self) -> Optional[Any]:
+        """The circuit's pump; a circuit designer holds at most one"""
+        return self.pumps[0] if self.pumps else None
+
+    @property
+    def washing_components(self) -> List[Any]:
+        return self.by_type.get('component', [])
+
+    @property
+    def connectors(self) -> List[Any]:
+        return self.of_type(*CONNECTOR_TYPES)
+
+    def node_type(self, node: Any) -> str:
+        return self.components.get(node, {}).get('type', '')
+
+    def node_name(self, node: Any) -> str:
+        return self.components.get(node, {}).get('name', str(node))
+
+    def x(self, node: Any) -> float:
+        position = self.components.get(node, {}).get('position')
+        return position[0] if isinstance(position, (list, tuple)) and position else 0
+
+    # --- Connections ---
+
+    def successors(self, node: Any) -> List[Any]:
+        return [self.connections[index]['to'] for index in self.outgoing.get(node, [])]
+
+    def predecessors(self, node: Any) -> List[Any]:
+        return [self.connections[index]['from'] for index in self.incoming.get(node, [])]
+
+    def pump_outputs(self, pump_id: Any = None) -> List[Tuple[int, int]]:
+        """
+        (output number, connection index) of each connection leaving the pump,
+        numbered from 1 left to right by the x position of the item it feeds
+        """
+        pump_id = self.pump_id if pump_id is None else pump_id
+        first = sorted(self.outgoing.get(pump_id, []), key=lambda index: self.x(self.connections[index]['to']))
+        return list(enumerate(first, 1))
+
+    def reachable(self, start: Any, types: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Items reachable from `start` (itself included) in depth-first order,
+        following connections in drawing order; only those of `types` if given
+        """
+        types = set(types) if types is not None else None
+        order, visited, stack = [], set(), [start]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            if types is None or self.node_type(node) in types:
+                order.append(node)
+            stack.extend(reversed(self.successors(node)))
+        return order
+
+    def upstream(self, nodes: Iterable[Any], types: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Items feeding any of `nodes`, following the first connection into
+        each item back to the pump, ordered from the pump outwards
+        """
+        types = set(types) if types is not None else None
+        nodes = list(nodes)
+        seen, order = set(nodes), []
+        for node in nodes:
+            path = []
+            while self.incoming.get(node):
+                node = self.connections[self.incoming[node][0]]['from']
+                if node in seen:
+                    break
+                seen.add(node)
+                path.append(node)
+            order.extend(reversed(path))
+        return [node for node in order if types is None or self.node_type(node) in types]
+
+
+if __name__ == "__main__":
+    from utils.hydraulics import _synthetic_circuit
+
+    def scan_reachable(node, circuit_data, components_by_id, visited):
+        """Component search scanning every connection per item, as Circuits did before"""
+        result = []
+        if node in visited:
+            return result
+        visited.add(node)
+        if components_by_id.get(node, {}).get('type') == 'component':
+            result.append(node)
+        for conn in circuit_data['connections']:
+            if conn['from'] == node:
+                result += scan_reachable(conn['to'], circuit_data, components_by_id, visited)
+        return result
+
+    for branches, depth in [(4, 10), (4, 50), (4, 200)]:
+        circuit = _synthetic_circuit(branches, depth)
+        start = time.perf_counter()
+        components_by_id = {comp['id']: comp for comp in circuit['components']}
+        firsts = sorted((conn for conn in circuit['connections'] if conn['from'] == 0),
+                        key=lambda conn: components_by_id[conn['to']]['position'][0])
+        scanned = [scan_reachable(conn['to'], circuit, components_by_id, set()) for conn in firsts]
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph = CircuitGraph(circuit)
+        walked = [graph.reachable(graph.connections[index]['to'], ['component'])
+                  for _, index in graph.pump_outputs()]
+        graph_time = time.perf_counter() - start
+        assert walked == scanned
+        print(f"{len(graph)} items: connection scans {scan_time * 1e3:.1f} ms, "
+              f"graph {graph_time * 1e3:.2f} ms (build included)")
@@ -0,0 +1,293 @@
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from utils.catalog_columns import find_column, lookup_column
+from utils.hydraulics import CircuitResult, HydraulicSolver, _as_float
+from utils.nozzle_catalog import washing_component_rows
+from utils.pump_catalog import _number
+from utils.spray_coverage import CoverageEngine
+
+# Used when Dirt_Types.xlsx is missing or has no removal parameters: the
+# types the General Settings dropdown falls back to
+FALLBACK_DIRT_ROWS = [
+    {'Dirt Type': 'Dirt', 'Removal Energy (J/m2)': 2000.0, 'Threshold (W/m2)': 50.0},
+    {'Dirt Type': 'Autre', 'Removal Energy (J/m2)': 5000.0, 'Threshold (W/m2)': 100.0},
+]
+
+
+# Longest spray the duration sizing considers, and the resolution it sizes to
+MAX_DURATION_S = 120.0
+DURATION_TOLERANCE_S = 0.01
+
+
+class DirtParameters(NamedTuple):
+    """First-order removal: the jet energy (J/m2) above the threshold flux that cleans 63 % of a cell"""
+    name: str
+    removal_energy: float   # J/m2
+    threshold: float        # W/m2, energy flux below which the dirt stays
+
+
+class CleaningRates(NamedTuple):
+    """Removal rate of every surface cell of every washing task; row t is tasks[t]"""
+    tasks: List[Dict[str, Any]]     # task, component, pump_index, output, duration (s), target (share)
+    rate: np.ndarray                # (tasks, cells) 1/s
+    dirt: DirtParameters
+
+
+class ComponentCleaning(NamedTuple):
+    """Cleanliness one washing task reaches on its component"""
+    task: str
+    component: str
+    pump_index: int
+    output: int
+    duration: float         # s
+    target: float           # share of the surface, nan when not set
+    achieved: float         # share cleaned after `duration`
+    ceiling: float          # share the jet can clean at all
+
+    @property
+    def meets_target(self) -> bool:
+        return not self.target == self.target or self.achieved >= self.target
+
+
+def dirt_parameters(records: List[Dict[str, Any]], name: Optional[str]) -> DirtParameters:
+    """Removal parameters of a dirt type; the first fallback type when it has none"""
+    for rows in (records, FALLBACK_DIRT_ROWS):
+        columns = list(rows[0].keys()) if rows else []
+        type_column = lookup_column('dirt', 'type', columns)
+        energy_column = find_column(columns, ['Removal Energy (J/m2)', 'Removal Energy'], ['energy'])
+        threshold_column = find_column(columns, ['Threshold (W/m2)', 'Threshold'], ['threshold'])
+        for row in rows:
+            energy = _number(row.get(energy_column))
+            if str(row.get(type_column)) == name and energy:
+                return DirtParameters(name, energy, _number(row.get(threshold_column)) or 0.0)
+    row = FALLBACK_DIRT_ROWS[0]
+    return DirtParameters(row['Dirt Type'], row['Removal Energy (J/m2)'], row['Threshold (W/m2)'])
+
+
+def cleanliness(rate: np.ndarray, durations: np.ndarray) -> np.ndarray:
+    """
+    Share of each task's surface cleaned, for rates (tasks, cells) and
+    durations (tasks,) or (tasks, k) in s; the result has the shape of
+    `durations`. Every cell loses its dirt as 1 - exp(-rate t).
+    """
+    durations = np.asarray(durations, dtype=float)
+    t = np.maximum(durations.reshape(len(rate), -1), 0.0)
+    # Only the cells the spray reaches clean at all, usually a small part of
+    # the surface: work on those alone, grouped by task
+    task, cell = np.nonzero(rate > 0)
+    removed = -np.expm1(-rate[task, cell][:, None] * t[task])
+    cleaned = np.zeros(t.shape)
+    if len(task):
+        lit = np.unique(task)
+        cleaned[lit] = np.add.reduceat(removed, np.searchsorted(task, lit), axis=0)
+    return (cleaned / rate.shape[1]).reshape(durations.shape)
+
+
+def minimum_durations(rate: np.ndarray, targets: np.ndarray, max_duration: float = MAX_DURATION_S,
+                      tolerance: float = DURATION_TOLERANCE_S) -> np.ndarray:
+    """
+    Shortest duration (s) after which each task reaches its target share,
+    rounded up to `tolerance`; nan when even `max_duration` falls short
+    (or no target is set). Cleanliness grows with time, so every task is
+    bisected at once: each step is one cleanliness() call over all tasks.
+    """
+    targets = np.asarray(targets, dtype=float)
+    # Bisect on whole numbers of tolerance steps: low never reaches the target, high always does
+    steps = int(np.ceil(max_duration / tolerance))
+    reachable = cleanliness(rate, np.full(len(rate), steps * tolerance)) >= targets
+    low, high = np.zeros(len(rate), dtype=np.int64), np.full(len(rate), steps, dtype=np.int64)
+    for _ in range(int(np.ceil(np.log2(steps)))):
+        middle = (low + high) // 2
+        reached = cleanliness(rate, middle * tolerance) >= targets
+        high = np.where(reached, middle, high)
+        low = np.where(reached, low, middle)
+    return np.where(targets <= 0, 0.0, np.where(reachable, high * tolerance, np.nan))
+
+
+class CleanlinessModel:
+    """
+    Predicted cleanliness of every washing component of a configuration.
+
+    Each sequence task sprays one component: the energy flux landing on
+    each cell of its surface is the coverage raster times the nozzle flow
+    times the impact kinetic energy per volume, rho v^2 / 2, with the
+    flow from the hydraulic solver and v at D_C_N from the nozzle model.
+    Cells clean at rate (flux - threshold) / removal energy of the General
+    Settings dirt type, so all tasks and durations are evaluated with one
+    array expression (see cleanliness()).
+    """
+
+    def __init__(self, hydraulic_solver: HydraulicSolver, coverage_engine: CoverageEngine,
+                 dirt_records: Optional[List[Dict[str, Any]]] = None):
+        self.solver = hydraulic_solver
+        self.coverage = coverage_engine
+        self.dirt_records = dirt_records or []
+
+    @classmethod
+    def from_data_manager(cls, data_manager, hydraulic_solver: HydraulicSolver,
+                          coverage_engine: CoverageEngine) -> "CleanlinessModel":
+        try:
+            records = data_manager.get_dirt_data()
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Dirt catalog unavailable, using default dirt parameters: {e}")
+            records = []
+        return cls(hydraulic_solver, coverage_engine, records)
+
+    def rates(self, config_data: Dict[str, Any], results: Optional[List[CircuitResult]] = None,
+              tasks: Optional[List[Dict[str, Any]]] = None) -> CleaningRates:
+        """
+        Cell removal rates of the sequence tasks (or `tasks`, e.g. rows
+        without a duration yet). Pass the results of solve_configuration()
+        when they are already at hand.
+        """
+        general = config_data.get('general_settings', {}) or {}
+        dirt = dirt_parameters(self.dirt_records, general.get('dirt_type'))
+        if tasks is None:
+            sequence = (config_data.get('sequences', {}) or {}).get('sequence_configuration', {}) or {}
+            tasks = sequence.get('tasks', []) or []
+        if results is None:
+            results = self.solver.solve_configuration(config_data)
+
+        catalog = self.solver.nozzle_catalog
+        performance = catalog.evaluate_configuration(config_data, results, self.solver.fluid_table) if catalog else []
+        jets = {(jet.pump_index, jet.output, jet.name): jet for jet in performance}
+        density = {result.pump_index: float(self.solver.fluid_table.properties(result.liquid_name,
+                                                                               result.temperature).density)
+                   for result in results}
+        rows = [row for row in config_data.get('washing_components', []) or [] if isinstance(row, dict)]
+        rows_by_id = {row['id']: row for row in rows if row.get('id')}
+        rows_by_name = washing_component_rows(config_data)
+
+        entries, items, power = [], [], []
+        for task in tasks:
+            name = str(task.get('name', ''))
+            row = rows_by_id.get(task.get('component_id')) or rows_by_name.get(name.split(' (P')[0]) or {}
+            component = row.get('Component') or name.split(' (P')[0]
+            pump_index = int(task.get('pump_index') or 0)
+            output = int(_as_float(task.get('output_num'), 1))
+            jet = jets.get((pump_index, output, component))
+            entries.append({
+                'task': name, 'component': component, 'pump_index': pump_index, 'output': output,
+                'duration': _as_float(task.get('duration_seconds'), 0.0),
+                'target': _as_float(row.get('Targeted Washing Preformance'), float('nan')) / 100.0,
+            })
+            items.append((str(row.get('Nozzle Ref', '')), _as_float(row.get('D_C_N (mm)'), 0.0),
+                          _as_float(row.get('Intergration Angle'), 0.0), component))
+            # Kinetic energy carried to the surface per second, W
+            power.append(jet.flow * 0.5 * density.get(pump_index, 1000.0) * jet.impact_velocity ** 2 if jet else 0.0)
+
+        if not entries:
+            return CleaningRates([], np.zeros((0, self.coverage.resolution ** 2)), dirt)
+        flux = np.stack([raster.flux.ravel() for raster in self.coverage.rasters(items)])
+        energy_flux = flux * np.asarray(power)[:, None]
+        rate = np.maximum(energy_flux - dirt.threshold, 0.0) / dirt.removal_energy
+        return CleaningRates(entries, rate, dirt)
+
+    def size_durations(self, config_data: Dict[str, Any], tasks: List[Dict[str, Any]],
+                       results: Optional[List[CircuitResult]] = None,
+                       max_duration: float = MAX_DURATION_S) -> List[ComponentCleaning]:
+        """
+        Minimum spray duration of each task to reach its component's
+        Targeted Washing Preformance; tasks whose target is out of reach
+        within `max_duration` get a nan duration, and so do tasks without
+        a target (their target is nan too).
+        """
+        rates = self.rates(config_data, results, tasks)
+        if not rates.tasks:
+            return []
+        targets = np.array([task['target'] for task in rates.tasks])
+        durations = minimum_durations(rates.rate, targets, max_duration)
+        achieved = cleanliness(rates.rate, np.nan_to_num(durations, nan=max_duration))
+        ceiling = (rates.rate > 0).mean(axis=1)
+        return [
+            ComponentCleaning(task['task'], task['component'], task['pump_index'], task['output'],
+                              float(durations[i]), task['target'], float(achieved[i]), float(ceiling[i]))
+            for i, task in enumerate(rates.tasks)
+        ]
+
+    def evaluate(self, config_data: Dict[str, Any], results: Optional[List[CircuitResult]] = None,
+                 durations: Optional[np.ndarray] = None) -> List[ComponentCleaning]:
+        """Cleanliness of every task after its sequence duration (or `durations`, one per task)"""
+        rates = self.rates(config_data, results)
+        if not rates.tasks:
+            return []
+        if durations is None:
+            durations = np.array([task['duration'] for task in rates.tasks])
+        achieved = cleanliness(rates.rate, durations)
+        ceiling = (rates.rate > 0).mean(axis=1)
+        return [
+            ComponentCleaning(task['task'], task['component'], task['pump_index'], task['output'],
+                              float(durations[i]), task['target'], float(achieved[i]), float(ceiling[i]))
+            for i, task in enumerate(rates.tasks)
+        ]
+
+
+if __name__ == "__main__":
+    from utils.fluid_properties import FluidPropertyTable
+    from utils.hydraulics import _synthetic_circuit
+    from utils.nozzle_catalog import FALLBACK_NOZZLE_ROWS, NozzleCatalog
+    from utils.pump_catalog import FALLBACK_PUMP_ROWS, PumpCatalog
+
+    nozzles = NozzleCatalog(FALLBACK_NOZZLE_ROWS)
+    solver = HydraulicSolver(FluidPropertyTable([]), PumpCatalog(FALLBACK_PUMP_ROWS), nozzle_catalog=nozzles)
+    model = CleanlinessModel(solver, CoverageEngine(nozzles))
+    pump = solver.pump_catalog.names()[0]
+    circuits = [{'pump_index': i, 'circuit': _synthetic_circuit(4, 3)} for i in range(3)]
+    names = sorted({c['name'] for c in circuits[0]['circuit']['components'] if c['type'] == 'component'})
+    rows = [{'id': f"wc{i}", 'Component': name, 'Nozzle Ref': nozzles.names()[i % 3],
+             'D_C_N (mm)': str(40 + 5 * (i % 10)), 'Intergration Angle': str(3 * (i % 10)),
+             'Targeted Washing Preformance': '25'} for i, name in enumerate(names)]
+    solved = solver.solve_configuration({'pumps': [{'Pump Name': pump}] * 3, 'circuits': circuits,
+                                         'washing_components': rows})
+    tasks = [{'name': f"{nozzle.name} (P{result.pump_index + 1}-O{output.output})", 'duration_seconds': 3.0,
+              'pump_index': result.pump_index, 'output_num': str(output.output)}
+             for result in solved for output in result.outputs for nozzle in output.nozzles()]
+    config = {
+        'general_settings': {'dirt_type': 'Dirt'},
+        'pumps': [{'Pump Name': pump}] * 3,
+        'circuits': circuits,
+        'washing_components': rows,
+        'sequences': {'sequence_configuration': {'tasks': tasks}},
+    }
+
+    results = solver.solve_configuration(config)
+    start = time.perf_counter()
+    cleaning = model.evaluate(config, results)
+    elapsed = time.perf_counter() - start
+    print(f"{len(cleaning)} components: {elapsed * 1e3:.1f} ms (rates included)")
+
+    rates = model.rates(config, results)
+    durations = np.broadcast_to(np.linspace(0.1, 30.0, 64), (len(rates.tasks), 64))
+    start = time.perf_counter()
+    curves = cleanliness(rates.rate, durations)
+    batched = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(len(rates.tasks)):
+        for t in durations[i]:
+            cleanliness(rates.rate[i:i + 1], np.array([t]))
+    separate = time.perf_counter() - start
+    print(f"{curves.size} (component, duration) pairs: one call {batched * 1e3:.1f} ms, "
+          f"one call per pair {separate * 1e3:.0f} ms")
+    for item in cleaning[:3]:
+        print(f"{item.task}: {item.achieved:.1%} after {item.duration:.0f} s (target {item.target:.0%}, "
+              f"ceiling {item.ceiling:.1%})")
+
+    start = time.perf_counter()
+    sized = model.size_durations(config, tasks, results)
+    elapsed = time.perf_counter() - start
+    reachable = [item for item in sized if item.duration == item.duration]
+    print(f"Duration sizing of {len(sized)} components: {elapsed * 1e3:.1f} ms, {len(reachable)} reach "
+          f"{reachable[0].target:.0%} within {MAX_DURATION_S:.0f} s, e.g. {reachable[0].task} "
+          f"{reachable[0].duration:.2f} s ({reachable[0].achieved:.2%})")
+    # Reference: step each duration up in tolerance increments until the target is met
+    checked = [i for i, item in enumerate(sized) if item.duration == item.duration][:3]
+    start = time.perf_counter()
+    stepped = [next(t for t in np.arange(0.0, MAX_DURATION_S + DURATION_TOLERANCE_S, DURATION_TOLERANCE_S)
+                    if cleanliness(rates.rate[i:i + 1], np.array([t]))[0] >= rates.tasks[i]['target'])
+               for i in checked]
+    print(f"Stepping {len(checked)} components in {DURATION_TOLERANCE_S} s increments: "
+          f"{(time.perf_counter() - start) * 1e3:.0f} ms, {[round(float(t), 2) for t in stepped]} s "
+          f"(bisection {[round(sized[i].duration, 2) for i in checked]} s)")
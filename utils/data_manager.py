@@ -1,18 +1,57 @@
 import pandas as pd
+import argparse
 import json
 import os
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from utils.catalog_cache import CatalogCache
+from utils.catalog_columns import lookup_column
+from utils.catalog_store import CatalogStore
+from utils.catalog_stream import iter_catalog_chunks, read_catalog, should_stream
+from utils.catalog_index import PipeCatalogIndex
+from utils.bend_losses import BendLossTable
+from utils.catalog_table import CatalogTable
+from utils.fluid_properties import FluidPropertyTable
+from utils.hydraulics import DEFAULT_CONNECTOR_LOSSES, connector_losses
+from utils.nozzle_catalog import FALLBACK_NOZZLE_ROWS, NozzleCatalog
+from utils.pump_catalog import FALLBACK_PUMP_ROWS, PumpCatalog
+from utils.search_index import SearchIndex
+
+# Catalogs the app can do without: their getters fall back to built-in rows
+OPTIONAL_CATALOGS = ('pumps', 'nozzles')
+
+
+def _parse_workbook(file_path: str) -> Tuple[pd.DataFrame, float]:
+    """Parse one workbook and time it (module level so process pools can pickle it)"""
+    start = time.perf_counter()
+    if should_stream(file_path):
+        # Large supplier dumps and CSV/JSON-lines catalogs go through the
+        # row reader; the whole sheet still ends up in one frame
+        df = read_catalog(file_path)
+    else:
+        df = pd.read_excel(file_path, engine='openpyxl')
+    return df, time.perf_counter() - start
+
 
 class DataManager:
     """
     Centralized data manager for handling Excel spreadsheets and reference data
     """
     
-    def __init__(self, data_folder: str = "data"):
+    def __init__(self, data_folder: str = "data", use_cache: bool = True, preload: bool = False,
+                 use_store: bool = False):
         self.data_folder = data_folder
+        # Compiled copies of the workbooks so warm starts skip openpyxl
+        self.cache = CatalogCache(os.path.join(data_folder, ".catalog_cache")) if use_cache else None
+        # Optional indexed SQLite copy shared by every app instance using this folder
+        self.store = CatalogStore(os.path.join(data_folder, ".catalog_cache", "catalogs.sqlite")) if use_store else None
+        # Sheets whose store table matches the loaded records; checked on (re)load, not per query
+        self._store_current = set()
         self.excel_files = {
-            # 'pumps': 'pumps_catalog.xlsx',
-            # 'nozzles': 'nozzles_catalog.xlsx',
+            'pumps': 'pumps_catalog.xlsx',
+            'nozzles': 'nozzles_catalog.xlsx',
             'washing_components': 'Washing_components.xlsx', 
             'pipes': 'Pipes.xlsx',
             'connectors': 'Connectors.xlsx',
@@ -21,113 +60,721 @@ class DataManager:
             'bends': 'Bend_Radius.xlsx'
         }
 
-        self.data = {
-            'washing_components': None,
-            'pipes': None,
-            'connectors': None,
-            'dirt': None,
-            'fluids': None,
-            'bends': None
-        }
+        self.data = {key: None for key in self.excel_files}
         
-        # Load washing components data
-        self.data['washing_components'] = self.get_component_data()
-        self.data['pipes'] = self.get_pipes_data()
-        self.data['connectors'] = self.get_connectors_data()
-        self.data['dirt'] = self.get_dirt_data()
-        self.data['fluids'] = self.get_fluids_data()
-        self.data['bends'] = self.get_bends_data()
+        # Sheets are loaded on first use; one lock per sheet so a caller
+        # only ever waits for the sheet it asked for
+        self._sheet_locks = {key: threading.Lock() for key in self.excel_files}
+        self._prefetch_thread = None
+
+        # Seconds spent obtaining each sheet during the last load_all() call
+        self.load_timings = {}
+
+        # Indexes and other structures built from a sheet, keyed by (file_key, name)
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+        # Columnar copies of the sheets, built on demand by get_table()
+        self.tables = {}
+        self._tables_lock = threading.Lock()
+
+        # Hot reload: size/mtime of every loaded workbook, objects notified
+        # through on_catalog_changed(file_keys), and changes waiting to be
+        # dispatched on the Tk thread
+        self._file_signatures = {}
+        self._listeners = []
+        self._pending_changes = []
+        self._changes_lock = threading.Lock()
+        self._watch_thread = None
+        self._stop_watching = threading.Event()
+
+        if preload:
+            for file_key in self.excel_files:
+                try:
+                    self.get_sheet(file_key)
+                except FileNotFoundError as e:
+                    if file_key not in OPTIONAL_CATALOGS:
+                        raise
+                    print(f"Skipping optional catalog '{file_key}': {e}")
 
         
-    def load_data(self, file_key: str) -> pd.DataFrame:
+    def _get_file_path(self, file_key: str) -> str:
+        """Resolve and check the path of a catalog file"""
         if file_key not in self.excel_files:
             raise ValueError(f"File key '{file_key}' not found in excel files mapping.")
         
         file_path = os.path.join(self.data_folder, self.excel_files[file_key])
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Data file '{file_path}' does not exist.")
+        return file_path
+
+    def _snapshot(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Stat (and hash, when caching) a workbook before parsing it, so an edit during the parse is seen later"""
+        try:
+            if self.cache is not None or self.store is not None:
+                return CatalogCache.snapshot(file_path)
+            return CatalogCache.file_signature(file_path)
+        except OSError:
+            return None
+
+    def _store_in_cache(self, file_path: str, df: pd.DataFrame, snapshot: Optional[Dict[str, Any]]):
+        """Write a freshly parsed workbook to the catalog cache, if enabled"""
+        if self.cache is None or snapshot is None:
+            return
         try:
-            df = pd.read_excel(file_path, engine='openpyxl')
-            return df
+            self.cache.store(file_path, df, snapshot)
+        except Exception as e:
+            print(f"Could not write catalog cache for '{file_path}': {e}")
+
+    def _set_sheet(self, file_key: str, df: pd.DataFrame, snapshot: Optional[Dict[str, Any]] = None):
+        """
+        Publish freshly loaded records and remember the workbook's signature
+        for the watcher: the pre-parse snapshot when the sheet was parsed
+        """
+        try:
+            if snapshot is None:
+                snapshot = CatalogCache.file_signature(self._get_file_path(file_key))
+            self._file_signatures[file_key] = {"size": snapshot["size"], "mtime_ns": snapshot["mtime_ns"]}
+        except (OSError, ValueError):
+            pass
+        self.data[file_key] = df.to_dict(orient='records')
+        self._import_into_store(file_key, df, snapshot)
+
+    def _import_into_store(self, file_key: str, df: pd.DataFrame, snapshot: Optional[Dict[str, Any]]):
+        """Bring the SQLite table of a sheet up to date, if the store is enabled"""
+        if self.store is None:
+            return
+        self._store_current.discard(file_key)
+        try:
+            file_path = self._get_file_path(file_key)
+            if not self.store.is_current(file_key, file_path):
+                self.store.import_frame(file_key, file_path, df, snapshot if snapshot and "sha256" in snapshot else None)
+            self._store_current.add(file_key)
+        except Exception as e:
+            print(f"Could not import '{file_key}' into the catalog store: {e}")
+
+    def _load_compiled(self, file_key: str,
+                       file_path: str) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """
+        Sheet from the SQLite store or the catalog cache with the key of the
+        file contents it holds, or (None, None) if both are stale
+        """
+        if self.store is not None:
+            try:
+                df = self.store.load_frame(file_key, file_path)
+                if df is not None:
+                    return df, self.store.meta(file_key)
+            except Exception as e:
+                print(f"Could not read '{file_key}' from the catalog store: {e}")
+        if self.cache is not None:
+            loaded = self.cache.load_entry(file_path)
+            if loaded is not None:
+                return loaded
+        return None, None
+
+    def load_data(self, file_key: str) -> pd.DataFrame:
+        return self._load(file_key)[0]
+
+    def _load(self, file_key: str) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+        """A sheet's frame, with the snapshot taken before parsing it (None when served compiled)"""
+        file_path = self._get_file_path(file_key)
+
+        df, snapshot = self._load_compiled(file_key, file_path)
+        if df is not None:
+            return df, snapshot
+
+        snapshot = self._snapshot(file_path)
+        try:
+            df, _ = _parse_workbook(file_path)
         except Exception as e:
             raise RuntimeError(f"Failed to load data from '{file_path}': {e}")
+
+        self._store_in_cache(file_path, df, snapshot)
+        return df, snapshot
+
+    def load_all(self, file_keys: Optional[List[str]] = None, parallel: bool = True,
+                 max_workers: Optional[int] = None) -> Dict[str, float]:
+        """
+        Load every sheet that is not in memory yet and return the seconds spent per file key.
+
+        Cache hits are served in-process. Workbooks that still need openpyxl are
+        parsed concurrently in a process pool when parallel is True, since the
+        parsing is CPU-bound and holds the GIL.
+        """
+        keys = list(file_keys) if file_keys is not None else list(self.excel_files)
+        timings = {}
+
+        # Claim the sheets we are going to load. A sheet locked by another
+        # loader is skipped; its caller will finish it.
+        claimed = []
+        for file_key in keys:
+            if self.is_loaded(file_key):
+                continue
+            lock = self._sheet_locks[file_key]
+            if not lock.acquire(blocking=False):
+                continue
+            if self.is_loaded(file_key):
+                lock.release()
+                continue
+            claimed.append(file_key)
+
+        try:
+            to_parse = {}
+            for file_key in list(claimed):
+                start = time.perf_counter()
+                try:
+                    file_path = self._get_file_path(file_key)
+                    df, snapshot = self._load_compiled(file_key, file_path)
+                except Exception as e:
+                    print(f"Could not load '{file_key}': {e}")
+                    self._sheet_locks[file_key].release()
+                    claimed.remove(file_key)
+                    continue
+
+                if df is None:
+                    to_parse[file_key] = file_path
+                    continue
+                self._set_sheet(file_key, df, snapshot)
+                timings[file_key] = time.perf_counter() - start
+                self._sheet_locks[file_key].release()
+                claimed.remove(file_key)
+
+            if to_parse:
+                self._parse_files(to_parse, timings, parallel, max_workers, claimed)
+        finally:
+            # Never leave a sheet locked, even if a worker failed
+            for file_key in claimed:
+                self._sheet_locks[file_key].release()
+
+        self.load_timings.update(timings)
+        for file_key, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+            print(f"Loaded {file_key} in {elapsed:.3f}s")
+        return timings
+
+    def _parse_files(self, to_parse: Dict[str, str], timings: Dict[str, float], parallel: bool,
+                     max_workers: Optional[int], claimed: List[str]):
+        """Parse the given workbooks, releasing each sheet lock as soon as its data is in place"""
+        snapshots = {file_key: self._snapshot(file_path) for file_key, file_path in to_parse.items()}
+
+        def finish(file_key, df, elapsed):
+            self._store_in_cache(to_parse[file_key], df, snapshots[file_key])
+            self._set_sheet(file_key, df, snapshots[file_key])
+            timings[file_key] = elapsed
+            self._sheet_locks[file_key].release()
+            claimed.remove(file_key)
+
+        if not parallel or len(to_parse) == 1:
+            for file_key, file_path in to_parse.items():
+                try:
+                    df, elapsed = _parse_workbook(file_path)
+                except Exception as e:
+                    print(f"Failed to load data from '{file_path}': {e}")
+                    continue
+                finish(file_key, df, elapsed)
+            return
+
+        workers = max_workers or min(len(to_parse), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_parse_workbook, file_path): file_key
+                for file_key, file_path in to_parse.items()
+            }
+            for future in as_completed(futures):
+                file_key = futures[future]
+                try:
+                    df, elapsed = future.result()
+                except Exception as e:
+                    print(f"Failed to load data from '{to_parse[file_key]}': {e}")
+                    continue
+                finish(file_key, df, elapsed)
+
+    def rebuild_cache(self) -> Dict[str, float]:
+        """Re-parse every workbook and rewrite the catalog cache, returning parse time per file key"""
+        if self.cache is None:
+            raise RuntimeError("Catalog cache is disabled for this DataManager.")
+
+        self.cache.clear()
+        timings = {}
+        for file_key in self.excel_files:
+            start = time.perf_counter()
+            try:
+                self.load_data(file_key)
+            except FileNotFoundError as e:
+                print(f"Skipping {file_key}: {e}")
+                continue
+            timings[file_key] = time.perf_counter() - start
+        return timings
         
+    def get_sheet(self, file_key: str) -> List[Dict[str, Any]]:
+        """Return the records of a catalog sheet, loading and memoizing it on first use"""
+        records = self.data.get(file_key)
+        if records is not None:
+            return records
+
+        if file_key not in self._sheet_locks:
+            raise ValueError(f"File key '{file_key}' not found in excel files mapping.")
+
+        with self._sheet_locks[file_key]:
+            # Another thread may have finished loading while we waited
+            if self.data[file_key] is None:
+                self._set_sheet(file_key, *self._load(file_key))
+            return self.data[file_key]
+
+    def iter_sheet(self, file_key: str, chunk_size: int = 5000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the records of a sheet in chunks, the first one as soon as it is read.
+
+        Loaded sheets are served from memory. Otherwise the file is streamed
+        row by row under the sheet lock, so a concurrent get_sheet() waits
+        for this read instead of parsing the file a second time, and the
+        sheet is published like get_sheet() would once fully read. This
+        shortens the wait for the first rows, not the memory used: the
+        whole sheet is kept. Do not call get_sheet() for the same sheet
+        from inside the loop.
+        """
+        records = self.data.get(file_key)
+        if records is None:
+            if file_key not in self._sheet_locks:
+                raise ValueError(f"File key '{file_key}' not found in excel files mapping.")
+            with self._sheet_locks[file_key]:
+                records = self.data[file_key]
+                if records is None:
+                    file_path = self._get_file_path(file_key)
+                    df, snapshot = self._load_compiled(file_key, file_path)
+                    if df is None:
+                        yield from self._stream_sheet(file_key, file_path, chunk_size)
+                        return
+                    self._set_sheet(file_key, df, snapshot)
+                    records = self.data[file_key]
+
+        for start in range(0, len(records), chunk_size):
+            yield records[start:start + chunk_size]
+
+    def _stream_sheet(self, file_key: str, file_path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Stream a workbook for iter_sheet(), then cache and publish it; the caller holds the sheet lock"""
+        snapshot = self._snapshot(file_path)
+        chunks = []
+        for chunk in iter_catalog_chunks(file_path, chunk_size):
+            chunks.append(chunk)
+            yield chunk.to_dict(orient='records')
+
+        df = pd.concat(chunks, ignore_index=True).infer_objects() if chunks else pd.DataFrame()
+        self._store_in_cache(file_path, df, snapshot)
+        self._set_sheet(file_key, df, snapshot)
+
+    def is_loaded(self, file_key: str) -> bool:
+        """Check whether a sheet is already in memory"""
+        return self.data.get(file_key) is not None
+
+    def start_prefetch(self, file_keys: Optional[List[str]] = None, parallel: bool = False):
+        """Load the given sheets (all by default) on a background thread"""
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+
+        keys = list(file_keys) if file_keys is not None else list(self.excel_files)
+        self._prefetch_thread = threading.Thread(
+            target=self._prefetch,
+            args=(keys, parallel),
+            name="catalog-prefetch",
+            daemon=True
+        )
+        self._prefetch_thread.start()
+
+    def _prefetch(self, file_keys: List[str], parallel: bool):
+        """Background worker for start_prefetch"""
+        if parallel:
+            try:
+                self.load_all(file_keys, parallel=True)
+            except Exception as e:
+                print(f"Parallel prefetch failed, falling back to sequential loading: {e}")
+
+        for file_key in file_keys:
+            try:
+                self.get_sheet(file_key)
+            except Exception as e:
+                # Leave the sheet unloaded; the first real caller will see the error
+                print(f"Prefetch of '{file_key}' failed: {e}")
+
+    def _get_derived(self, file_key: str, name: str, factory):
+        """Build a structure from a sheet's records once and memoize it"""
+        key = (file_key, name)
+        derived = self._derived.get(key)
+        if derived is not None:
+            return derived
+
+        records = self.get_sheet(file_key)
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = factory(records)
+            return self._derived[key]
+
+    # --- Hot reload ---
+
+    def subscribe(self, listener):
+        """Register an object whose on_catalog_changed(file_keys) is called after a reload"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Stop sending catalog change events to a listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def reload_sheet(self, file_key: str) -> bool:
+        """
+        Re-read one workbook and drop everything derived from it.
+
+        Returns False when the new records are identical to the old ones
+        (e.g. the file was only re-saved), so no change event is needed.
+        """
+        with self._sheet_locks[file_key]:
+            df, snapshot = self._load(file_key)
+            previous = self.data.get(file_key)
+            self._set_sheet(file_key, df, snapshot)
+            # Compare as frames: empty cells are NaN, and NaN != NaN between record lists
+            changed = previous is None or not pd.DataFrame.from_records(previous).equals(
+                pd.DataFrame.from_records(self.data[file_key]))
+
+        if changed:
+            with self._derived_lock:
+                for key in [key for key in self._derived if key[0] == file_key]:
+                    del self._derived[key]
+            with self._tables_lock:
+                self.tables.pop(file_key, None)
+        return changed
+
+    def check_for_updates(self) -> List[str]:
+        """Reload every loaded workbook whose file changed on disk and return their file keys"""
+        changed = []
+        for file_key, signature in list(self._file_signatures.items()):
+            try:
+                current = CatalogCache.file_signature(self._get_file_path(file_key))
+            except (OSError, ValueError):
+                # Excel replaces the file on save; it will be back on the next check
+                continue
+            if current == signature:
+                continue
+            # Queries fall back to the in-memory rows until the reload re-imports the table
+            self._store_current.discard(file_key)
+            try:
+                if self.reload_sheet(file_key):
+                    changed.append(file_key)
+            except Exception as e:
+                # Keep the old rows, the file is probably still being written
+                print(f"Could not reload '{file_key}': {e}")
+        return changed
+
+    def start_watching(self, interval: float = 2.0):
+        """Check the loaded workbooks for changes every interval seconds on a background thread"""
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+
+        self._stop_watching.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch,
+            args=(interval,),
+            name="catalog-watcher",
+            daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        """Stop the background watcher after its current check"""
+        self._stop_watching.set()
+
+    def _watch(self, interval: float):
+        """Background worker for start_watching; changes are queued for dispatch_changes"""
+        while not self._stop_watching.wait(interval):
+            changed = self.check_for_updates()
+            if changed:
+                with self._changes_lock:
+                    self._pending_changes.extend(key for key in changed if key not in self._pending_changes)
+
+    def dispatch_changes(self) -> List[str]:
+        """Notify listeners of queued reloads; call this from the Tk thread"""
+        with self._changes_lock:
+            changed, self._pending_changes = self._pending_changes, []
+        if not changed:
+            return changed
+
+        print(f"Catalogs reloaded: {', '.join(changed)}")
+        for listener in self._listeners[:]:  # Use a copy of the list
+            try:
+                listener.on_catalog_changed(changed)
+            except Exception as e:
+                print(f"Error notifying catalog listener: {e}")
+                # Remove invalid listeners
+                self.unsubscribe(listener)
+        return changed
+
+    def get_table(self, file_key: str) -> CatalogTable:
+        """
+        Return a sheet as a columnar CatalogTable, built from the records
+        get_sheet() loads under the sheet lock, so a sheet is parsed once
+        """
+        table = self.tables.get(file_key)
+        if table is not None:
+            return table
+
+        records = self.get_sheet(file_key)
+        with self._tables_lock:
+            if file_key not in self.tables:
+                # A reload may have replaced the records since get_sheet() returned
+                self.tables[file_key] = CatalogTable.from_records(self.data.get(file_key) or records)
+            return self.tables[file_key]
+
+    def get_pipe_index(self) -> PipeCatalogIndex:
+        """Type/diameter index over the pipe catalog for the pipe dialog queries"""
+        return self._get_derived('pipes', 'index', PipeCatalogIndex)
+
+    def get_search_index(self, file_key: str, column: str) -> SearchIndex:
+        """Type-ahead index over the distinct values of one catalog column"""
+        return self._get_derived(
+            file_key, f"search:{column}",
+            lambda records: SearchIndex(record.get(column) for record in records)
+        )
+
+    def get_fluid_table(self) -> FluidPropertyTable:
+        """Temperature interpolators for every fluid of the Fluids catalog"""
+        return self._get_derived('fluids', 'properties', FluidPropertyTable)
+
+    def get_fluid_properties(self, name: str, temperature_c):
+        """Density (kg/m3) and dynamic viscosity (Pa.s) of a fluid at scalar or array temperatures in °C"""
+        return self.get_fluid_table().properties(name, temperature_c)
+
+    def get_bend_loss_table(self) -> BendLossTable:
+        """Bend loss coefficients by r/D, from the Bend_Radius catalog or the reference curve"""
+        try:
+            return self._get_derived('bends', 'losses', BendLossTable)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Bend catalog unavailable, using reference bend losses: {e}")
+            return BendLossTable()
+
+    def get_connector_losses(self) -> Dict[str, float]:
+        """Loss coefficient per circuit connector type, from the Connectors catalog or the defaults"""
+        try:
+            return self._get_derived('connectors', 'losses', connector_losses)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Connector catalog unavailable, using default connector losses: {e}")
+            return dict(DEFAULT_CONNECTOR_LOSSES)
+
+    def get_pump_catalog(self) -> PumpCatalog:
+        """Pump identities and Q-H curves; the built-in pumps are used when the catalog is missing"""
+        try:
+            return self._get_derived('pumps', 'catalog', PumpCatalog)
+        except (FileNotFoundError, RuntimeError) as e:
+            with self._derived_lock:
+                if ('pumps', 'fallback') not in self._derived:
+                    print(f"Pump catalog unavailable, using built-in pumps: {e}")
+                    self._derived[('pumps', 'fallback')] = PumpCatalog(FALLBACK_PUMP_ROWS)
+                return self._derived[('pumps', 'fallback')]
+
+    def get_nozzle_catalog(self) -> NozzleCatalog:
+        """Nozzle references and orifices; the built-in nozzles are used when the catalog is missing"""
+        try:
+            return self._get_derived('nozzles', 'catalog', NozzleCatalog)
+        except (FileNotFoundError, RuntimeError) as e:
+            with self._derived_lock:
+                if ('nozzles', 'fallback') not in self._derived:
+                    print(f"Nozzle catalog unavailable, using built-in nozzles: {e}")
+                    self._derived[('nozzles', 'fallback')] = NozzleCatalog(FALLBACK_NOZZLE_ROWS)
+                return self._derived[('nozzles', 'fallback')]
+
+    # --- Lookups ---
+
+    def lookup(self, file_key: str, conditions: Optional[Dict[str, Any]] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rows of a sheet whose columns equal the given values, e.g.
+        lookup('pipes', {'Pipe Type': 'PVC', 'Diam. (mm)': 8}).
+
+        Answered by the indexed SQLite store when it is enabled, otherwise
+        by filtering the in-memory records. Empty cells are NaN either way,
+        as in get_sheet().
+        """
+        if self.store is not None and self._store_ready(file_key):
+            return [
+                {column: float('nan') if value is None else value for column, value in row.items()}
+                for row in self.store.lookup(file_key, conditions, limit)
+            ]
+
+        rows = [
+            record for record in self.get_sheet(file_key)
+            if all(record.get(column) == value for column, value in (conditions or {}).items())
+        ]
+        return rows[:limit] if limit is not None else rows
+
+    def distinct_values(self, file_key: str, column: str,
+                        conditions: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Distinct non-empty values of a column, in order of first appearance"""
+        if self.store is not None and self._store_ready(file_key):
+            return self.store.distinct(file_key, column, conditions)
+
+        seen = set()
+        values = []
+        for record in self.lookup(file_key, conditions):
+            value = record.get(column)
+            if value is None or value != value or value in seen:
+                continue
+            seen.add(value)
+            values.append(value)
+        return values
+
+    def lookup_column(self, file_key: str, key: str) -> Optional[str]:
+        """Actual header of a lookup key ('type', 'diameter', 'name', 'radius') in a sheet"""
+        records = self.get_sheet(file_key)
+        return lookup_column(file_key, key, records[0].keys()) if records else None
+
+    def _store_ready(self, file_key: str) -> bool:
+        """
+        True when the store table matches the loaded sheet. Freshness is
+        checked when the sheet is loaded or reloaded (the watcher notices
+        edits), so queries never stat or hash the workbook themselves.
+        """
+        if file_key in self._store_current:
+            return True
+        try:
+            self.get_sheet(file_key)  # Loading a sheet imports it
+        except Exception as e:
+            print(f"Catalog store unavailable for '{file_key}': {e}")
+            return False
+        return file_key in self._store_current
+
     def get_component_data(self):
-        data = self.load_data('washing_components')
-        json_data = data.to_dict(orient='records')
-        return json_data
+        return self.get_sheet('washing_components')
     
     def get_pipes_data(self):
-        if self.data['pipes'] is None:
-            data = self.load_data('pipes')
-            self.data['pipes'] = data.to_dict(orient='records')
-        return self.data['pipes']
+        return self.get_sheet('pipes')
     
     def get_connectors_data(self):
-        if self.data['connectors'] is None:
-            data = self.load_data('connectors')
-            self.data['connectors'] = data.to_dict(orient='records')
-        return self.data['connectors']
+        return self.get_sheet('connectors')
     
     def get_dirt_data(self):
-        if self.data['dirt'] is None:
-            data = self.load_data('dirt')
-            self.data['dirt'] = data.to_dict(orient='records')
-        return self.data['dirt']
+        return self.get_sheet('dirt')
     
     def get_fluids_data(self):
-        if self.data['fluids'] is None:
-            data = self.load_data('fluids')
-            self.data['fluids'] = data.to_dict(orient='records')
-        return self.data['fluids']
+        return self.get_sheet('fluids')
     
     def get_unique_fluid_names(self):
         """Get unique fluid names for dropdown display"""
-        fluids = self.get_fluids_data()
-        seen_names = set()
-        unique_names = []
-        for item in fluids:
-            name = item.get('LLG Name')
-            if name and name not in seen_names:
-                seen_names.add(name)
-                unique_names.append(name)
-        return unique_names
+        return [name for name in self.distinct_values('fluids', 'LLG Name') if name]
     
     def get_bends_data(self):
-        if self.data['bends'] is None:
-            data = self.load_data('bends')
-            self.data['bends'] = data.to_dict(orient='records')
-        return self.data['bends']
+        return self.get_sheet('bends')
 
         
+def _benchmark_cache(data_folder: str):
+    """Print cold (openpyxl) versus warm (catalog cache) load times for every workbook"""
+    cold_manager = DataManager(data_folder, use_cache=False, preload=False)
+    warm_manager = DataManager(data_folder, preload=False)
+
+    print(f"{'Catalog':<20}{'Cold (s)':>12}{'Warm (s)':>12}{'Speed-up':>12}")
+    cold_total = warm_total = 0.0
+    for file_key in cold_manager.excel_files:
+        try:
+            start = time.perf_counter()
+            cold_manager.load_data(file_key)
+            cold = time.perf_counter() - start
+
+            warm_manager.load_data(file_key)  # Make sure the cache entry exists
+            start = time.perf_counter()
+            warm_manager.load_data(file_key)
+            warm = time.perf_counter() - start
+        except FileNotFoundError as e:
+            print(f"{file_key:<20}skipped ({e})")
+            continue
+        cold_total += cold
+        warm_total += warm
+        print(f"{file_key:<20}{cold:>12.4f}{warm:>12.4f}{cold / max(warm, 1e-9):>11.1f}x")
+    print(f"{'TOTAL':<20}{cold_total:>12.4f}{warm_total:>12.4f}{cold_total / max(warm_total, 1e-9):>11.1f}x")
+
+
+def _benchmark_store(data_folder: str):
+    """Print warm startup from the SQLite store and indexed versus scanned pipe lookups"""
+    DataManager(data_folder, use_store=True).load_all(parallel=False)  # Make sure the store is filled
+
+    start = time.perf_counter()
+    manager = DataManager(data_folder, use_cache=False, use_store=True)
+    manager.load_all(parallel=False)
+    print(f"Warm startup from SQLite store: {time.perf_counter() - start:.3f}s")
+
+    pipes = manager.get_pipes_data()
+    type_column = manager.lookup_column('pipes', 'type')
+    diameter_column = manager.lookup_column('pipes', 'diameter')
+    if not pipes or not type_column or not diameter_column:
+        return
+    conditions = {type_column: pipes[-1][type_column], diameter_column: pipes[-1][diameter_column]}
+
+    # Through DataManager.lookup, so the freshness bookkeeping is part of the figure
+    start = time.perf_counter()
+    for _ in range(100):
+        indexed = manager.lookup('pipes', conditions)
+    store_time = (time.perf_counter() - start) / 100
+
+    start = time.perf_counter()
+    for _ in range(100):
+        scanned = [p for p in pipes if all(p.get(c) == v for c, v in conditions.items())]
+    scan_time = (time.perf_counter() - start) / 100
+    assert len(scanned) == len(indexed), "SQLite lookup and list scan disagree"
+    print(f"Lookup {conditions} ({len(indexed)} rows, {len(pipes)} in catalog): "
+          f"SQLite {store_time * 1e3:.3f} ms, list scan {scan_time * 1e3:.3f} ms")
+
+
 if __name__ == "__main__":
-    # Example usage
-    data_manager = DataManager()
-    try:
-        washing_component_df = data_manager.load_data('washing_components')
-        print(washing_component_df.head())
-        pipes_df = data_manager.load_data('pipes')
-        print(pipes_df.head())
-        connectors_df = data_manager.load_data('connectors')
-        print(connectors_df.head())
-        dirt_df = data_manager.load_data('dirt')
-        print(dirt_df.head())
-        fluids_df = data_manager.load_data('fluids')
-        print(fluids_df.head())
-        bends_df = data_manager.load_data('bends')
-        print(bends_df.head())
+    parser = argparse.ArgumentParser(description="Washing System catalog data manager")
+    parser.add_argument("--data-folder", default="data", help="Folder containing the catalog workbooks")
+    parser.add_argument("--rebuild-catalog-cache", action="store_true",
+                        help="Re-parse every workbook and rewrite the compiled catalog cache")
+    parser.add_argument("--benchmark-cache", action="store_true",
+                        help="Compare cold (openpyxl) and warm (cached) load times")
+    parser.add_argument("--load-all", choices=["parallel", "sequential"],
+                        help="Load every catalog and report per-file timings")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the compiled catalog cache")
+    parser.add_argument("--use-store", action="store_true", help="Load through the indexed SQLite catalog store")
+    parser.add_argument("--benchmark-store", action="store_true",
+                        help="Time warm startup and lookups through the SQLite catalog store")
+    args = parser.parse_args()
+
+    if args.rebuild_catalog_cache:
+        manager = DataManager(args.data_folder, preload=False)
+        for file_key, elapsed in manager.rebuild_cache().items():
+            print(f"Cached {file_key} in {elapsed:.3f}s")
+    elif args.benchmark_cache:
+        _benchmark_cache(args.data_folder)
+    elif args.benchmark_store:
+        _benchmark_store(args.data_folder)
+    elif args.load_all:
+        manager = DataManager(args.data_folder, use_cache=not args.no_cache, use_store=args.use_store)
+        start = time.perf_counter()
+        manager.load_all(parallel=args.load_all == "parallel")
+        print(f"Total wall time: {time.perf_counter() - start:.3f}s")
+    else:
+        # Example usage
+        data_manager = DataManager(args.data_folder, preload=True)
+        try:
+            washing_component_df = data_manager.load_data('washing_components')
+            print(washing_component_df.head())
+            pipes_df = data_manager.load_data('pipes')
+            print(pipes_df.head())
+            connectors_df = data_manager.load_data('connectors')
+            print(connectors_df.head())
+            dirt_df = data_manager.load_data('dirt')
+            print(dirt_df.head())
+            fluids_df = data_manager.load_data('fluids')
+            print(fluids_df.head())
+            bends_df = data_manager.load_data('bends')
+            print(bends_df.head())
     
 
-        print("\n=== DataManager Contents ===")
-        for key, value in data_manager.data.items():
-            print(f"\n{key.upper()}:")
-            if value:
-                print(f"  Records count: {len(value)}")
-            if len(value) > 0:
-                for i, record in enumerate(value):
-                    print(f"  Record {i+1}: {record}")
-            else:
-                print("  No data loaded")
-
-    except Exception as e:
-        print(f"Error loading data: {e}")
\ No newline at end of file
+            print("\n=== DataManager Contents ===")
+            for key, value in data_manager.data.items():
+                print(f"\n{key.upper()}:")
+                if value:
+                    print(f"  Records count: {len(value)}")
+                    for i, record in enumerate(value):
+                        print(f"  Record {i+1}: {record}")
+                else:
+                    print("  No data loaded")
+
+        except Exception as e:
+            print(f"Error loading data: {e}")
\ No newline at end of file
@@ -0,0 +1,188 @@
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.catalog_columns import find_column
+
+Temperature = Union[float, np.ndarray]
+
+# Used when the catalog has no row for the selected liquid (IAPWS values)
+WATER_TABLE = {
+    "temperature": [0.0, 10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0],
+    "density": [999.8, 999.7, 998.2, 995.7, 992.2, 988.0, 983.2, 977.8, 971.8, 965.3, 958.4],
+    "viscosity": [1.792e-3, 1.306e-3, 1.002e-3, 0.797e-3, 0.653e-3, 0.547e-3,
+                  0.467e-3, 0.404e-3, 0.355e-3, 0.315e-3, 0.282e-3],
+}
+
+
+def to_celsius(value: float, unit: str) -> float:
+    """Convert a General Settings temperature (°C or °K) to °C"""
+    return value - 273.15 if unit == "°K" else value
+
+
+class FluidProperties(NamedTuple):
+    """Fluid state at a temperature; fields are floats or arrays matching the input"""
+    density: Temperature            # kg/m3
+    dynamic_viscosity: Temperature  # Pa.s
+
+    @property
+    def kinematic_viscosity(self) -> Temperature:
+        """m2/s"""
+        return self.dynamic_viscosity / self.density
+
+
+class _FluidCurve:
+    """Sorted property samples of one fluid; viscosity is interpolated in log space"""
+
+    __slots__ = ("temperature", "density", "log_viscosity")
+
+    def __init__(self, temperature, density, viscosity):
+        order = np.argsort(temperature)
+        self.temperature = np.asarray(temperature, dtype=float)[order]
+        self.density = np.asarray(density, dtype=float)[order]
+        # Viscosity falls roughly exponentially with temperature (Andrade)
+        self.log_viscosity = np.log(np.asarray(viscosity, dtype=float)[order])
+
+    def evaluate(self, temperature_c: Temperature) -> FluidProperties:
+        density = np.interp(temperature_c, self.temperature, self.density)
+        viscosity = np.exp(np.interp(temperature_c, self.temperature, self.log_viscosity))
+        if np.ndim(temperature_c) == 0:
+            return FluidProperties(float(density), float(viscosity))
+        return FluidProperties(density, viscosity)
+
+
+class FluidPropertyTable:
+    """
+    Per-fluid density and viscosity as functions of temperature.
+
+    Built once from the Fluids catalog rows: one curve per 'LLG Name' made of
+    every row of that fluid. Works on scalars or NumPy arrays of °C values,
+    clamps outside the sampled range, and memoizes scalar lookups.
+    """
+
+    NAME_COLUMN = 'LLG Name'
+    MEMO_SIZE = 4096
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._curves: Dict[str, _FluidCurve] = {}
+        self._memo: Dict[Tuple[str, float], FluidProperties] = {}
+        self._warned = set()
+        self.water = _FluidCurve(WATER_TABLE["temperature"], WATER_TABLE["density"], WATER_TABLE["viscosity"])
+
+        if not records:
+            return
+
+        columns = list(records[0].keys())
+        name_column = find_column(columns, [self.NAME_COLUMN], ['name']) or self.NAME_COLUMN
+        temperature_column = find_column(columns, ['Temperature (°C)', 'Temperature'], ['temp'])
+        density_column = find_column(columns, ['Density (kg/m3)', 'Density'], ['density'])
+        viscosity_column = find_column(
+            columns, ['Dynamic Viscosity (mPa.s)', 'Dynamic Viscosity (Pa.s)', 'Viscosity'], ['viscosity']
+        )
+        if density_column is None or viscosity_column is None:
+            print("Fluids catalog has no density/viscosity columns; using water properties")
+            return
+        # Catalog viscosities are given in mPa.s unless the header says otherwise
+        lowered = viscosity_column.lower()
+        viscosity_scale = 1.0 if "pa.s" in lowered and "mpa" not in lowered else 1e-3
+
+        samples: Dict[str, List[Tuple[float, float, float]]] = {}
+        for record in records:
+            name = record.get(name_column)
+            try:
+                density = float(record.get(density_column))
+                viscosity = float(record.get(viscosity_column)) * viscosity_scale
+                temperature = float(record.get(temperature_column, 20.0)) if temperature_column else 20.0
+            except (TypeError, ValueError):
+                continue
+            if not name or density != density or viscosity != viscosity or viscosity <= 0:
+                continue
+            samples.setdefault(str(name), []).append((temperature, density, viscosity))
+
+        for name, points in samples.items():
+            temperature, density, viscosity = zip(*points)
+            self._curves[name] = _FluidCurve(temperature, density, viscosity)
+
+    def names(self) -> List[str]:
+        return list(self._curves)
+
+    def has_fluid(self, name: str) -> bool:
+        return name in self._curves
+
+    def temperature_range(self, name: str) -> Optional[Tuple[float, float]]:
+        """Sampled temperature range of a fluid in °C; outside it values are clamped"""
+        curve = self._curves.get(name)
+        return (float(curve.temperature[0]), float(curve.temperature[-1])) if curve else None
+
+    def clamped(self, name: str, temperature_c: Temperature) -> np.ndarray:
+        """True for the °C values outside the sampled range of a fluid (water if unknown)"""
+        curve = self._curves.get(name, self.water)
+        temperature_c = np.asarray(temperature_c, dtype=float)
+        return (temperature_c < curve.temperature[0]) | (temperature_c > curve.temperature[-1])
+
+    def range_warning(self, name: str, temperature_c: Temperature) -> Optional[str]:
+        """Message for the °C values whose properties are clamped to the edge of the fluid's data, if any"""
+        clamped = np.atleast_1d(self.clamped(name, temperature_c))
+        if not clamped.any():
+            return None
+        curve = self._curves.get(name, self.water)
+        outside = np.atleast_1d(np.asarray(temperature_c, dtype=float))[clamped]
+        values = f"{outside[0]:g} °C" if len(outside) == 1 else \
+            f"{len(outside)} temperatures ({outside.min():g} to {outside.max():g} °C)"
+        return (f"Liquid '{name}' has property data for {curve.temperature[0]:g} to {curve.temperature[-1]:g} °C "
+                f"only; {values} use the nearest edge values")
+
+    def _curve(self, name: str) -> _FluidCurve:
+        curve = self._curves.get(name)
+        if curve is None:
+            if name not in self._warned:
+                self._warned.add(name)
+                print(f"No property data for fluid '{name}', using water")
+            return self.water
+        return curve
+
+    def properties(self, name: str, temperature_c: Temperature) -> FluidProperties:
+        """Density (kg/m3) and dynamic viscosity (Pa.s) of a fluid at scalar or array °C"""
+        if not isinstance(temperature_c, (int, float)):
+            if np.ndim(temperature_c) != 0:
+                return self._curve(name).evaluate(np.asarray(temperature_c, dtype=float))
+            temperature_c = float(temperature_c)
+
+        key = (name, temperature_c)
+        result = self._memo.get(key)
+        if result is None:
+            result = self._curve(name).evaluate(float(temperature_c))
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = result
+        return result
+
+    def density(self, name: str, temperature_c: Temperature) -> Temperature:
+        return self.properties(name, temperature_c).density
+
+    def dynamic_viscosity(self, name: str, temperature_c: Temperature) -> Temperature:
+        return self.properties(name, temperature_c).dynamic_viscosity
+
+
+if __name__ == "__main__":
+    table = FluidPropertyTable([
+        {'LLG Name': 'Water', 'Temperature (°C)': t, 'Density (kg/m3)': d, 'Dynamic Viscosity (mPa.s)': v * 1e3}
+        for t, d, v in zip(WATER_TABLE["temperature"], WATER_TABLE["density"], WATER_TABLE["viscosity"])
+    ])
+    print(table.properties('Water', 25.0))
+
+    start = time.perf_counter()
+    for i in range(10_000):
+        table.properties('Water', 20.0 + i * 1e-3)
+    print(f"Scalar lookups (uncached): {(time.perf_counter() - start) / 10_000 * 1e6:.2f} us")
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        table.properties('Water', 25.0)
+    print(f"Scalar lookups (cached): {(time.perf_counter() - start) / 10_000 * 1e6:.2f} us")
+
+    temperatures = np.linspace(-30.0, 80.0, 100_000)
+    start = time.perf_counter()
+    table.properties('Water', temperatures)
+    print(f"Array of {len(temperatures)} temperatures: {(time.perf_counter() - start) * 1e3:.2f} ms")
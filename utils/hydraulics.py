@@ -0,0 +1,973 @@
+import threading
+import time
+import timeit
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.bend_losses import BendLossTable
+from utils.circuit_graph import CircuitGraph
+from utils.catalog_columns import find_column
+from utils.fluid_properties import FluidPropertyTable, to_celsius
+from utils.friction import DEFAULT_ROUGHNESS_M, pressure_loss, segment_losses
+from utils.pump_catalog import FALLBACK_PUMP_ROWS, LITRES_PER_MINUTE, PumpCatalog
+
+DEFAULT_PIPE_DIAMETER_MM = 4.0
+# Local loss coefficients of the circuit designer connectors, by item type
+DEFAULT_CONNECTOR_LOSSES = {
+    't_connector': 1.0,
+    'y_connector': 0.6,
+    'straight_connector': 0.2,
+}
+DEFAULT_VOLTAGE = 12.0
+DEFAULT_TEMPERATURE_C = 20.0
+DEFAULT_LIQUID = "Water"
+
+
+class NozzleSpec(NamedTuple):
+    """Orifice of the nozzle feeding a washing component"""
+    diameter_mm: float = 0.8
+    discharge_coefficient: float = 0.8
+
+    @property
+    def area(self) -> float:
+        """m2"""
+        return np.pi * (self.diameter_mm * 1e-3) ** 2 / 4.0
+
+
+DEFAULT_NOZZLE = NozzleSpec()
+
+
+class PipeResult(NamedTuple):
+    """Steady state of one circuit connection"""
+    from_id: Any
+    to_id: Any
+    from_name: str
+    to_name: str
+    flow: float             # m3/s
+    velocity: float         # m/s
+    reynolds: float
+    pressure_drop: float    # Pa, friction + bend
+
+
+class NodeResult(NamedTuple):
+    """Steady state of a connector or nozzle (washing component)"""
+    id: Any
+    name: str
+    type: str
+    inlet_pressure: float   # Pa (gauge)
+    flow: float             # m3/s
+    pressure_drop: float    # Pa; a nozzle drops its whole inlet pressure
+    outlet_velocity: float  # m/s, jet velocity for nozzles, 0 for connectors
+
+
+class OutputResult(NamedTuple):
+    """Operating point of one pump output and everything downstream of it"""
+    output: int
+    flow: float             # m3/s
+    pressure: float         # Pa at the pump outlet
+    pipes: List[PipeResult]
+    nodes: List[NodeResult]
+
+    def nozzles(self) -> List[NodeResult]:
+        return [node for node in self.nodes if node.type == 'component']
+
+    def connectors(self) -> List[NodeResult]:
+        return [node for node in self.nodes if node.type != 'component']
+
+
+class VariantResult(NamedTuple):
+    """One pump output solved for many variants of its circuit; arrays have one row per variant"""
+    output: int
+    nozzles: List[str]
+    flow: np.ndarray                # (variants,) m3/s
+    pressure: np.ndarray            # (variants,) Pa at the pump outlet
+    nozzle_pressure: np.ndarray     # (variants, nozzles) Pa
+    nozzle_flow: np.ndarray         # (variants, nozzles) m3/s
+
+
+class TemperatureSweep(NamedTuple):
+    """One pump circuit over a vector of liquid temperatures; output arrays have one row per temperature"""
+    pump_index: int
+    pump_name: str
+    voltage: float
+    liquid_name: str
+    temperatures: np.ndarray        # (temperatures,) °C
+    outputs: List[VariantResult]
+    warnings: List[str]
+    clamped: np.ndarray             # (temperatures,) True where the liquid properties are clamped to its data
+
+
+class CircuitResult(NamedTuple):
+    """Solution of one pump circuit; each output is solved on its own"""
+    pump_index: int
+    pump_name: str
+    voltage: float
+    liquid_name: str
+    temperature: float
+    outputs: List[OutputResult]
+    warnings: List[str]
+    # Output numbers solved by this call and those served from the solver cache
+    recomputed: Tuple[int, ...] = ()
+    cached: Tuple[int, ...] = ()
+
+
+def connector_losses(records: Optional[List[Dict[str, Any]]] = None) -> Dict[str, float]:
+    """Connector loss coefficients by designer item type, overridden by the Connectors catalog"""
+    losses = dict(DEFAULT_CONNECTOR_LOSSES)
+    if not records:
+        return losses
+
+    columns = list(records[0].keys())
+    type_column = find_column(columns, ['Connector Type', 'Type'], ['type'])
+    k_column = find_column(columns, ['Loss Coefficient', 'K'], ['coefficient', 'loss'])
+    if type_column is None or k_column is None:
+        return losses
+
+    by_key = {_connector_key(item_type): item_type for item_type in losses}
+    for record in records:
+        item_type = by_key.get(_connector_key(record.get(type_column)))
+        try:
+            k = float(record.get(k_column))
+        except (TypeError, ValueError):
+            continue
+        if item_type and k == k:
+            losses[item_type] = k
+    return losses
+
+
+def _connector_key(value: Any) -> str:
+    """'T-Connector' and 't_connector' both become 'tconnector'"""
+    return "".join(character for character in str(value).lower() if character.isalnum())
+
+
+class CircuitNetwork:
+    """
+    Tree of one pump circuit, assembled once from CircuitDesigner.get_circuit_data.
+
+    Connections are followed from the pump in their drawn direction. Each
+    pump connection is one output, numbered left to right by
+    CircuitGraph.pump_outputs. An item reached twice is kept on its
+    first path only and reported in `warnings`.
+    """
+
+    def __init__(self, circuit_data: Dict[str, Any], bend_table: Optional[BendLossTable] = None):
+        self.graph = CircuitGraph(circuit_data)
+        self.components = self.graph.components
+        self.connections = self.graph.connections
+        self.warnings: List[str] = []
+
+        bend_table = bend_table or BendLossTable()
+        self.diameter = np.empty(len(self.connections))
+        self.length = np.empty(len(self.connections))
+        for index, connection in enumerate(self.connections):
+            parameters = connection.get('parameters', {})
+            self.diameter[index] = _as_float(parameters.get('diameter'), 0.0) * 1e-3
+            self.length[index] = _as_float(parameters.get('length'), 0.0) * 1e-3
+        missing = self.diameter <= 0
+        if missing.any():
+            self.warnings.append(
+                f"{int(missing.sum())} connection(s) without a pipe diameter, assuming {DEFAULT_PIPE_DIAMETER_MM} mm"
+            )
+            self.diameter[missing] = DEFAULT_PIPE_DIAMETER_MM * 1e-3
+        self.bend_k = np.asarray(bend_table.connection_coefficients(self.connections), dtype=float)
+
+        outgoing = self.graph.outgoing
+        self.pump_id = self.graph.pump_id
+        # Child connections of every reachable item and the connection feeding it
+        self.children: Dict[Any, List[int]] = {}
+        self.parent: Dict[Any, int] = {}
+        # Per connection: the connection feeding its source item (-1 at the pump) and its depth
+        self.feeding: Dict[int, int] = {}
+        self.depth: Dict[int, int] = {}
+        # (output number, first connection, items from the pump outwards)
+        self.outputs: List[Tuple[int, int, List[Any]]] = []
+        if self.pump_id is None:
+            self.warnings.append("Circuit has no pump")
+            return
+
+        visited = {self.pump_id}
+        for output, first in self.graph.pump_outputs():
+            if self.connections[first]['to'] in visited:
+                self.warnings.append(f"Output {output} leads into another output's circuit, skipping it")
+                continue
+            order = []
+            stack = [first]
+            self.feeding[first], self.depth[first] = -1, 0
+            while stack:
+                index = stack.pop()
+                node = self.connections[index]['to']
+                if node in visited:
+                    self.warnings.append(
+                        f"'{self.connections[index].get('to_name', node)}' is reached twice, ignoring the second connection"
+                    )
+                    siblings = self.children.get(self.connections[index]['from'])
+                    if siblings is not None:
+                        siblings.remove(index)
+                    continue
+                visited.add(node)
+                self.parent[node] = index
+                self.children[node] = []
+                order.append(node)
+                for child in outgoing.get(node, []):
+                    self.children[node].append(child)
+                    self.feeding[child], self.depth[child] = index, self.depth[index] + 1
+                    stack.append(child)
+            self.outputs.append((output, first, order))
+
+    @staticmethod
+    def fingerprint(circuit_data: Dict[str, Any]) -> Tuple:
+        """Everything of a designer circuit the network depends on, as a hashable key"""
+        components = tuple(
+            (comp.get('id'), comp.get('type'), comp.get('name'), tuple(comp.get('position') or ())[:1])
+            for comp in circuit_data.get('components', [])
+        )
+        connections = tuple(
+            (connection.get('from'), connection.get('to'), connection.get('to_name'),
+             tuple(sorted((key, str(value)) for key, value in (connection.get('parameters') or {}).items())))
+            for connection in circuit_data.get('connections', [])
+        )
+        return components, connections
+
+    def output_signature(self, order: List[Any]) -> Tuple:
+        """
+        Structural key of one output subtree: every item with its type and
+        name, the connection feeding it and that connection's hydraulics.
+        Two outputs with equal signatures have the same solution.
+        """
+        position = {node: i for i, node in enumerate(order)}
+        signature = []
+        for node in order:
+            index = self.parent[node]
+            feeding = self.feeding[index]
+            signature.append((
+                node, self.node_type(node), self.node_name(node),
+                position.get(self.connections[feeding]['to'], -1) if feeding >= 0 else -1,
+                float(self.diameter[index]), float(self.length[index]), float(self.bend_k[index])
+            ))
+        return tuple(signature)
+
+    def node_type(self, node: Any) -> str:
+        return self.graph.node_type(node)
+
+    def node_name(self, node: Any) -> str:
+        return self.graph.node_name(node)
+
+    def __len__(self) -> int:
+        return len(self.components) + len(self.connections)
+
+
+class _Job(NamedTuple):
+    """One circuit to solve and its operating conditions"""
+    network: CircuitNetwork
+    pump_index: int
+    pump_name: str
+    voltage: float
+    liquid_name: str
+    temperature: float
+    nozzles: Dict[Any, NozzleSpec]
+
+
+class _Assembly:
+    """
+    Connections of many pump outputs flattened into arrays.
+
+    Every item of a tree is fed by exactly one connection, so items are
+    addressed through that connection. Row r is one pump output with its
+    own pressure grid; `levels` groups the connections by depth so each
+    level of every output is processed in one batch.
+    """
+
+    def __init__(self, rows: List[Tuple[_Job, int, int, List[Any]]], connector_k: Dict[str, float]):
+        row_of, connection, diameter, length, bend_k, local_k, nozzle_cda, parent, depth = ([] for _ in range(9))
+        self.first = np.empty(len(rows), dtype=np.int64)
+        # Per row: (connection indexes of the network, item ids) in traversal order
+        self.members: List[Tuple[List[int], List[Any]]] = []
+
+        for r, (job, _, first, order) in enumerate(rows):
+            network = job.network
+            base = len(row_of)
+            local = {network.parent[node]: base + position for position, node in enumerate(order)}
+            self.first[r] = local[first]
+            for node in order:
+                index = network.parent[node]
+                node_type = network.node_type(node)
+                spec = job.nozzles.get(node, DEFAULT_NOZZLE) if node_type == 'component' else None
+                row_of.append(r)
+                connection.append(index)
+                diameter.append(network.diameter[index])
+                length.append(network.length[index])
+                bend_k.append(network.bend_k[index])
+                local_k.append(connector_k.get(node_type, 0.0))
+                nozzle_cda.append(spec.discharge_coefficient * spec.area if spec else 0.0)
+                parent.append(local.get(network.feeding[index], -1))
+                depth.append(network.depth[index])
+            self.members.append(([network.parent[node] for node in order], order))
+
+        self.row = np.asarray(row_of, dtype=np.int64)
+        # Connection index in its network, e.g. to apply per-connection tolerances
+        self.connection = np.asarray(connection, dtype=np.int64)
+        self.diameter = np.asarray(diameter, dtype=float)
+        self.area = np.pi * self.diameter ** 2 / 4.0
+        self.length = np.asarray(length, dtype=float)
+        self.bend_k = np.asarray(bend_k, dtype=float)
+        self.local_k = np.asarray(local_k, dtype=float)
+        self.nozzle_cda = np.asarray(nozzle_cda, dtype=float)
+        self.parent = np.asarray(parent, dtype=np.int64)
+        depth = np.asarray(depth, dtype=np.int64)
+        self.levels = [np.flatnonzero(depth == level) for level in range(int(depth.max()) + 1)] if len(depth) else []
+
+    def repeat(self, count: int) -> "_Assembly":
+        """The same rows `count` times over (copy k holds rows k * len(first) onwards)"""
+        size, rows = len(self.row), len(self.first)
+        copy = np.repeat(np.arange(count), size)
+        repeated = _Assembly([], {})
+        repeated.row = np.tile(self.row, count) + copy * rows
+        for name in ('connection', 'diameter', 'area', 'length', 'bend_k', 'local_k', 'nozzle_cda'):
+            setattr(repeated, name, np.tile(getattr(self, name), count))
+        parent = np.tile(self.parent, count)
+        repeated.parent = np.where(parent >= 0, parent + copy * size, -1)
+        offsets = size * np.arange(count)[:, None]
+        repeated.first = (self.first[None, :] + offsets).ravel()
+        repeated.levels = [(level[None, :] + offsets).ravel() for level in self.levels]
+        repeated.members = self.members * count
+        return repeated
+
+
+class HydraulicSolver:
+    """
+    Steady-state flow and pressure of the saved pump circuits.
+
+    Every subtree is reduced to its flow-versus-inlet-pressure curve,
+    sampled on a fixed pressure grid from 0 to the pump shut-off pressure:
+    nozzles are orifices (Q = Cd A sqrt(2p/rho)), junctions add the curves
+    of their branches and pipes/connectors shift them by their loss. The
+    output curve is intersected with the pump curve at the supply voltage,
+    then pressures and flows are read back down the tree.
+
+    All outputs of all circuits are flattened into arrays and processed
+    one tree depth at a time, so each level costs a single friction kernel
+    call (utils.friction) whatever the number of pumps and connections.
+    """
+
+    PRESSURE_SAMPLES = 256
+    CACHE_SIZE = 512
+    # Operating envelope designs are signed off over, 5 °C apart
+    SWEEP_TEMPERATURES = np.linspace(-30.0, 80.0, 23)
+
+    def __init__(self, fluid_table: FluidPropertyTable, pump_catalog: PumpCatalog,
+                 bend_table: Optional[BendLossTable] = None,
+                 connector_k: Optional[Dict[str, float]] = None,
+                 roughness_m: float = DEFAULT_ROUGHNESS_M,
+                 friction_method: str = 'swamee_jain',
+                 nozzle_catalog=None):
+        self.fluid_table = fluid_table
+        self.pump_catalog = pump_catalog
+        self.bend_table = bend_table or BendLossTable()
+        self.connector_k = connector_k or dict(DEFAULT_CONNECTOR_LOSSES)
+        self.roughness_m = roughness_m
+        self.friction_method = friction_method
+        # utils.nozzle_catalog.NozzleCatalog giving the orifice of each Nozzle Ref; default nozzles without it
+        self.nozzle_catalog = nozzle_catalog
+        # Solved outputs and assembled networks of recent calls, least recently used first
+        self._outputs: "OrderedDict[Tuple, OutputResult]" = OrderedDict()
+        self._networks: "OrderedDict[Tuple, CircuitNetwork]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def from_data_manager(cls, data_manager, **options) -> "HydraulicSolver":
+        return cls(
+            data_manager.get_fluid_table(),
+            data_manager.get_pump_catalog(),
+            data_manager.get_bend_loss_table(),
+            data_manager.get_connector_losses(),
+            nozzle_catalog=data_manager.get_nozzle_catalog(),
+            **options
+        )
+
+    # --- Entry points ---
+
+    def solve_configuration(self, config_data: Dict[str, Any]) -> List[CircuitResult]:
+        """Solve every circuit of a MainController configuration in one batch"""
+        general = config_data.get('general_settings', {}) or {}
+        liquid_name = general.get('liquid_name') or DEFAULT_LIQUID
+        temperature = operating_temperature(general)
+        voltage = operating_voltage(general)
+        pumps = config_data.get('pumps', []) or []
+
+        jobs = []
+        for entry in circuit_entries(config_data):
+            pump_index = entry.get('pump_index', 0)
+            pump_row = pumps[pump_index] if 0 <= pump_index < len(pumps) else {}
+            circuit = entry.get('circuit', {})
+            jobs.append(_Job(self.network(circuit), pump_index, pump_row.get('Pump Name', ''), voltage,
+                             liquid_name, temperature, self.nozzle_specs(config_data, circuit)))
+        return self._solve(jobs)
+
+    def solve_circuit(self, circuit_data: Dict[str, Any], pump_name: str, voltage: float,
+                      liquid_name: str, temperature_c: float, pump_index: int = 0,
+                      nozzles: Optional[Dict[Any, NozzleSpec]] = None,
+                      network: Optional[CircuitNetwork] = None) -> CircuitResult:
+        """Solve each output of one circuit; `nozzles` maps component item ids to their orifice"""
+        if network is None:
+            network = self.network(circuit_data)
+        return self._solve([_Job(network, pump_index, pump_name, voltage, liquid_name,
+                                 temperature_c, nozzles or {})])[0]
+
+    def system_flow(self, items: List[Tuple[CircuitNetwork, int, Optional[Dict[Any, NozzleSpec]]]],
+                    liquid_name: str, temperatures: np.ndarray, grid: np.ndarray) -> np.ndarray:
+        """
+        System curves of pump outputs: the flow each (network, output, nozzles)
+        takes at the pump outlet pressures `grid` (uniform from 0), for every
+        temperature. Everything is composed in one batch; the result has
+        shape (items, temperatures, samples).
+        """
+        temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+        rows = []
+        for network, output, nozzles in items:
+            first, order = next((first, order) for number, first, order in network.outputs if number == output)
+            job = _Job(network, 0, '', 0.0, liquid_name, 0.0, nozzles or {})
+            rows.extend([(job, 0, first, order)] * len(temperatures))
+        if not rows:
+            return np.zeros((0, len(temperatures), len(grid)))
+
+        assembly = _Assembly(rows, self.connector_k)
+        fluid = self.fluid_table.properties(liquid_name, temperatures)
+        density = np.tile(fluid.density, len(items))
+        viscosity = np.tile(fluid.dynamic_viscosity, len(items))
+        curves = self._compose(assembly, np.tile(grid, (len(rows), 1)), density, viscosity)
+        return curves[assembly.first].reshape(len(items), len(temperatures), len(grid))
+
+    def solve_variants(self, network: CircuitNetwork, pump_name: str, voltage: float, liquid_name: str,
+                       temperatures: np.ndarray, length_scale: Optional[np.ndarray] = None,
+                       diameter_scale: Optional[np.ndarray] = None, pump_scale: Optional[np.ndarray] = None,
+                       nozzles: Optional[Dict[Any, NozzleSpec]] = None,
+                       samples: Optional[int] = None, bend_k: Optional[np.ndarray] = None) -> List[VariantResult]:
+        """
+        Solve many variants of one circuit in a single batch, bypassing the
+        cache. Variant v runs at temperatures[v]; length_scale and
+        diameter_scale are (variants, connections) factors on the nominal
+        pipes and pump_scale a (variants,) speed factor on the pump curve
+        (Q ~ s, p ~ s^2). bend_k optionally replaces the bend coefficients,
+        (variants, connections), e.g. when diameters change r/D. `samples`
+        overrides the pressure grid size, cost is linear in it.
+        """
+        temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+        count, outputs = len(temperatures), len(network.outputs)
+        if not outputs or not self.pump_catalog.has_curve(pump_name):
+            return []
+
+        job = _Job(network, 0, pump_name, voltage, liquid_name, 0.0, nozzles or {})
+        base = _Assembly([(job, 0, first, order) for _, first, order in network.outputs], self.connector_k)
+        assembly = base.repeat(count)
+        variant = assembly.row // outputs
+        if length_scale is not None:
+            assembly.length = assembly.length * np.asarray(length_scale)[variant, assembly.connection]
+        if diameter_scale is not None:
+            assembly.diameter = assembly.diameter * np.asarray(diameter_scale)[variant, assembly.connection]
+            assembly.area = np.pi * assembly.diameter ** 2 / 4.0
+        if bend_k is not None:
+            assembly.bend_k = np.asarray(bend_k, dtype=float)[variant, assembly.connection]
+
+        fluid = self.fluid_table.properties(liquid_name, temperatures)
+        density = np.repeat(np.broadcast_to(fluid.density, count), outputs)
+        viscosity = np.repeat(np.broadcast_to(fluid.dynamic_viscosity, count), outputs)
+        speed = np.repeat(np.ones(count) if pump_scale is None else np.asarray(pump_scale, dtype=float), outputs)[:, None]
+        shutoff = self.pump_catalog.pressure(pump_name, voltage, 0.0)
+        grid = speed ** 2 * (shutoff * 1.02 * np.linspace(0.0, 1.0, samples or self.PRESSURE_SAMPLES))[None, :]
+        pump_flow = speed * self.pump_catalog.flow(pump_name, voltage, grid / speed ** 2)
+
+        curves = self._compose(assembly, grid, density, viscosity)
+        flow, pressure = intersect(grid, curves[assembly.first], pump_flow)
+        state = self._read_back(assembly, grid, curves, density, viscosity, flow, pressure)
+
+        return self._variant_results(network, base, 0, count, flow, pressure, state)
+
+    def sweep_temperatures(self, config_data: Dict[str, Any],
+                           temperatures: Optional[np.ndarray] = None) -> List[TemperatureSweep]:
+        """
+        Every circuit of a MainController configuration at every liquid
+        temperature, in one batch: the outputs of all circuits are
+        assembled once (from the cached networks) and repeated per
+        temperature, and the fluid table is read once for the whole
+        vector. Temperatures default to SWEEP_TEMPERATURES.
+        """
+        temperatures = self.SWEEP_TEMPERATURES if temperatures is None else \
+            np.atleast_1d(np.asarray(temperatures, dtype=float))
+        general = config_data.get('general_settings', {}) or {}
+        liquid_name = general.get('liquid_name') or DEFAULT_LIQUID
+        voltage = operating_voltage(general)
+        pumps = config_data.get('pumps', []) or []
+
+        jobs, warnings = [], []
+        for entry in circuit_entries(config_data):
+            pump_index = entry.get('pump_index', 0)
+            pump_row = pumps[pump_index] if 0 <= pump_index < len(pumps) else {}
+            circuit = entry.get('circuit', {})
+            network = self.network(circuit)
+            jobs.append(_Job(network, pump_index, pump_row.get('Pump Name', ''), voltage, liquid_name, 0.0,
+                             self.nozzle_specs(config_data, circuit)))
+            warnings.append(list(network.warnings))
+
+        clamped = self.fluid_table.clamped(liquid_name, temperatures)
+        range_warning = self.fluid_table.range_warning(liquid_name, temperatures)
+        rows, first_row = [], []
+        for number, job in enumerate(jobs):
+            first_row.append(len(rows))
+            if range_warning:
+                warnings[number].append(range_warning)
+            if not self.pump_catalog.has_curve(job.pump_name):
+                warnings[number].append(f"No curve for pump '{job.pump_name}'")
+                continue
+            rows.extend((job, number, first, order) for _, first, order in job.network.outputs)
+
+        solved: List[List[VariantResult]] = [[] for _ in jobs]
+        if rows:
+            count = len(temperatures)
+            base = _Assembly(rows, self.connector_k)
+            assembly = base.repeat(count)
+            fluid = self.fluid_table.properties(liquid_name, temperatures)
+            density = np.repeat(np.broadcast_to(fluid.density, count), len(rows))
+            viscosity = np.repeat(np.broadcast_to(fluid.dynamic_viscosity, count), len(rows))
+            shutoff = np.array([self.pump_catalog.pressure(job.pump_name, voltage, 0.0) for job, *_ in rows])
+            base_grid = (shutoff * 1.02)[:, None] * np.linspace(0.0, 1.0, self.PRESSURE_SAMPLES)[None, :]
+            base_pump = np.vstack([self.pump_catalog.flow(job.pump_name, voltage, base_grid[r])
+                                   for r, (job, *_) in enumerate(rows)])
+            grid, pump_flow = np.tile(base_grid, (count, 1)), np.tile(base_pump, (count, 1))
+
+            curves = self._compose(assembly, grid, density, viscosity)
+            flow, pressure = intersect(grid, curves[assembly.first], pump_flow)
+            state = self._read_back(assembly, grid, curves, density, viscosity, flow, pressure)
+            for number, job in enumerate(jobs):
+                if self.pump_catalog.has_curve(job.pump_name):
+                    solved[number] = self._variant_results(job.network, base, first_row[number], count,
+                                                           flow, pressure, state)
+
+        return [TemperatureSweep(job.pump_index, job.pump_name, voltage, liquid_name, temperatures,
+                                 solved[number], warnings[number], clamped)
+                for number, job in enumerate(jobs)]
+
+    def nozzle_specs(self, config_data: Dict[str, Any], circuit_data: Dict[str, Any]) -> Dict[Any, NozzleSpec]:
+        """Orifice of every washing component of a circuit, from the Nozzle Ref set on its page"""
+        if self.nozzle_catalog is None:
+            return {}
+        return self.nozzle_catalog.circuit_specs(config_data, circuit_data)
+
+    # --- Caching ---
+
+    def network(self, circuit_data: Dict[str, Any]) -> CircuitNetwork:
+        """Assembled network of a designer circuit, reused while the circuit is unchanged"""
+        key = CircuitNetwork.fingerprint(circuit_data)
+        with self._cache_lock:
+            network = self._networks.get(key)
+            if network is not None:
+                self._networks.move_to_end(key)
+                return network
+        network = CircuitNetwork(circuit_data, self.bend_table)
+        with self._cache_lock:
+            self._networks[key] = network
+            while len(self._networks) > self.CACHE_SIZE:
+                self._networks.popitem(last=False)
+        return network
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._outputs.clear()
+            self._networks.clear()
+
+    @staticmethod
+    def _variant_results(network: CircuitNetwork, base: _Assembly, start: int, count: int, flow: np.ndarray,
+                         pressure: np.ndarray, state: Dict[str, np.ndarray]) -> List[VariantResult]:
+        """
+        Results of the outputs of `network`, rows start.. of `base`, read
+        from a batch of `count` repeats of `base` (see _Assembly.repeat)
+        """
+        size, width = len(base.row), len(base.first)
+        results = []
+        for r, (output, _, order) in enumerate(network.outputs, start):
+            nozzle_positions = [i for i, node in enumerate(order) if network.node_type(node) == 'component']
+            elements = (base.first[r] + np.asarray(nozzle_positions, dtype=np.int64))[None, :] + \
+                size * np.arange(count)[:, None]
+            rows = r + width * np.arange(count)
+            results.append(VariantResult(output, [network.node_name(order[i]) for i in nozzle_positions],
+                                         flow[rows], pressure[rows], state['inlet'][elements],
+                                         state['nozzle_flow'][elements]))
+        return results
+
+    @staticmethod
+    def _output_key(job: _Job, output: int, order: List[Any]) -> Tuple:
+        """Operating conditions, nozzles and structure of one output: equal keys give equal results"""
+        nozzles = tuple(job.nozzles.get(node) for node in order if node in job.nozzles)
+        return (job.pump_name, job.voltage, job.liquid_name, job.temperature, output, nozzles,
+                job.network.output_signature(order))
+
+    # --- Batched passes ---
+
+    def _solve(self, jobs: List[_Job]) -> List[CircuitResult]:
+        """Solve the outputs missing from the cache in one batch and merge them with the cached ones"""
+        warnings = [list(job.network.warnings) for job in jobs]
+        for number, job in enumerate(jobs):
+            range_warning = self.fluid_table.range_warning(job.liquid_name, job.temperature)
+            if range_warning:
+                warnings[number].append(range_warning)
+        solved: List[Dict[int, OutputResult]] = [{} for _ in jobs]
+        cached: List[List[int]] = [[] for _ in jobs]
+        rows = []
+        for number, job in enumerate(jobs):
+            if not self.pump_catalog.has_curve(job.pump_name):
+                warnings[number].append(f"No curve for pump '{job.pump_name}'")
+                continue
+            for output, first, order in job.network.outputs:
+                key = self._output_key(job, output, order)
+                with self._cache_lock:
+                    result = self._outputs.get(key)
+                    if result is not None:
+                        self._outputs.move_to_end(key)
+                if result is not None:
+                    solved[number][output] = result
+                    cached[number].append(output)
+                else:
+                    rows.append((job, number, first, order, output, key))
+
+        if rows:
+            assembly = _Assembly([(job, number, first, order) for job, number, first, order, *_ in rows],
+                                 self.connector_k)
+            fluid = [self.fluid_table.properties(job.liquid_name, job.temperature) for job, *_ in rows]
+            density = np.array([state.density for state in fluid])
+            viscosity = np.array([state.dynamic_viscosity for state in fluid])
+            shutoff = np.array([self.pump_catalog.pressure(job.pump_name, job.voltage, 0.0) for job, *_ in rows])
+            grid = (shutoff * 1.02)[:, None] * np.linspace(0.0, 1.0, self.PRESSURE_SAMPLES)[None, :]
+            pump_flow = np.vstack([self.pump_catalog.flow(job.pump_name, job.voltage, grid[r])
+                                   for r, (job, *_) in enumerate(rows)])
+
+            curves = self._compose(assembly, grid, density, viscosity)
+            flow, pressure = intersect(grid, curves[assembly.first], pump_flow)
+            state = self._read_back(assembly, grid, curves, density, viscosity, flow, pressure)
+            for r, (job, number, first, order, output, key) in enumerate(rows):
+                result = self._output_result(assembly, r, job, output, flow[r], pressure[r], state)
+                solved[number][output] = result
+                with self._cache_lock:
+                    self._outputs[key] = result
+                    while len(self._outputs) > self.CACHE_SIZE:
+                        self._outputs.popitem(last=False)
+
+        results = []
+        for number, job in enumerate(jobs):
+            outputs = [solved[number][output] for output, *_ in job.network.outputs if output in solved[number]]
+            recomputed = tuple(output.output for output in outputs if output.output not in cached[number])
+            results.append(CircuitResult(job.pump_index, job.pump_name, job.voltage, job.liquid_name,
+                                         job.temperature, outputs, warnings[number], recomputed,
+                                         tuple(cached[number])))
+        return results
+
+    def _compose(self, assembly: _Assembly, grid: np.ndarray, density: np.ndarray,
+                 viscosity: np.ndarray) -> np.ndarray:
+        """Flow-versus-pressure curve at the inlet of every connection, deepest level first"""
+        curves = np.zeros((len(assembly.row), grid.shape[1]))
+        branches = np.zeros_like(curves)
+        step = grid[:, 1]
+        for level in reversed(assembly.levels):
+            row = assembly.row[level]
+            pressure = grid[row]
+            rho, mu = density[row][:, None], viscosity[row][:, None]
+            flow = branches[level] + assembly.nozzle_cda[level][:, None] * np.sqrt(2.0 * pressure / rho)
+
+            k = assembly.local_k[level][:, None]
+            if k.any():
+                # Connector loss on the through flow, at the velocity of the feeding pipe
+                velocity = flow / assembly.area[level][:, None]
+                flow = _resample(step[row], pressure + k * 0.5 * rho * velocity ** 2, flow)
+
+            loss = pressure_loss(flow, assembly.diameter[level][:, None], assembly.length[level][:, None],
+                                 rho, mu, self.roughness_m, assembly.bend_k[level][:, None], self.friction_method)
+            curves[level] = _resample(step[row], pressure + loss, flow)
+
+            parent = assembly.parent[level]
+            inner = parent >= 0
+            np.add.at(branches, parent[inner], curves[level][inner])
+        return curves
+
+    def _read_back(self, assembly: _Assembly, grid: np.ndarray, curves: np.ndarray, density: np.ndarray,
+                   viscosity: np.ndarray, flow: np.ndarray, pressure: np.ndarray) -> Dict[str, np.ndarray]:
+        """Pressures and flows of every connection and item from the operating points down"""
+        count = len(assembly.row)
+        state = {name: np.zeros(count) for name in
+                 ('flow', 'velocity', 'reynolds', 'pipe_drop', 'inlet', 'local_drop', 'outlet', 'nozzle_flow')}
+        start = np.zeros(count)
+        start[assembly.first] = pressure
+        step = grid[:, -1] / (grid.shape[1] - 1)
+
+        for level in assembly.levels:
+            row = assembly.row[level]
+            rho, mu = density[row], viscosity[row]
+            inner = assembly.parent[level] >= 0
+            start[level[inner]] = state['outlet'][assembly.parent[level][inner]]
+
+            # Read the inlet curve at the start pressure (uniform grid: direct indexing)
+            position = np.clip(start[level] / step[row], 0.0, grid.shape[1] - 1.0)
+            lower = np.minimum(position.astype(np.int64), grid.shape[1] - 2)
+            weight = position - lower
+            segment = curves[level]
+            pipe_flow = segment[np.arange(len(level)), lower] * (1.0 - weight) + \
+                segment[np.arange(len(level)), lower + 1] * weight
+            pipe_flow[~inner] = flow[row[~inner]]
+
+            losses = segment_losses(pipe_flow, assembly.diameter[level], assembly.length[level], rho, mu,
+                                    self.roughness_m, assembly.bend_k[level], self.friction_method)
+            inlet = np.maximum(start[level] - losses.pressure_drop, 0.0)
+            local_drop = np.minimum(assembly.local_k[level] * 0.5 * rho * losses.velocity ** 2, inlet)
+            outlet = inlet - local_drop
+
+            state['flow'][level] = pipe_flow
+            state['velocity'][level] = losses.velocity
+            state['reynolds'][level] = losses.reynolds
+            state['pipe_drop'][level] = losses.pressure_drop
+            state['inlet'][level] = inlet
+            state['local_drop'][level] = local_drop
+            state['outlet'][level] = outlet
+            state['nozzle_flow'][level] = assembly.nozzle_cda[level] * np.sqrt(2.0 * outlet / rho)
+        return state
+
+    @staticmethod
+    def _output_result(assembly: _Assembly, r: int, job: _Job, output: int, flow: float,
+                       pressure: float, state: Dict[str, np.ndarray]) -> OutputResult:
+        network = job.network
+        indexes, order = assembly.members[r]
+        base = int(assembly.first[r])
+        pipes: List[PipeResult] = []
+        nodes: List[NodeResult] = []
+        for position, (index, node) in enumerate(zip(indexes, order)):
+            i = base + position
+            connection = network.connections[index]
+            pipes.append(PipeResult(
+                connection['from'], connection['to'], connection.get('from_name', ''),
+                connection.get('to_name', ''), float(state['flow'][i]), float(state['velocity'][i]),
+                float(state['reynolds'][i]), float(state['pipe_drop'][i])
+            ))
+            node_type = network.node_type(node)
+            if node_type == 'component':
+                spec = job.nozzles.get(node, DEFAULT_NOZZLE)
+                nozzle_flow = float(state['nozzle_flow'][i])
+                nodes.append(NodeResult(node, network.node_name(node), node_type, float(state['inlet'][i]),
+                                        nozzle_flow, float(state['inlet'][i]), nozzle_flow / spec.area))
+            else:
+                nodes.append(NodeResult(node, network.node_name(node), node_type, float(state['inlet'][i]),
+                                        float(state['flow'][i]), float(state['local_drop'][i]), 0.0))
+        return OutputResult(output, float(flow), float(pressure), pipes, nodes)
+
+
+# Solver of a process pool worker, built once by solver_pool's initializer
+_WORKER_SOLVER: Optional[HydraulicSolver] = None
+
+
+def _init_worker(fluid_table, pump_catalog, bend_table, connector_k, roughness_m, friction_method,
+                 nozzle_catalog):
+    global _WORKER_SOLVER
+    _WORKER_SOLVER = HydraulicSolver(fluid_table, pump_catalog, bend_table, connector_k,
+                                     roughness_m, friction_method, nozzle_catalog)
+
+
+def solver_pool(solver: HydraulicSolver, workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers each hold a copy of `solver` (see
+    worker_solver). The read-only catalogs are sent to every worker once,
+    at start-up, instead of with every task.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(solver.fluid_table, solver.pump_catalog, solver.bend_table,
+                                         solver.connector_k, solver.roughness_m, solver.friction_method,
+                                         solver.nozzle_catalog))
+
+
+def worker_solver() -> HydraulicSolver:
+    """The solver of the current solver_pool worker"""
+    if _WORKER_SOLVER is None:
+        raise RuntimeError("Not running in a solver_pool worker")
+    return _WORKER_SOLVER
+
+
+def _resample(step: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    np.interp of each row of fp (at ascending xp) onto the uniform grid 0, step, 2 step, ...
+
+    The grid being uniform, the number of xp points at or below each grid
+    pressure comes from a bincount and a cumulative sum instead of a binary
+    search, which keeps the whole batch linear in its size.
+    """
+    rows, width = xp.shape
+    # First grid index at or above each sample (width: past the end of the grid)
+    bucket = np.minimum(np.ceil(xp / step[:, None]), width).astype(np.int64)
+    counts = np.bincount((bucket + (np.arange(rows) * (width + 1))[:, None]).ravel(),
+                         minlength=rows * (width + 1)).reshape(rows, width + 1)
+    lower = np.cumsum(counts[:, :width], axis=1) - 1
+    lower = np.clip(lower, 0, width - 2)
+
+    row = np.arange(rows)[:, None]
+    x0, x1 = xp[row, lower], xp[row, lower + 1]
+    query = step[:, None] * np.arange(width)[None, :]
+    weight = np.clip((query - x0) / np.maximum(x1 - x0, 1e-300), 0.0, 1.0)
+    y0 = fp[row, lower]
+    return y0 + weight * (fp[row, lower + 1] - y0)
+
+
+def intersect(grid: np.ndarray, system_flow: np.ndarray, pump_flow: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(flow, pressure) per row where the rising system curve meets the falling pump curve"""
+    difference = system_flow - pump_flow
+    rows = np.arange(len(grid))
+    above = difference >= 0.0
+    # First grid point past the crossing; rows that never cross are dead-headed at the last point
+    index = np.where(above.any(axis=1), np.argmax(above, axis=1), grid.shape[1] - 1)
+    lower = np.maximum(index - 1, 0)
+    d0, d1 = difference[rows, lower], difference[rows, index]
+    weight = np.where((index > 0) & (d1 != d0), -d0 / np.where(d1 != d0, d1 - d0, 1.0), 0.0)
+    weight = np.clip(weight, 0.0, 1.0)
+    pressure = grid[rows, lower] + weight * (grid[rows, index] - grid[rows, lower])
+    pump = pump_flow[rows, lower] + weight * (pump_flow[rows, index] - pump_flow[rows, lower])
+    system = system_flow[rows, lower] + weight * (system_flow[rows, index] - system_flow[rows, lower])
+    # Dead-headed rows deliver what the outlets take at shut-off
+    flow = np.where(above.any(axis=1), pump, system)
+    return flow, pressure
+
+
+def circuit_entries(config_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The {'pump_index', 'circuit'} entries, whether saved with a connection summary or as a bare list"""
+    circuits = config_data.get('circuits', []) or []
+    if isinstance(circuits, dict):
+        circuits = circuits.get('circuits', [])
+    return [entry for entry in circuits if isinstance(entry, dict)]
+
+
+def operating_voltage(general: Dict[str, Any]) -> float:
+    """General Settings power voltage in V"""
+    voltage = general.get('power_voltage', {}) or {}
+    value = _as_float(voltage.get('value'), DEFAULT_VOLTAGE)
+    return value / 1000.0 if voltage.get('unit') == 'mV' else value
+
+
+def operating_temperature(general: Dict[str, Any]) -> float:
+    """General Settings liquid temperature in °C"""
+    temperature = general.get('liquid_temperature', {}) or {}
+    return to_celsius(_as_float(temperature.get('value'), DEFAULT_TEMPERATURE_C), temperature.get('unit', '°C'))
+
+
+def _as_float(value: Any, default: float) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number == number else default
+
+
+def _synthetic_circuit(branches: int, depth: int) -> Dict[str, Any]:
+    """Pump with two outputs, each a chain of T-connectors with one nozzle branch per connector"""
+    components = [{'id': 0, 'type': 'pump', 'name': 'Pump', 'position': [0, 0]}]
+    connections = []
+
+    def connect(source, target, length):
+        connections.append({'from': source, 'to': target, 'from_name': str(source), 'to_name': str(target),
+                            'parameters': {'diameter': 4.0, 'length': length, 'inclination': 'bent',
+                                           'bend_radius': 20.0}})
+
+    for output in range(2):
+        upstream = 0
+        for level in range(depth):
+            connector = len(components)
+            components.append({'id': connector, 'type': 't_connector', 'name': 'T', 'position': [output, level]})
+            connect(upstream, connector, 300.0)
+            for _ in range(branches):
+                nozzle = len(components)
+                components.append({'id': nozzle, 'type': 'component', 'name': f'WC {nozzle}', 'position': [output, level]})
+                connect(connector, nozzle, 150.0)
+            upstream = connector
+    return {'components': components, 'connections': connections}
+
+
+if __name__ == "__main__":
+    solver = HydraulicSolver(FluidPropertyTable([]), PumpCatalog(FALLBACK_PUMP_ROWS))
+    pump = solver.pump_catalog.names()[0]
+    small = solver.solve_circuit(_synthetic_circuit(2, 2), pump, 12.0, DEFAULT_LIQUID, 20.0)
+    for output in small.outputs:
+        print(f"Output {output.output}: {output.flow / LITRES_PER_MINUTE:.2f} L/min at {output.pressure / 1000:.1f} kPa")
+        for nozzle in output.nozzles():
+            print(f"  {nozzle.name}: {nozzle.inlet_pressure / 1000:.1f} kPa, {nozzle.outlet_velocity:.1f} m/s")
+
+    for branches, depth in [(2, 10), (4, 40), (4, 100)]:
+        circuit = _synthetic_circuit(branches, depth)
+        network = CircuitNetwork(circuit, solver.bend_table)
+        start = time.perf_counter()
+        solver.solve_circuit(circuit, pump, 12.0, DEFAULT_LIQUID, 20.0, network=network)
+        elapsed = time.perf_counter() - start
+        print(f"{len(network)} elements: {elapsed * 1e3:.1f} ms")
+
+    # Whole configurations: every pump circuit in one batch versus circuit by circuit
+    for pumps in [1, 5, 20]:
+        config = {
+            'general_settings': {},
+            'pumps': [{'Pump Name': pump} for _ in range(pumps)],
+            'circuits': [{'pump_index': i, 'circuit': _synthetic_circuit(4, 5)} for i in range(pumps)],
+        }
+        for i, entry in enumerate(config['circuits']):
+            # Distinct lengths so no two pumps share a cached output
+            entry['circuit']['connections'][0]['parameters']['length'] = 300.0 + i
+
+        def batched_run():
+            solver.clear_cache()
+            return solver.solve_configuration(config)
+
+        def separate_run():
+            solver.clear_cache()
+            for entry in config['circuits']:
+                solver.solve_circuit(entry['circuit'], pump, 12.0, DEFAULT_LIQUID, 20.0)
+
+        # Best of several cold-cache runs, so one noisy run does not decide the comparison
+        batched = min(timeit.repeat(batched_run, number=1, repeat=7))
+        separate = min(timeit.repeat(separate_run, number=1, repeat=7))
+        results = batched_run()
+        pipes = sum(len(output.pipes) for result in results for output in result.outputs)
+        print(f"{pumps:>2} pumps, {pipes} connections (best of 7): batched {batched * 1e3:.1f} ms, "
+              f"circuit by circuit {separate * 1e3:.1f} ms ({separate / batched:.1f}x)")
+
+    # Local edits on the 20 pump configuration: only the touched output is solved again
+    solver.solve_configuration(config)
+    edits = {
+        'pipe length': lambda circuit: circuit['connections'][-1]['parameters'].update(length=420.0),
+        'delete nozzle': lambda circuit: circuit['connections'].pop(),
+    }
+    for label, edit in edits.items():
+        edit(config['circuits'][7]['circuit'])
+        start = time.perf_counter()
+        results = solver.solve_configuration(config)
+        elapsed = time.perf_counter() - start
+        recomputed = sum(len(result.recomputed) for result in results)
+        cached = sum(len(result.cached) for result in results)
+        print(f"{label}: {elapsed * 1e3:.1f} ms, {recomputed} output(s) recomputed, {cached} from cache "
+              f"(pump 8 recomputed {results[7].recomputed})")
+
+    # Temperature envelope: one batched sweep versus one configuration solve per temperature
+    config = {
+        'general_settings': {},
+        'pumps': [{'Pump Name': pump} for _ in range(5)],
+        'circuits': [{'pump_index': i, 'circuit': _synthetic_circuit(4, 5)} for i in range(5)],
+    }
+    for i, entry in enumerate(config['circuits']):
+        entry['circuit']['connections'][0]['parameters']['length'] = 300.0 + i
+    start = time.perf_counter()
+    sweeps = solver.sweep_temperatures(config)
+    swept = time.perf_counter() - start
+    solver.clear_cache()
+    start = time.perf_counter()
+    for temperature in solver.SWEEP_TEMPERATURES:
+        config['general_settings']['liquid_temperature'] = {'value': str(temperature), 'unit': '°C'}
+        results = solver.solve_configuration(config)
+    looped = time.perf_counter() - start
+    curve = sweeps[0].outputs[0]
+    print(f"{len(solver.SWEEP_TEMPERATURES)} temperatures x 5 pumps: sweep {swept * 1e3:.1f} ms, "
+          f"solve per temperature {looped * 1e3:.1f} ms; output 1 at 80 °C {curve.flow[-1] / LITRES_PER_MINUTE:.4f} "
+          f"L/min (direct {results[0].outputs[0].flow / LITRES_PER_MINUTE:.4f} L/min), "
+          f"at -30 °C {curve.flow[0] / LITRES_PER_MINUTE:.4f} L/min")
+    # Water data starts at 0 °C: colder sweep points are clamped to it and reported
+    below = solver.SWEEP_TEMPERATURES < 0.0
+    assert (sweeps[0].clamped == below).all() and np.allclose(curve.flow[below], curve.flow[below][-1])
+    print(f"{int(below.sum())} sweep temperatures below the water data flagged: {sweeps[0].warnings[-1]}")
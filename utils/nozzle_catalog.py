@@ -0,0 +1,209 @@
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from utils.catalog_columns import find_column
+from utils.hydraulics import DEFAULT_NOZZLE, CircuitResult, NozzleSpec, _as_float
+from utils.pump_catalog import _number, _present, _text
+
+AIR_DENSITY = 1.2               # kg/m3
+# Intact length of a washer jet before it breaks up into drops, in orifice diameters
+CORE_DIAMETERS = 100.0
+# Rayleigh breakup: drop diameter over orifice diameter
+DROP_DIAMETERS = 1.89
+DROP_DRAG_COEFFICIENT = 0.47
+
+# Used when nozzles_catalog.xlsx is missing: the references the dialog used to hard-code
+FALLBACK_NOZZLE_ROWS = [
+    {'Nozzle Ref': 'Nozzle Type A', 'Supplier': 'Supplier ABC', 'Type': 'fixed', 'Orifice (mm)': 0.8,
+     'Discharge Coefficient': 0.8, 'Spray Angle (deg)': 10.0, 'Max Velocity (m/s)': 25.0},
+    {'Nozzle Ref': 'Nozzle Type B', 'Supplier': 'Supplier XYZ', 'Type': 'fixed', 'Orifice (mm)': 1.0,
+     'Discharge Coefficient': 0.75, 'Spray Angle (deg)': 20.0, 'Max Velocity (m/s)': 20.0},
+    {'Nozzle Ref': 'Nozzle Type C', 'Supplier': 'Supplier DEF', 'Type': 'fixed', 'Orifice (mm)': 0.6,
+     'Discharge Coefficient': 0.85, 'Spray Angle (deg)': 40.0, 'Max Velocity (m/s)': 30.0},
+]
+
+
+class NozzleInfo(NamedTuple):
+    """Catalog entry of a nozzle"""
+    ref: str
+    supplier: str
+    type: str
+    spec: NozzleSpec
+    spray_angle: float      # deg, full cone angle
+    max_velocity: float     # m/s rated outlet velocity, nan when not given
+
+
+class NozzleState(NamedTuple):
+    """Jets of many nozzles; one entry per nozzle"""
+    flow: np.ndarray                # m3/s, i.e. consumption per second
+    outlet_velocity: np.ndarray     # m/s at the orifice
+    impact_velocity: np.ndarray     # m/s on the component, D_C_N downstream
+    velocity_ratio: np.ndarray      # outlet velocity over the rated maximum, nan when unknown
+
+
+class NozzlePerformance(NamedTuple):
+    """One nozzle of a solved configuration"""
+    pump_index: int
+    output: int
+    component: Any          # circuit item id
+    name: str
+    ref: str
+    distance: float         # m, D_C_N
+    inlet_pressure: float   # Pa
+    flow: float             # m3/s
+    outlet_velocity: float  # m/s
+    impact_velocity: float  # m/s
+    velocity_ratio: float
+
+
+class NozzleCatalog:
+    """
+    Nozzle references with their orifice, discharge coefficient, spray
+    angle and rated velocity. Per-reference values are stored in arrays
+    so whole configurations are evaluated in one call (evaluate).
+    """
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        columns = list(records[0].keys()) if records else []
+        ref_column = find_column(columns, ['Nozzle Ref', 'Nozzle Reference', 'Ref'], ['ref']) or 'Nozzle Ref'
+        supplier_column = find_column(columns, ['Supplier'], ['supplier'])
+        type_column = find_column(columns, ['Type', 'Nozzle Type'], ['type'])
+        orifice_column = find_column(columns, ['Orifice (mm)', 'Orifice Diameter (mm)'], ['orifice', 'diam'])
+        cd_column = find_column(columns, ['Discharge Coefficient', 'Cd'], ['discharge'])
+        angle_column = find_column(columns, ['Spray Angle (deg)', 'Spray Angle'], ['angle'])
+        velocity_column = find_column(columns, ['Max Velocity (m/s)', 'Max Velocity'], ['veloc'])
+
+        self._info: Dict[str, NozzleInfo] = {}
+        for record in records:
+            ref = record.get(ref_column)
+            if not _present(ref) or str(ref) in self._info:
+                continue
+            spec = NozzleSpec(_number(record.get(orifice_column)) or DEFAULT_NOZZLE.diameter_mm,
+                              _number(record.get(cd_column)) or DEFAULT_NOZZLE.discharge_coefficient)
+            max_velocity = _number(record.get(velocity_column))
+            self._info[str(ref)] = NozzleInfo(
+                ref=str(ref),
+                supplier=_text(record.get(supplier_column), "XXXXXX"),
+                type=_text(record.get(type_column), "fixed"),
+                spec=spec,
+                spray_angle=_number(record.get(angle_column)) or 0.0,
+                max_velocity=max_velocity if max_velocity else float('nan'),
+            )
+
+        # Row len(refs) holds the default nozzle, for unknown references
+        infos = list(self._info.values())
+        self._index = {info.ref: i for i, info in enumerate(infos)}
+        self._diameter = np.array([i.spec.diameter_mm for i in infos] + [DEFAULT_NOZZLE.diameter_mm]) * 1e-3
+        self._cd = np.array([i.spec.discharge_coefficient for i in infos] + [DEFAULT_NOZZLE.discharge_coefficient])
+        self._max_velocity = np.array([i.max_velocity for i in infos] + [float('nan')])
+
+    def names(self) -> List[str]:
+        return list(self._info)
+
+    def info(self, ref: str) -> Optional[NozzleInfo]:
+        return self._info.get(ref)
+
+    def spec(self, ref: str) -> NozzleSpec:
+        """Orifice of a reference; the default nozzle when it is not in the catalog"""
+        info = self._info.get(ref)
+        return info.spec if info else DEFAULT_NOZZLE
+
+    def indexes(self, refs: List[str]) -> np.ndarray:
+        default = len(self._index)
+        return np.array([self._index.get(ref, default) for ref in refs], dtype=np.int64)
+
+    # --- Jets ---
+
+    def evaluate(self, refs: List[str], inlet_pressure: np.ndarray, density: np.ndarray,
+                 distance: np.ndarray) -> NozzleState:
+        """
+        Jets of nozzles `refs` at inlet pressures (Pa) in a liquid of
+        `density` (kg/m3), hitting a component `distance` (m) away.
+
+        The orifice gives v0 = Cd sqrt(2p/rho). The jet keeps v0 over its
+        intact length (CORE_DIAMETERS orifice diameters), then its drops
+        slow down under air drag, v = v0 exp(-x / L) with the drag length
+        L = 4/3 (rho / rho_air) d_drop / C_D.
+        """
+        index = self.indexes(refs)
+        diameter, cd = self._diameter[index], self._cd[index]
+        pressure = np.maximum(np.asarray(inlet_pressure, dtype=float), 0.0)
+        density = np.asarray(density, dtype=float)
+        outlet_velocity = cd * np.sqrt(2.0 * pressure / density)
+        flow = outlet_velocity * np.pi * diameter ** 2 / 4.0
+
+        drag_length = 4.0 / 3.0 * (density / AIR_DENSITY) * DROP_DIAMETERS * diameter / DROP_DRAG_COEFFICIENT
+        travel = np.maximum(np.asarray(distance, dtype=float) - CORE_DIAMETERS * diameter, 0.0)
+        impact_velocity = outlet_velocity * np.exp(-travel / drag_length)
+        return NozzleState(flow, outlet_velocity, impact_velocity, outlet_velocity / self._max_velocity[index])
+
+    # --- Configurations ---
+
+    def circuit_specs(self, config_data: Dict[str, Any], circuit_data: Dict[str, Any]) -> Dict[Any, NozzleSpec]:
+        """Orifice of every washing component of a circuit, from its Nozzle Ref"""
+        rows = washing_component_rows(config_data)
+        specs = {}
+        for comp in circuit_data.get('components', []):
+            row = rows.get(comp.get('name')) if comp.get('type') == 'component' else None
+            if row and row.get('Nozzle Ref') in self._info:
+                specs[comp['id']] = self._info[row['Nozzle Ref']].spec
+        return specs
+
+    def evaluate_configuration(self, config_data: Dict[str, Any], results: List[CircuitResult],
+                               fluid_table) -> List[NozzlePerformance]:
+        """Every nozzle of solved circuits (HydraulicSolver.solve_configuration), in one evaluate() call"""
+        rows = washing_component_rows(config_data)
+        entries, refs, pressure, density, distance = [], [], [], [], []
+        for result in results:
+            fluid = fluid_table.properties(result.liquid_name, result.temperature)
+            for output in result.outputs:
+                for nozzle in output.nozzles():
+                    row = rows.get(nozzle.name, {})
+                    entries.append((result.pump_index, output.output, nozzle))
+                    refs.append(str(row.get('Nozzle Ref', '')))
+                    pressure.append(nozzle.inlet_pressure)
+                    density.append(float(fluid.density))
+                    distance.append(_as_float(row.get('D_C_N (mm)'), 0.0) * 1e-3)
+        if not entries:
+            return []
+
+        state = self.evaluate(refs, np.array(pressure), np.array(density), np.array(distance))
+        return [
+            NozzlePerformance(pump_index, output, nozzle.id, nozzle.name, ref, distance[i], pressure[i],
+                              float(state.flow[i]), float(state.outlet_velocity[i]),
+                              float(state.impact_velocity[i]), float(state.velocity_ratio[i]))
+            for i, ((pump_index, output, nozzle), ref) in enumerate(zip(entries, refs))
+        ]
+
+
+def washing_component_rows(config_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Washing Components page rows by component name; circuits refer to components by name"""
+    rows = {}
+    for row in config_data.get('washing_components', []) or []:
+        if isinstance(row, dict) and row.get('Component'):
+            rows.setdefault(row['Component'], row)
+    return rows
+
+
+if __name__ == "__main__":
+    catalog = NozzleCatalog(FALLBACK_NOZZLE_ROWS)
+    count = 10000
+    rng = np.random.default_rng(0)
+    refs = [catalog.names()[i % 3] for i in range(count)]
+    pressure = rng.uniform(50e3, 300e3, count)
+    distance = rng.uniform(0.02, 0.5, count)
+    density = np.full(count, 1000.0)
+
+    start = time.perf_counter()
+    state = catalog.evaluate(refs, pressure, density, distance)
+    batched = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(count):
+        catalog.evaluate(refs[i:i + 1], pressure[i:i + 1], density[i:i + 1], distance[i:i + 1])
+    separate = time.perf_counter() - start
+    print(f"{count} nozzles: one call {batched * 1e3:.2f} ms, one call per nozzle {separate * 1e3:.0f} ms")
+    print(f"{refs[0]} at {pressure[0] / 1000:.0f} kPa: {state.outlet_velocity[0]:.1f} m/s out, "
+          f"{state.impact_velocity[0]:.1f} m/s at {distance[0] * 1000:.0f} mm, "
+          f"{state.flow[0] * 6e4:.3f} L/min, {state.velocity_ratio[0]:.2f} of v max")
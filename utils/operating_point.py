@@ -0,0 +1,240 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.hydraulics import (DEFAULT_LIQUID, CircuitNetwork, HydraulicSolver, NozzleSpec, circuit_entries,
+                              intersect, operating_temperature, operating_voltage)
+from utils.pump_catalog import LITRES_PER_MINUTE
+
+
+class OperatingPoint(NamedTuple):
+    """Where a pump settles on one of its outputs"""
+    pump_index: int
+    pump_name: str
+    output: int
+    voltage: float          # V
+    temperature: float      # °C
+    flow: float             # m3/s
+    pressure: float         # Pa at the pump outlet
+    hydraulic_power: float  # W delivered to the liquid (p * Q)
+
+
+class SystemCurve:
+    """
+    Flow one pump output takes versus pump outlet pressure, sampled on a
+    pressure grid for a range of liquid temperatures. Between sampled
+    temperatures the two neighbouring curves are blended.
+    """
+
+    __slots__ = ("pressure", "temperatures", "flow")
+
+    def __init__(self, pressure: np.ndarray, temperatures: np.ndarray, flow: np.ndarray):
+        self.pressure = pressure          # (samples,) Pa, uniform from 0
+        self.temperatures = temperatures  # (temperatures,) °C, ascending
+        self.flow = flow                  # (temperatures, samples) m3/s
+
+    def at(self, temperature_c: float) -> np.ndarray:
+        """Flow over the pressure grid at one temperature (clamped to the sampled range)"""
+        temperatures = self.temperatures
+        if temperature_c <= temperatures[0]:
+            return self.flow[0]
+        if temperature_c >= temperatures[-1]:
+            return self.flow[-1]
+        upper = int(np.searchsorted(temperatures, temperature_c))
+        weight = (temperature_c - temperatures[upper - 1]) / (temperatures[upper] - temperatures[upper - 1])
+        return (1.0 - weight) * self.flow[upper - 1] + weight * self.flow[upper]
+
+
+class OperatingPointSolver:
+    """
+    Operating point of every pump output at the General Settings voltage.
+
+    The system curve of each output is composed once per liquid over the
+    whole temperature envelope and cached by the output's structural
+    signature, so changing the supply voltage or the liquid temperature
+    only re-intersects cached arrays with the pump curve. Editing a circuit
+    recomputes the curves of the outputs that changed. A voltage whose
+    affinity-scaled shut-off passes the top of the pressure grid widens
+    the grid, which recomposes the curves once.
+    """
+
+    TEMPERATURES = np.linspace(-30.0, 80.0, 12)
+    PRESSURE_SAMPLES = 512
+    # Headroom of the pressure grid over the highest shut-off pressure it has to reach
+    PRESSURE_MARGIN = 1.5
+    CACHE_SIZE = 512
+
+    def __init__(self, hydraulic_solver: HydraulicSolver):
+        self.solver = hydraulic_solver
+        catalog = hydraulic_solver.pump_catalog
+        shutoff = [
+            catalog.pressure(name, max(catalog.voltages(name)), 0.0)
+            for name in catalog.names() if catalog.has_curve(name)
+        ]
+        self.pressure = np.linspace(0.0, max(shutoff, default=5e5) * self.PRESSURE_MARGIN, self.PRESSURE_SAMPLES)
+        self._curves: "OrderedDict[Tuple, SystemCurve]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._warned = set()
+
+    # --- System curves ---
+
+    def pressure_grid(self, shutoff: float) -> np.ndarray:
+        """
+        Pressure grid reaching past a shut-off pressure (Pa). The grid only
+        grows: when `shutoff` is beyond its top it is rebuilt with the
+        usual margin and the curves sampled on the old grid are dropped.
+        """
+        with self._lock:
+            if shutoff >= self.pressure[-1]:
+                self.pressure = np.linspace(0.0, shutoff * self.PRESSURE_MARGIN, self.PRESSURE_SAMPLES)
+                self._curves.clear()
+            return self.pressure
+
+    def system_curves(self, items: List[Tuple[CircuitNetwork, int, Optional[Dict[Any, NozzleSpec]]]],
+                      liquid_name: str, pressure: Optional[np.ndarray] = None) -> List[SystemCurve]:
+        """
+        System curve of each (network, output, nozzles) over the `pressure`
+        grid (the current one by default); missing ones are composed in one batch
+        """
+        pressure = self.pressure if pressure is None else pressure
+        keys, curves, missing = [], [], []
+        for position, (network, output, nozzles) in enumerate(items):
+            order = next(order for number, _, order in network.outputs if number == output)
+            nozzle_key = tuple(nozzles.get(node) for node in order if node in nozzles) if nozzles else ()
+            key = (liquid_name, float(pressure[-1]), nozzle_key, network.output_signature(order))
+            with self._lock:
+                curve = self._curves.get(key)
+                if curve is not None:
+                    self._curves.move_to_end(key)
+            keys.append(key)
+            curves.append(curve)
+            if curve is None:
+                missing.append(position)
+
+        if missing:
+            flow = self.solver.system_flow([items[position] for position in missing], liquid_name,
+                                           self.TEMPERATURES, pressure)
+            for position, family in zip(missing, flow):
+                curve = SystemCurve(pressure, self.TEMPERATURES, family)
+                curves[position] = curve
+                with self._lock:
+                    self._curves[keys[position]] = curve
+                    while len(self._curves) > self.CACHE_SIZE:
+                        self._curves.popitem(last=False)
+        return curves
+
+    # --- Operating points ---
+
+    def operating_points(self, config_data: Dict[str, Any], voltage: Optional[float] = None,
+                         temperature_c: Optional[float] = None) -> List[OperatingPoint]:
+        """
+        Operating point of every output of a MainController configuration.
+        Voltage and temperature default to the General Settings values.
+        """
+        general = config_data.get('general_settings', {}) or {}
+        liquid_name = general.get('liquid_name') or DEFAULT_LIQUID
+        voltage = operating_voltage(general) if voltage is None else voltage
+        temperature_c = operating_temperature(general) if temperature_c is None else temperature_c
+        pumps = config_data.get('pumps', []) or []
+        catalog = self.solver.pump_catalog
+
+        outputs, items = [], []
+        for entry in circuit_entries(config_data):
+            pump_index = entry.get('pump_index', 0)
+            pump_row = pumps[pump_index] if 0 <= pump_index < len(pumps) else {}
+            pump_name = pump_row.get('Pump Name', '')
+            if not catalog.has_curve(pump_name):
+                print(f"No curve for pump '{pump_name}', skipping its operating point")
+                continue
+            circuit = entry.get('circuit', {})
+            network = self.solver.network(circuit)
+            nozzles = self.solver.nozzle_specs(config_data, circuit)
+            for output, *_ in network.outputs:
+                outputs.append((pump_index, pump_name, output))
+                items.append((network, output, nozzles))
+
+        if not items:
+            return []
+        range_warning = self.solver.fluid_table.range_warning(liquid_name, temperature_c)
+        if range_warning and range_warning not in self._warned:
+            self._warned.add(range_warning)
+            print(f"Warning: {range_warning}")
+        # Affinity laws raise the shut-off as (V / V_catalog)^2 above the catalog voltages
+        shutoff = max(float(catalog.pressure(name, voltage, 0.0)) for name in {name for _, name, _ in outputs})
+        pressure = self.pressure_grid(shutoff)
+        curves = self.system_curves(items, liquid_name, pressure)
+        return self._intersect(outputs, curves, voltage, temperature_c, pressure)
+
+    def _intersect(self, outputs: List[Tuple[int, str, int]], curves: List[SystemCurve],
+                   voltage: float, temperature_c: float, pressure: np.ndarray) -> List[OperatingPoint]:
+        """Cheap part: blend the cached curves at the temperature and cross them with the pump curves"""
+        catalog = self.solver.pump_catalog
+        system = np.vstack([curve.at(temperature_c) for curve in curves])
+        pump_curves = {name: catalog.flow(name, voltage, pressure) for name in {name for _, name, _ in outputs}}
+        pump = np.vstack([pump_curves[name] for _, name, _ in outputs])
+        # The pump still out-delivering the system at the top of the grid means the crossing lies beyond it
+        beyond = ~(system >= pump).any(axis=1)
+        for row in np.flatnonzero(beyond):
+            pump_index, pump_name, output = outputs[row]
+            print(f"Warning: pump {pump_index + 1} ({pump_name}) output {output} crosses its system curve above "
+                  f"{pressure[-1] / 1000:.0f} kPa at {voltage:g} V, operating point clipped to the grid")
+        grid = np.broadcast_to(pressure, system.shape)
+        flow, pressure = intersect(grid, system, pump)
+        return [
+            OperatingPoint(pump_index, pump_name, output, voltage, temperature_c,
+                           float(flow[row]), float(pressure[row]), float(flow[row] * pressure[row]))
+            for row, (pump_index, pump_name, output) in enumerate(outputs)
+        ]
+
+    def clear_cache(self):
+        with self._lock:
+            self._curves.clear()
+
+
+if __name__ == "__main__":
+    from utils.fluid_properties import FluidPropertyTable
+    from utils.hydraulics import _synthetic_circuit
+    from utils.pump_catalog import FALLBACK_PUMP_ROWS, PumpCatalog
+
+    solver = HydraulicSolver(FluidPropertyTable([]), PumpCatalog(FALLBACK_PUMP_ROWS))
+    operating = OperatingPointSolver(solver)
+    pump = solver.pump_catalog.names()[0]
+    config = {
+        'general_settings': {'power_voltage': {'value': '12', 'unit': 'V'},
+                             'liquid_temperature': {'value': '20', 'unit': '°C'}},
+        'pumps': [{'Pump Name': pump} for _ in range(20)],
+        'circuits': [{'pump_index': i, 'circuit': _synthetic_circuit(4, 5)} for i in range(20)],
+    }
+    for i, entry in enumerate(config['circuits']):
+        entry['circuit']['connections'][0]['parameters']['length'] = 300.0 + i
+
+    start = time.perf_counter()
+    points = operating.operating_points(config)
+    print(f"{len(points)} outputs, first solve (system curves over {len(operating.TEMPERATURES)} temperatures): "
+          f"{(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    for voltage, temperature in [(13.5, 20.0), (12.0, -25.0), (11.0, 65.0)]:
+        start = time.perf_counter()
+        points = operating.operating_points(config, voltage, temperature)
+        elapsed = time.perf_counter() - start
+        print(f"{voltage} V, {temperature} °C re-intersection: {elapsed * 1e3:.2f} ms, "
+              f"output 1: {points[0].flow / LITRES_PER_MINUTE:.2f} L/min at {points[0].pressure / 1000:.1f} kPa")
+
+    # Blending between sampled temperatures against a direct solve
+    result = solver.solve_circuit(config['circuits'][0]['circuit'], pump, 12.0, DEFAULT_LIQUID, 25.0)
+    point = operating.operating_points(config, 12.0, 25.0)[0]
+    print(f"25 °C: cached curves {point.flow / LITRES_PER_MINUTE:.4f} L/min, "
+          f"full solve {result.outputs[0].flow / LITRES_PER_MINUTE:.4f} L/min")
+
+    # Voltages above the catalog's: the grid must follow the affinity-scaled shut-off
+    small = {'general_settings': {}, 'pumps': [{'Pump Name': pump}],
+             'circuits': [{'pump_index': 0, 'circuit': _synthetic_circuit(1, 1)}]}
+    for voltage in (max(solver.pump_catalog.voltages(pump)), 20.0, 24.0):
+        point = operating.operating_points(small, voltage, 20.0)[0]
+        direct = solver.solve_circuit(small['circuits'][0]['circuit'], pump, voltage, DEFAULT_LIQUID, 20.0).outputs[0]
+        print(f"{voltage:g} V: cached curves {point.flow / LITRES_PER_MINUTE:.3f} L/min at {point.pressure / 1000:.0f} kPa, "
+              f"full solve {direct.flow / LITRES_PER_MINUTE:.3f} L/min at {direct.pressure / 1000:.0f} kPa")
+        assert abs(point.flow - direct.flow) <= 0.01 * direct.flow, "operating point drifts from the direct solve"
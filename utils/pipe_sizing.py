@@ -0,0 +1,425 @@
+import copy
+import itertools
+import os
+import time
+from concurrent.futures import as_completed
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.catalog_columns import find_column
+from utils.friction import pressure_loss
+from utils.hydraulics import (DEFAULT_LIQUID, DEFAULT_NOZZLE, CircuitNetwork, HydraulicSolver, NozzleSpec,
+                              _as_float, circuit_entries, operating_temperature, operating_voltage,
+                              solver_pool, worker_solver)
+
+# Lowest inlet pressure a nozzle is sized for when no target is given
+DEFAULT_MIN_PRESSURE_PA = 50000.0
+
+
+class PipeOption(NamedTuple):
+    """A catalog pipe a connection can be made of"""
+    diameter_mm: float
+    pipe_type: str
+    ref: str
+    price: float            # EUR/m
+
+
+class SizingDesign(NamedTuple):
+    """One point of the Pareto front of a pump output"""
+    pump_index: int
+    output: int
+    cost: float             # EUR of pipe
+    length: float           # m of pipe
+    loss: float             # Pa the pump must deliver above the nozzle target, at design flows
+    pipes: Dict[int, PipeOption]    # connection index in the circuit -> pipe
+    margin: float           # Pa, lowest nozzle pressure above its target at the real operating point
+    feasible: bool
+
+    def apply(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of the circuit with this design's pipes on its connections"""
+        circuit = copy.deepcopy(circuit_data)
+        for index, option in self.pipes.items():
+            parameters = circuit['connections'][index].setdefault('parameters', {})
+            parameters.update({'diameter': option.diameter_mm, 'type': option.pipe_type,
+                               'ref_number': option.ref})
+        return circuit
+
+
+class SizingResult(NamedTuple):
+    fronts: Dict[Tuple[int, int], List[SizingDesign]]   # (pump_index, output) -> designs by cost
+    combinations: float     # designs a full Cartesian product would have evaluated
+    evaluated: int          # partial designs actually built
+    elapsed: float          # s
+
+
+def pipe_options(records: List[Dict[str, Any]]) -> List[PipeOption]:
+    """
+    Cheapest catalog pipe of every diameter, by ascending diameter. Only the
+    bore changes the hydraulics, so a dearer pipe of the same diameter can
+    never be on a Pareto front. Without a price column every pipe costs
+    its diameter in mm per metre, a stand-in for material.
+    """
+    columns = list(records[0].keys()) if records else []
+    type_column = find_column(columns, ['Pipe Type'], ['type']) or 'Pipe Type'
+    diameter_column = find_column(columns, ['Diam. (mm)', 'Diameter (mm)'], ['diam']) or 'Diam. (mm)'
+    ref_column = find_column(columns, ['Pipe Ref'], ['ref'])
+    price_column = find_column(columns, ['Price (EUR/m)', 'Cost (EUR/m)'], ['price', 'cost'])
+
+    cheapest: Dict[float, PipeOption] = {}
+    for record in records:
+        diameter = _as_float(record.get(diameter_column), 0.0)
+        if diameter <= 0:
+            continue
+        price = _as_float(record.get(price_column), diameter) if price_column else diameter
+        if diameter not in cheapest or price < cheapest[diameter].price:
+            cheapest[diameter] = PipeOption(diameter, str(record.get(type_column, '')),
+                                            str(record.get(ref_column, '') if ref_column else ''), price)
+    return [cheapest[diameter] for diameter in sorted(cheapest)]
+
+
+class _Front:
+    """Pareto points (cost, required pressure) of a subtree and the option chosen per connection"""
+
+    __slots__ = ("cost", "required", "choices", "columns")
+
+    def __init__(self, cost: np.ndarray, required: np.ndarray, choices: np.ndarray, columns: List[int]):
+        self.cost = cost
+        self.required = required
+        self.choices = choices      # (points, len(columns)) option indexes
+        self.columns = columns      # connection indexes
+
+    def pruned(self, limit: float) -> "_Front":
+        """Drop points needing more than `limit` and points another point beats on both axes"""
+        keep = np.flatnonzero(self.required <= limit)
+        # Costs are sums of floats: round so equal designs tie instead of shadowing each other
+        order = keep[np.lexsort((self.required[keep], np.round(self.cost[keep], 9)))]
+        required = self.required[order]
+        best = np.minimum.accumulate(required)
+        order = order[required <= np.concatenate([[np.inf], best[:-1]]) - 1e-9]
+        return _Front(self.cost[order], self.required[order], self.choices[order], self.columns)
+
+
+def _combine(fronts: List[_Front], limit: float) -> Tuple[_Front, int]:
+    """Branches of a junction: costs add, the junction needs the highest branch requirement"""
+    combined, built = fronts[0], 0
+    for front in fronts[1:]:
+        left = np.repeat(np.arange(len(combined.cost)), len(front.cost))
+        right = np.tile(np.arange(len(front.cost)), len(combined.cost))
+        built += len(left)
+        combined = _Front(combined.cost[left] + front.cost[right],
+                          np.maximum(combined.required[left], front.required[right]),
+                          np.hstack([combined.choices[left], front.choices[right]]),
+                          combined.columns + front.columns).pruned(limit)
+    return combined, built
+
+
+class PipeSizer:
+    """
+    Catalog-wide pipe sizing of the saved circuits.
+
+    Each output is sized for its design flows, every nozzle at its target
+    pressure. With the flows fixed each pipe's loss depends only on its
+    own diameter, so the search runs up the tree from the nozzles keeping,
+    per subtree, only the Pareto front of (pipe cost, pressure needed at
+    its inlet). A point needing more than the pump delivers at the design
+    flow is dropped as soon as it appears, since requirements only grow
+    towards the pump. The front of every output is then checked with the
+    full solver at the real operating point. Pump circuits are sized in
+    parallel on a solver pool.
+    """
+
+    def __init__(self, hydraulic_solver: HydraulicSolver, options: List[PipeOption],
+                 min_pressure: float = DEFAULT_MIN_PRESSURE_PA, targets: Optional[Dict[str, float]] = None,
+                 workers: Optional[int] = None):
+        self.solver = hydraulic_solver
+        self.options = options
+        self.min_pressure = min_pressure
+        self.targets = targets or {}
+        self.workers = workers
+
+    @classmethod
+    def from_data_manager(cls, data_manager, hydraulic_solver: HydraulicSolver, **options) -> "PipeSizer":
+        return cls(hydraulic_solver, pipe_options(data_manager.get_pipe_index().find()), **options)
+
+    def size_configuration(self, config_data: Dict[str, Any]) -> SizingResult:
+        """Pareto front of every pump output of a MainController configuration"""
+        start = time.perf_counter()
+        general = config_data.get('general_settings', {}) or {}
+        pumps = config_data.get('pumps', []) or []
+        jobs = []
+        for entry in circuit_entries(config_data):
+            pump_index = entry.get('pump_index', 0)
+            pump_row = pumps[pump_index] if 0 <= pump_index < len(pumps) else {}
+            circuit = entry.get('circuit', {})
+            jobs.append((pump_index, circuit, pump_row.get('Pump Name', ''),
+                         operating_voltage(general), general.get('liquid_name') or DEFAULT_LIQUID,
+                         operating_temperature(general), self.options, self.min_pressure, self.targets,
+                         self.solver.nozzle_specs(config_data, circuit)))
+
+        outcomes = []
+        workers = min(self.workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            outcomes = [size_circuit(self.solver, *job) for job in jobs]
+        else:
+            with solver_pool(self.solver, workers) as pool:
+                futures = [pool.submit(_run_circuit, job) for job in jobs]
+                outcomes = [future.result() for future in as_completed(futures)]
+
+        fronts, combinations, evaluated = {}, 0.0, 0
+        for designs, circuit_combinations, circuit_evaluated in outcomes:
+            fronts.update(designs)
+            combinations += circuit_combinations
+            evaluated += circuit_evaluated
+        return SizingResult(dict(sorted(fronts.items())), combinations, evaluated, time.perf_counter() - start)
+
+
+def _run_circuit(job: Tuple) -> Tuple[Dict[Tuple[int, int], List[SizingDesign]], float, int]:
+    """Module level so process pools can pickle it"""
+    return size_circuit(worker_solver(), *job)
+
+
+def size_circuit(solver: HydraulicSolver, pump_index: int, circuit: Dict[str, Any], pump_name: str,
+                 voltage: float, liquid_name: str, temperature: float, options: List[PipeOption],
+                 min_pressure: float, targets: Dict[str, float],
+                 nozzles: Optional[Dict[Any, NozzleSpec]] = None
+                 ) -> Tuple[Dict[Tuple[int, int], List[SizingDesign]], float, int]:
+    """Fronts of the outputs of one circuit, the Cartesian product size and the partial designs built"""
+    network = solver.network(circuit)
+    nozzles = nozzles or {}
+    if not options or not solver.pump_catalog.has_curve(pump_name):
+        return {}, 0.0, 0
+
+    fluid = solver.fluid_table.properties(liquid_name, temperature)
+    density, viscosity = float(fluid.density), float(fluid.dynamic_viscosity)
+    diameter = np.array([option.diameter_mm for option in options]) * 1e-3
+    price = np.array([option.price for option in options])
+    radius = np.array([
+        _as_float(connection.get('parameters', {}).get('bend_radius'), 0.0)
+        if connection.get('parameters', {}).get('inclination') == 'bent' else 0.0
+        for connection in network.connections
+    ])
+    # Bend K of every connection in every catalog diameter (r/D changes with the bore)
+    bend_k = np.atleast_2d(solver.bend_table.coefficient(radius[:, None], diameter[None, :] * 1e3))
+    bend_k = np.broadcast_to(bend_k, (len(network.connections), len(options)))
+
+    fronts, combinations, evaluated = {}, 0.0, 0
+    for output, first, order in network.outputs:
+        connections, target, loss = _design_losses(solver, network, order, diameter, bend_k, density, viscosity,
+                                                   min_pressure, targets, nozzles)
+        available = solver.pump_catalog.pressure(pump_name, voltage, _design_flow(network, order, target,
+                                                                                  density, nozzles)[first])
+        row = {index: i for i, index in enumerate(connections)}
+
+        subtree: Dict[int, _Front] = {}
+        for node in reversed(order):
+            index = network.parent[node]
+            if network.node_type(node) == 'component':
+                below = _Front(np.zeros(1), np.array([target[node]]), np.zeros((1, 0), dtype=np.int64), [])
+            else:
+                children = [subtree.pop(child) for child in network.children.get(node, []) if child in subtree]
+                if not children:
+                    below = _Front(np.zeros(1), np.zeros(1), np.zeros((1, 0), dtype=np.int64), [])
+                else:
+                    below, built = _combine(children, available)
+                    evaluated += built
+            points = len(below.cost)
+            option = np.tile(np.arange(len(options)), points)
+            parent = np.repeat(np.arange(points), len(options))
+            evaluated += len(option)
+            subtree[index] = _Front(
+                below.cost[parent] + price[option] * network.length[index],
+                below.required[parent] + loss[row[index], option],
+                np.hstack([below.choices[parent], option[:, None]]),
+                below.columns + [index]
+            ).pruned(available)
+
+        combinations += float(len(options)) ** len(connections)
+        front = subtree[first]
+        fronts[output] = (front, target, float(network.length[connections].sum()),
+                          _governing_target(network, target, loss, row, front))
+
+    designs = _verify(solver, network, pump_index, pump_name, voltage, liquid_name, temperature, fronts,
+                      options, bend_k, nozzles)
+    return designs, combinations, evaluated
+
+
+def _design_flow(network: CircuitNetwork, order: List[Any], target: Dict[Any, float], density: float,
+                 nozzles: Dict[Any, NozzleSpec]) -> Dict[int, float]:
+    """Flow of every connection of an output with the nozzles downstream of it at their targets"""
+    flow = {}
+    for node in reversed(order):
+        index = network.parent[node]
+        if network.node_type(node) == 'component':
+            spec = nozzles.get(node, DEFAULT_NOZZLE)
+            flow[index] = spec.discharge_coefficient * spec.area * np.sqrt(2.0 * target[node] / density)
+        else:
+            flow[index] = sum(flow[child] for child in network.children.get(node, []))
+    return flow
+
+
+def _design_losses(solver: HydraulicSolver, network: CircuitNetwork, order: List[Any], diameter: np.ndarray,
+                   bend_k: np.ndarray, density: float, viscosity: float, min_pressure: float,
+                   targets: Dict[str, float], nozzles: Dict[Any, NozzleSpec]
+                   ) -> Tuple[List[int], Dict[Any, float], np.ndarray]:
+    """
+    Connections of an output, nozzle targets, and the loss (Pa) of every
+    connection in every catalog bore at the design flows: friction and
+    bend in the pipe plus the connector it feeds.
+    """
+    target = {node: targets.get(network.node_name(node), min_pressure)
+              for node in order if network.node_type(node) == 'component'}
+    flow = _design_flow(network, order, target, density, nozzles)
+    connections = [network.parent[node] for node in order]
+    q = np.array([flow[index] for index in connections])[:, None]
+    length = network.length[connections][:, None]
+    local_k = np.array([solver.connector_k.get(network.node_type(node), 0.0) for node in order])[:, None]
+    velocity = q / (np.pi * diameter[None, :] ** 2 / 4.0)
+    loss = pressure_loss(q, diameter[None, :], length, density, viscosity, solver.roughness_m,
+                         bend_k[connections], solver.friction_method) + local_k * 0.5 * density * velocity ** 2
+    return connections, target, loss
+
+
+def _governing_target(network: CircuitNetwork, target: Dict[Any, float], loss: np.ndarray,
+                      row: Dict[int, int], front: _Front) -> np.ndarray:
+    """
+    Per design, the target of the nozzle that sets its required pressure:
+    the one with the largest target plus loss along its path from the pump.
+    """
+    if not target or not len(front.cost):
+        return np.zeros(len(front.cost))
+    column = {index: i for i, index in enumerate(front.columns)}
+    chosen = loss[np.array([row[index] for index in front.columns])[None, :], front.choices]
+    nozzles, demand = list(target), []
+    for node in nozzles:
+        path, index = [], network.parent[node]
+        while index >= 0:
+            path.append(column[index])
+            index = network.feeding[index]
+        demand.append(target[node] + chosen[:, path].sum(axis=1))
+    governing = np.argmax(np.array(demand), axis=0)
+    return np.array([target[node] for node in nozzles])[governing]
+
+
+def _verify(solver: HydraulicSolver, network: CircuitNetwork, pump_index: int, pump_name: str, voltage: float,
+            liquid_name: str, temperature: float,
+            fronts: Dict[int, Tuple[_Front, Dict[Any, float], float, np.ndarray]],
+            options: List[PipeOption], bend_k: np.ndarray,
+            nozzles: Dict[Any, NozzleSpec]) -> Dict[Tuple[int, int], List[SizingDesign]]:
+    """
+    Solve every design at the real operating point. Outputs are solved
+    independently, so variant v carries design v of every output's front
+    and one batch covers the whole circuit.
+    """
+    variants = max((len(front.cost) for front, _, _, _ in fronts.values()), default=0)
+    if not variants:
+        return {(pump_index, output): [] for output in fronts}
+    diameter = np.array([option.diameter_mm for option in options]) * 1e-3
+    diameter_scale = np.ones((variants, len(network.connections)))
+    variant_bend_k = np.tile(network.bend_k, (variants, 1))
+    for front, _, _, _ in fronts.values():
+        if not len(front.cost):
+            continue
+        # Shorter fronts repeat their last design
+        pick = np.minimum(np.arange(variants), len(front.cost) - 1)
+        columns = np.asarray(front.columns)
+        diameter_scale[:, columns] = diameter[front.choices[pick]] / network.diameter[columns]
+        variant_bend_k[:, columns] = bend_k[columns[None, :], front.choices[pick]]
+    solved = {result.output: result for result in solver.solve_variants(
+        network, pump_name, voltage, liquid_name, np.full(variants, temperature),
+        diameter_scale=diameter_scale, nozzles=nozzles, bend_k=variant_bend_k)}
+
+    designs = {}
+    for output, (front, target, length, governing) in fronts.items():
+        order = next(order for number, _, order in network.outputs if number == output)
+        nozzle_targets = np.array([target[node] for node in order if network.node_type(node) == 'component'])
+        count = len(front.cost)
+        if len(nozzle_targets):
+            margin = (solved[output].nozzle_pressure[:count] - nozzle_targets[None, :]).min(axis=1)
+        else:
+            margin = np.zeros(count)
+        designs[(pump_index, output)] = [
+            SizingDesign(pump_index, output, float(front.cost[d]), length, float(front.required[d] - governing[d]),
+                         {int(index): options[int(choice)] for index, choice in zip(front.columns, front.choices[d])},
+                         float(margin[d]), bool(margin[d] >= 0.0))
+            for d in range(count)
+        ]
+    return designs
+
+
+if __name__ == "__main__":
+    from utils.fluid_properties import FluidPropertyTable
+    from utils.hydraulics import _synthetic_circuit
+    from utils.pump_catalog import FALLBACK_PUMP_ROWS, PumpCatalog
+
+    solver = HydraulicSolver(FluidPropertyTable([]), PumpCatalog(FALLBACK_PUMP_ROWS))
+    pump = solver.pump_catalog.names()[0]
+    rng = np.random.default_rng(0)
+    diameters = rng.choice(range(3, 11), 20000)
+    records = [{'Pipe Type': rng.choice(['PVC', 'PA12', 'TPE', 'Silicone']), 'Diam. (mm)': float(d),
+                'Pipe Ref': f"P-{i:05d}", 'Price (EUR/m)': round(float(0.3 * d * rng.uniform(0.8, 2.0)), 2)}
+               for i, d in enumerate(diameters)]
+    start = time.perf_counter()
+    options = pipe_options(records)
+    print(f"{len(records)} catalog pipes -> {len(options)} distinct bores ({(time.perf_counter() - start) * 1e3:.1f} ms)")
+
+    for pumps, branches, depth in [(1, 2, 2), (3, 3, 3), (5, 4, 4)]:
+        config = {
+            'general_settings': {},
+            'pumps': [{'Pump Name': pump} for _ in range(pumps)],
+            'circuits': [{'pump_index': i, 'circuit': _synthetic_circuit(branches, depth)} for i in range(pumps)],
+        }
+        sizer = PipeSizer(solver, options, workers=1)
+        result = sizer.size_configuration(config)
+        front = result.fronts[(0, 1)]
+        feasible = sum(design.feasible for design in front)
+        print(f"{pumps} pump(s), {len(front[0].pipes)} pipes per output: {result.elapsed * 1e3:.0f} ms, "
+              f"{result.evaluated} partial designs vs {result.combinations:.1e} combinations, "
+              f"front of output 1: {len(front)} designs ({feasible} feasible at the operating point), "
+              f"{front[0].cost:.2f}-{front[-1].cost:.2f} EUR, {front[-1].loss / 1000:.1f}-{front[0].loss / 1000:.1f} kPa")
+
+    # Exactness on a small output: the front equals the Pareto set of the full product, and each
+    # design's loss is measured from the target of the nozzle that sets its required pressure
+    circuit, subset = _synthetic_circuit(2, 2), options[:5]
+    network = solver.network(circuit)
+    fluid = solver.fluid_table.properties(DEFAULT_LIQUID, 20.0)
+    diameter = np.array([option.diameter_mm for option in subset]) * 1e-3
+    bend_k = np.broadcast_to(solver.bend_table.coefficient(20.0, diameter * 1e3), (len(network.connections), 5))
+    _, first, order = network.outputs[0]
+    nozzle = next(node for node in order if network.node_type(node) == 'component')
+    for targets in [{}, {network.node_name(nozzle): 3.0 * DEFAULT_MIN_PRESSURE_PA}]:
+        connections, target, loss = _design_losses(solver, network, order, diameter, bend_k, fluid.density,
+                                                   fluid.dynamic_viscosity, DEFAULT_MIN_PRESSURE_PA, targets, {})
+        row = {index: i for i, index in enumerate(connections)}
+        paths = []
+        for node in target:
+            path, index = [], network.parent[node]
+            while index >= 0:
+                path.append(row[index])
+                index = network.feeding[index]
+            paths.append((target[node], path))
+
+        start = time.perf_counter()
+        choice = np.array(list(itertools.product(range(5), repeat=len(connections))))
+        chosen = loss[np.arange(len(connections))[None, :], choice]
+        demand = np.array([t + chosen[:, path].sum(axis=1) for t, path in paths])
+        required = demand.max(axis=0)
+        above = required - np.array([t for t, _ in paths])[demand.argmax(axis=0)]
+        cost = (np.array([o.price for o in subset])[choice] * network.length[connections][None, :]).sum(axis=1)
+        reference = _Front(cost, required, choice, connections).pruned(np.inf)
+        brute = time.perf_counter() - start
+        start = time.perf_counter()
+        fronts, _, evaluated = size_circuit(solver, 0, circuit, pump, 12.0, DEFAULT_LIQUID, 20.0, subset,
+                                            DEFAULT_MIN_PRESSURE_PA, targets)
+        search = time.perf_counter() - start
+        front = fronts[(0, 1)]
+        available = solver.pump_catalog.pressure(pump, 12.0, _design_flow(network, order, target,
+                                                                          fluid.density, {})[first])
+        by_choice = {tuple(c): a for c, a in zip(choice, above)}
+        found = sorted((round(d.cost, 9), round(d.loss, 3)) for d in front)
+        expected = sorted((round(c, 9), round(by_choice[tuple(picked)], 3))
+                          for c, r, picked in zip(reference.cost, reference.required, reference.choices)
+                          if r <= available)
+        assert found == expected, (targets, found[:3], expected[:3])
+        print(f"targets {targets or 'default'}: {len(choice)} combinations in {brute * 1e3:.0f} ms vs "
+              f"{evaluated} partial designs in {search * 1e3:.0f} ms: fronts match ({len(found)} designs)")
@@ -0,0 +1,244 @@
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.catalog_columns import find_column
+
+Array = Union[float, np.ndarray]
+
+# Catalog units to SI
+LITRES_PER_MINUTE = 1.0 / 60000.0   # m3/s
+KILOPASCAL = 1000.0                 # Pa
+BAR = 100000.0                      # Pa
+
+
+def _nominal_curve(name: str, category: str, ref: str, supplier: str, outputs: int,
+                   shutoff_kpa: float, max_flow_lpm: float) -> List[Dict[str, Any]]:
+    """Long-format rows of a generic washer pump, scaled to 13.5 V by the affinity laws"""
+    rows = []
+    for voltage in (12.0, 13.5):
+        speed = voltage / 12.0
+        for fraction in np.linspace(0.0, 1.0, 6):
+            rows.append({
+                'Pump Name': name, 'Pump Category': category, 'Pump Ref': ref,
+                'Supplier': supplier, 'Number of output': outputs, 'Voltage (V)': voltage,
+                'Flow (L/min)': round(float(fraction * max_flow_lpm * speed), 4),
+                'Pressure (kPa)': round(float(shutoff_kpa * (1.0 - fraction ** 2) * speed ** 2), 4),
+            })
+    return rows
+
+
+# Used when pumps_catalog.xlsx is missing: the pumps the dialog used to hard-code
+FALLBACK_PUMP_ROWS = (
+    _nominal_curve("AWEKL 123133112 DE", "Category A", "123-133-112", "Bosch DE", 2, 300.0, 5.0) +
+    _nominal_curve("BWEKL 456789123 FR", "Category B", "456-789-123", "Valeo FR", 1, 250.0, 4.0) +
+    _nominal_curve("CWEKL 789456123 UK", "Category C", "789-456-123", "Dyson UK", 2, 350.0, 6.0)
+)
+
+
+class PumpInfo(NamedTuple):
+    """Catalog identity of a pump"""
+    name: str
+    category: str
+    ref: str
+    supplier: str
+    outputs: int
+
+
+class PumpCatalog:
+    """
+    Pump identities plus their flow/pressure curves per supply voltage.
+
+    The catalog is in long format, one row per curve point ('Pump Name',
+    'Voltage (V)', 'Flow (L/min)', 'Pressure (kPa)' or a head/bar column).
+    All curves are stored in two contiguous float64 arrays (flow in m3/s,
+    pressure in Pa, flow ascending) addressed by per-curve offsets. Between
+    catalog voltages the two bracketing curves are blended; outside them the
+    nearest curve is scaled with the pump affinity laws (Q ~ V, p ~ V^2).
+    """
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._info: Dict[str, PumpInfo] = {}
+        self._names_by_category: Dict[str, List[str]] = {}
+        self._voltages: Dict[str, np.ndarray] = {}
+        self._curve_ids: Dict[Tuple[str, float], int] = {}
+
+        columns = list(records[0].keys()) if records else []
+        name_column = find_column(columns, ['Pump Name'], ['name']) or 'Pump Name'
+        category_column = find_column(columns, ['Pump Category', 'Category'], ['categ'])
+        ref_column = find_column(columns, ['Pump Ref', 'Ref'], ['ref'])
+        supplier_column = find_column(columns, ['Supplier'], ['supplier'])
+        outputs_column = find_column(columns, ['Number of output', 'Outputs'], ['output'])
+        voltage_column = find_column(columns, ['Voltage (V)', 'Voltage'], ['volt'])
+        flow_column = find_column(columns, ['Flow (L/min)', 'Flow'], ['flow'])
+        pressure_column, pressure_scale = self._pressure_column(columns)
+
+        points: Dict[Tuple[str, float], List[Tuple[float, float]]] = {}
+        for record in records:
+            name = record.get(name_column)
+            if not _present(name):
+                continue
+            name = str(name)
+            if name not in self._info:
+                self._info[name] = PumpInfo(
+                    name=name,
+                    category=_text(record.get(category_column), "Uncategorized"),
+                    ref=_text(record.get(ref_column), "xxx-xxx-xxx"),
+                    supplier=_text(record.get(supplier_column), "XXXXXXX"),
+                    outputs=int(_number(record.get(outputs_column)) or 1)
+                )
+                self._names_by_category.setdefault(self._info[name].category, []).append(name)
+
+            voltage = _number(record.get(voltage_column))
+            flow = _number(record.get(flow_column))
+            pressure = _number(record.get(pressure_column))
+            if voltage is None or flow is None or pressure is None:
+                continue
+            points.setdefault((name, voltage), []).append(
+                (flow * LITRES_PER_MINUTE, pressure * pressure_scale)
+            )
+
+        flows, pressures, offsets = [], [], [0]
+        for key, curve in points.items():
+            curve.sort()
+            flows.extend(q for q, _ in curve)
+            pressures.extend(p for _, p in curve)
+            offsets.append(len(flows))
+            self._curve_ids[key] = len(offsets) - 2
+        self._flow = np.asarray(flows, dtype=float)
+        self._pressure = np.asarray(pressures, dtype=float)
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+
+        for name, voltage in self._curve_ids:
+            self._voltages.setdefault(name, []).append(voltage)
+        self._voltages = {name: np.array(sorted(v)) for name, v in self._voltages.items()}
+
+    @staticmethod
+    def _pressure_column(columns: List[str]) -> Tuple[Optional[str], float]:
+        """Pressure column and its factor to Pa (kPa, bar, or head in metres of water)"""
+        column = find_column(columns, ['Pressure (kPa)', 'Pressure (bar)', 'Head (m)'], ['pressure', 'head'])
+        if column is None:
+            return None, KILOPASCAL
+        lowered = column.lower()
+        if 'bar' in lowered:
+            return column, BAR
+        if 'head' in lowered or '(m)' in lowered:
+            return column, 998.2 * 9.81
+        if '(pa)' in lowered:
+            return column, 1.0
+        return column, KILOPASCAL
+
+    # --- Identity lookups ---
+
+    def __len__(self) -> int:
+        return len(self._info)
+
+    def categories(self) -> List[str]:
+        return list(self._names_by_category)
+
+    def names(self, category: Optional[str] = None) -> List[str]:
+        """Pump names, optionally only those of one category"""
+        if category is None:
+            return list(self._info)
+        return list(self._names_by_category.get(category, []))
+
+    def info(self, name: str) -> Optional[PumpInfo]:
+        return self._info.get(name)
+
+    def voltages(self, name: str) -> List[float]:
+        """Supply voltages the catalog has a curve for"""
+        return self._voltages.get(name, np.array([])).tolist()
+
+    def has_curve(self, name: str) -> bool:
+        return name in self._voltages
+
+    # --- Curves ---
+
+    def _curve_arrays(self, name: str, voltage: float) -> Tuple[np.ndarray, np.ndarray]:
+        curve_id = self._curve_ids[(name, voltage)]
+        start, end = self._offsets[curve_id], self._offsets[curve_id + 1]
+        return self._flow[start:end], self._pressure[start:end]
+
+    @staticmethod
+    def _evaluate(flow_points: np.ndarray, pressure_points: np.ndarray, flow: Array) -> Array:
+        """Pressure on one curve; past the last point the final slope is extended"""
+        pressure = np.interp(flow, flow_points, pressure_points)
+        if len(flow_points) > 1:
+            slope = (pressure_points[-1] - pressure_points[-2]) / max(flow_points[-1] - flow_points[-2], 1e-12)
+            pressure = np.where(flow > flow_points[-1], pressure_points[-1] + slope * (flow - flow_points[-1]), pressure)
+        return pressure
+
+    def _bracket(self, name: str, voltage: float):
+        """Catalog voltages around the requested one and the blend weight of the upper one"""
+        voltages = self._voltages.get(name)
+        if voltages is None or not len(voltages):
+            raise KeyError(f"No pump curve for '{name}'")
+        if voltage <= voltages[0]:
+            return voltages[0], voltages[0], 0.0
+        if voltage >= voltages[-1]:
+            return voltages[-1], voltages[-1], 0.0
+        upper = int(np.searchsorted(voltages, voltage))
+        low, high = voltages[upper - 1], voltages[upper]
+        return low, high, (voltage - low) / (high - low)
+
+    def pressure(self, name: str, voltage: float, flow: Array) -> Array:
+        """Pressure (Pa) delivered by a pump at a supply voltage for scalar or array flows (m3/s)"""
+        flow = np.asarray(flow, dtype=float)
+        low, high, weight = self._bracket(name, voltage)
+        if low == high:
+            # Affinity laws around the nearest catalog curve
+            speed = voltage / low if low > 0 else 1.0
+            flow_points, pressure_points = self._curve_arrays(name, low)
+            result = self._evaluate(flow_points, pressure_points, flow / speed) * speed ** 2
+        else:
+            result = ((1.0 - weight) * self._evaluate(*self._curve_arrays(name, low), flow) +
+                      weight * self._evaluate(*self._curve_arrays(name, high), flow))
+        return float(result) if result.ndim == 0 else result
+
+    def curve(self, name: str, voltage: float, samples: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        """(flow m3/s, pressure Pa) samples from shut-off to zero pressure, e.g. for plotting"""
+        low, high, _ = self._bracket(name, voltage)
+        speed = voltage / high if low == high and high > 0 else 1.0
+        max_flow = self._curve_arrays(name, high)[0][-1] * max(speed, 1.0)
+        flow = np.linspace(0.0, max_flow, samples)
+        return flow, np.maximum(self.pressure(name, voltage, flow), 0.0)
+
+    def flow(self, name: str, voltage: float, pressure: Array, samples: int = 200) -> Array:
+        """Inverse curve: flow (m3/s) at scalar or array pressures (Pa), 0 above shut-off"""
+        flow_grid, pressure_grid = self.curve(name, voltage, samples)
+        # Pump curves fall with flow, np.interp needs ascending x
+        result = np.interp(pressure, pressure_grid[::-1], flow_grid[::-1], left=flow_grid[-1], right=0.0)
+        return float(result) if np.ndim(result) == 0 else result
+
+
+def _present(value: Any) -> bool:
+    return value is not None and value == value and str(value).strip() != ""
+
+
+def _text(value: Any, default: str) -> str:
+    return str(value) if _present(value) else default
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None
+
+
+if __name__ == "__main__":
+    catalog = PumpCatalog(FALLBACK_PUMP_ROWS)
+    name = catalog.names()[0]
+    print(f"{len(catalog)} pumps, curves of '{name}' at {catalog.voltages(name)} V")
+
+    flows = np.linspace(0.0, 6.0, 100_000) * LITRES_PER_MINUTE
+    start = time.perf_counter()
+    catalog.pressure(name, 12.8, flows)
+    print(f"100k flow points at 12.8 V: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        catalog.pressure(name, 12.8, 2.0 * LITRES_PER_MINUTE)
+    print(f"Scalar lookup: {(time.perf_counter() - start) / 10_000 * 1e6:.1f} us")
@@ -0,0 +1,124 @@
+import bisect
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """
+    Type-ahead index over the distinct values of one catalog column.
+
+    Prefix matches come from a sorted list of every normalized word suffix
+    of a value ("Front bumper" is reachable from "fr" and "bu"); longer
+    queries that match in the middle of a word fall back to a trigram index.
+    Results are ranked: whole-value prefix, word prefix, then substring.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        self.values: List[str] = []
+        seen = set()
+        for value in values:
+            if value is None or value != value:  # Skip empty and NaN cells
+                continue
+            value = str(value)
+            if value and value not in seen:
+                seen.add(value)
+                self.values.append(value)
+
+        self._normalized = [_normalize(value) for value in self.values]
+
+        # Whole values and (word suffix, value id) pairs, sorted for bisect prefix lookups
+        whole = sorted((text, value_id) for value_id, text in enumerate(self._normalized))
+        self._whole_keys = [key for key, _ in whole]
+        self._whole_ids = [value_id for _, value_id in whole]
+
+        keys = []
+        for value_id, text in enumerate(self._normalized):
+            words = text.split(" ")
+            for position in range(len(words)):
+                keys.append((" ".join(words[position:]), value_id))
+        keys.sort()
+        self._prefix_keys = [key for key, _ in keys]
+        self._prefix_ids = [value_id for _, value_id in keys]
+
+        self._trigram_ids: Dict[str, Set[int]] = {}
+        for value_id, text in enumerate(self._normalized):
+            for gram in _trigrams(text):
+                self._trigram_ids.setdefault(gram, set()).add(value_id)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], ids: List[int], query: str) -> List[int]:
+        start = bisect.bisect_left(keys, query)
+        # Every key starting with query sorts before query + the highest code point
+        end = bisect.bisect_left(keys, query + "\U0010ffff", lo=start)
+        return ids[start:end]
+
+    def _substring_matches(self, query: str) -> List[int]:
+        grams = sorted(_trigrams(query), key=lambda gram: len(self._trigram_ids.get(gram, ())))
+        if not grams:
+            return []
+        candidates = set(self._trigram_ids.get(grams[0], ()))
+        for gram in grams[1:]:
+            candidates &= self._trigram_ids.get(gram, set())
+            if not candidates:
+                return []
+        return [value_id for value_id in sorted(candidates) if query in self._normalized[value_id]]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Values matching the query, best matches first; an empty query returns everything"""
+        query = _normalize(query)
+        if not query:
+            return self.values[:limit] if limit is not None else list(self.values)
+
+        ranked: List[int] = []
+        seen: Set[int] = set()
+
+        def add(value_ids) -> bool:
+            """Append unseen ids; True once the limit is reached"""
+            for value_id in value_ids:
+                if value_id not in seen:
+                    seen.add(value_id)
+                    ranked.append(value_id)
+                    if limit is not None and len(ranked) >= limit:
+                        return True
+            return False
+
+        full = (add(self._prefix_range(self._whole_keys, self._whole_ids, query)) or
+                add(self._prefix_range(self._prefix_keys, self._prefix_ids, query)))
+        if not full and len(query) >= 3:
+            add(self._substring_matches(query))
+
+        return [self.values[value_id] for value_id in ranked]
+
+
+if __name__ == "__main__":
+    # Throughput on a synthetic catalog of 50k component names
+    parts = ["Front", "Rear", "Left", "Right", "Upper", "Lower"]
+    kinds = ["camera", "lidar", "radar", "windshield", "headlamp", "sensor"]
+    names = [f"{parts[i % 6]} {kinds[(i // 6) % 6]} {i:05d}" for i in range(50_000)]
+
+    start = time.perf_counter()
+    index = SearchIndex(names)
+    print(f"Built index over {len(index)} values in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    for query in ["fr", "lidar", "dar 12", "04999"]:
+        start = time.perf_counter()
+        for _ in range(100):
+            results = index.search(query, limit=50)
+        indexed = (time.perf_counter() - start) / 100
+
+        start = time.perf_counter()
+        for _ in range(10):
+            scanned = [name for name in names if query in name.lower()][:50]
+        linear = (time.perf_counter() - start) / 10
+        print(f"{query!r:<10} {len(results):>3} hits  index {indexed * 1e3:7.3f} ms  scan {linear * 1e3:7.3f} ms")
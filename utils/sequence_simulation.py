@@ -0,0 +1,244 @@
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.hydraulics import CircuitResult, HydraulicSolver, _as_float
+from utils.pump_catalog import LITRES_PER_MINUTE
+
+# Time for a washer pump to reach speed after it is switched on. Dual-outlet
+# pumps select their outlet by reversing, so every output window restarts it.
+DEFAULT_SPIN_UP_S = 0.15
+DEFAULT_TIME_STEP_S = 1e-3
+LITRE = 1e-3  # m3
+
+
+class OutputWindow(NamedTuple):
+    """Interval during which a pump feeds one of its outputs"""
+    pump_index: int
+    output: int
+    start: float    # s
+    end: float      # s
+    tasks: List[str]
+
+
+class SequenceSimulation(NamedTuple):
+    """
+    Time series of a wash sequence. Flows of the outputs are stored per
+    step; a nozzle always takes the same share of its output's flow, so
+    its series is derived on demand by nozzle_flow().
+    """
+    time: np.ndarray                    # (steps,) s
+    windows: List[OutputWindow]
+    outputs: List[Tuple[int, int]]      # (pump_index, output) of each flow column
+    output_flow: np.ndarray             # (steps, outputs) m3/s
+    pump_power: np.ndarray              # (steps, pumps) W, hydraulic
+    pumps: List[int]                    # pump_index of each power column
+    consumed: np.ndarray                # (steps,) m3 sprayed since the start
+    tank_volume: np.ndarray             # (steps,) m3 left in the tank
+    # (pump_index, output, circuit item id) of a nozzle -> (output column, share of its flow);
+    # names are not unique, the same component can sit on several outputs
+    nozzle_share: Dict[Tuple[int, int, Any], Tuple[int, float]]
+    empty_at: Optional[float]           # s when the tank ran dry, None if it did not
+    warnings: List[str]
+
+    def nozzle_flow(self, pump_index: int, output: int, component: Any) -> np.ndarray:
+        """Flow (m3/s) at every step of the nozzle at circuit item `component` on a pump output"""
+        column, share = self.nozzle_share[(pump_index, output, component)]
+        return self.output_flow[:, column] * share
+
+    def total_flow(self) -> np.ndarray:
+        return self.output_flow.sum(axis=1)
+
+
+def schedule(tasks: List[Dict[str, Any]]) -> List[OutputWindow]:
+    """
+    Output windows of a Sequences configuration, laid out like the
+    sequence visualizer: pumps run in parallel; on each pump the outputs
+    run one after the other, outputs holding a 'P' task first, and the
+    tasks of one output start together and the output stays on until the
+    longest of them ends.
+    """
+    by_pump: Dict[int, Dict[int, List[Dict[str, Any]]]] = {}
+    for task in tasks:
+        duration = _as_float(task.get('duration_seconds'), 0.0)
+        if duration <= 0:
+            continue
+        pump_index = int(task.get('pump_index') or 0)
+        output = int(_as_float(task.get('output_num'), 1))
+        by_pump.setdefault(pump_index, {}).setdefault(output, []).append(task)
+
+    windows = []
+    for pump_index, outputs in sorted(by_pump.items()):
+        priority = {output: 0 if any(t.get('priority') == 'P' for t in group) else 1
+                    for output, group in outputs.items()}
+        start = 0.0
+        for output in sorted(outputs, key=lambda o: (priority[o], str(o))):
+            group = outputs[output]
+            end = start + max(_as_float(t.get('duration_seconds'), 0.0) for t in group)
+            windows.append(OutputWindow(pump_index, output, start, end, [t.get('name', '') for t in group]))
+            start = end
+    return windows
+
+
+def liquid_volume(general: Dict[str, Any]) -> Optional[float]:
+    """General Settings liquid volume in m3, None when not entered"""
+    volume = general.get('liquid_volume', {}) or {}
+    value = _as_float(volume.get('value'), float('nan'))
+    if value != value:
+        return None
+    return value * LITRE / 1000.0 if volume.get('unit') == 'mL' else value * LITRE
+
+
+class SequenceSimulator:
+    """
+    Steps a wash sequence against the hydraulic model.
+
+    The steady operating point of every output comes from the (cached)
+    hydraulic solver; the transient is the pump spin-up at the start of
+    each output window, speed n(t) = 1 - exp(-t / spin_up), with the
+    affinity laws Q ~ n, p ~ n^2 and power ~ n^3. Every series is built
+    with array operations over all time steps at once, so the cost does
+    not depend on Python work per step.
+    """
+
+    def __init__(self, hydraulic_solver: HydraulicSolver, time_step: float = DEFAULT_TIME_STEP_S,
+                 spin_up: float = DEFAULT_SPIN_UP_S):
+        self.solver = hydraulic_solver
+        self.time_step = time_step
+        self.spin_up = spin_up
+
+    def simulate(self, config_data: Dict[str, Any], results: Optional[List[CircuitResult]] = None) -> SequenceSimulation:
+        """
+        Simulate the sequence of a MainController configuration. Pass the
+        results of solve_configuration() when they are already at hand.
+        """
+        sequence = (config_data.get('sequences', {}) or {}).get('sequence_configuration', {}) or {}
+        windows = schedule(sequence.get('tasks', []) or [])
+        if results is None:
+            results = self.solver.solve_configuration(config_data)
+        warnings = []
+
+        steady = {}
+        for result in results:
+            for output in result.outputs:
+                steady[(result.pump_index, output.output)] = output
+
+        outputs = sorted({(w.pump_index, w.output) for w in windows})
+        pumps = sorted({pump_index for pump_index, _ in outputs})
+        columns = {key: i for i, key in enumerate(outputs)}
+        flow_ss = np.zeros(len(outputs))
+        power_ss = np.zeros(len(outputs))
+        nozzle_share = {}
+        for key, column in columns.items():
+            output = steady.get(key)
+            if output is None:
+                warnings.append(f"Pump {key[0] + 1} output {key[1]} has no solved circuit, no flow assumed")
+                continue
+            flow_ss[column] = output.flow
+            power_ss[column] = output.flow * output.pressure
+            for nozzle in output.nozzles():
+                if output.flow > 0:
+                    nozzle_share[(*key, nozzle.id)] = (column, nozzle.flow / output.flow)
+
+        total = max((w.end for w in windows), default=0.0)
+        steps = int(np.ceil(total / self.time_step)) + 1
+        t = np.arange(steps) * self.time_step
+
+        # Speed of the pump feeding each column: windows never overlap on a pump,
+        # so each step falls in at most one window per column
+        speed = np.zeros((steps, len(outputs)))
+        for window in windows:
+            first, last = np.searchsorted(t, [window.start, window.end])
+            elapsed = t[first:last] - window.start
+            speed[first:last, columns[(window.pump_index, window.output)]] = -np.expm1(-elapsed / self.spin_up)
+
+        output_flow = speed * flow_ss
+        column_power = speed ** 3 * power_ss
+        membership = np.array([[pump_index == pump for pump in pumps] for pump_index, _ in outputs], dtype=float)
+        pump_power = column_power @ membership.reshape(len(outputs), len(pumps))
+
+        # Trapezoidal volume sprayed up to each step
+        total_flow = output_flow.sum(axis=1)
+        consumed = np.concatenate([[0.0], np.cumsum((total_flow[1:] + total_flow[:-1]) * 0.5 * self.time_step)])
+
+        volume = liquid_volume(config_data.get('general_settings', {}) or {})
+        empty_at = None
+        if volume is None:
+            tank = np.full(steps, np.nan)
+        else:
+            dry = int(np.searchsorted(consumed, volume, side='right'))
+            if dry < steps:
+                empty_at = float(t[dry])
+                warnings.append(f"Tank runs dry at {empty_at:.2f} s")
+                output_flow[dry:] = 0.0
+                pump_power[dry:] = 0.0
+                consumed[dry:] = volume
+            tank = volume - consumed
+
+        return SequenceSimulation(t, windows, outputs, output_flow, pump_power, pumps, consumed, tank,
+                                  nozzle_share, empty_at, warnings)
+
+
+def _step_loop(windows, columns, flow_ss, time_step, spin_up):
+    """Reference explicit integration, one Python iteration per time step"""
+    total = max(w.end for w in windows)
+    consumed, t, flows = 0.0, 0.0, []
+    while t <= total:
+        step = [0.0] * len(columns)
+        for window in windows:
+            if window.start <= t < window.end:
+                column = columns[(window.pump_index, window.output)]
+                step[column] = flow_ss[column] * (1.0 - np.exp(-(t - window.start) / spin_up))
+        flows.append(step)
+        consumed += sum(step) * time_step
+        t += time_step
+    return consumed
+
+
+if __name__ == "__main__":
+    from utils.fluid_properties import FluidPropertyTable
+    from utils.hydraulics import _synthetic_circuit
+    from utils.pump_catalog import FALLBACK_PUMP_ROWS, PumpCatalog
+
+    solver = HydraulicSolver(FluidPropertyTable([]), PumpCatalog(FALLBACK_PUMP_ROWS))
+    simulator = SequenceSimulator(solver)
+    pump = solver.pump_catalog.names()[0]
+    tasks = []
+    for pump_index in range(3):
+        for output in (1, 2):
+            for nozzle in range(4):
+                tasks.append({'name': f"N{pump_index}{output}{nozzle}", 'duration_seconds': 60.0 + 30 * nozzle,
+                              'priority': 'P' if output == 1 else 'S', 'pump_index': pump_index,
+                              'output_num': str(output)})
+    config = {
+        'general_settings': {'liquid_volume': {'value': '12', 'unit': 'L'}},
+        'pumps': [{'Pump Name': pump} for _ in range(3)],
+        'circuits': [{'pump_index': i, 'circuit': _synthetic_circuit(4, 3)} for i in range(3)],
+        'sequences': {'sequence_configuration': {'tasks': tasks}},
+    }
+    results = solver.solve_configuration(config)
+
+    for step in (1e-2, 1e-3):
+        simulator.time_step = step
+        start = time.perf_counter()
+        simulation = simulator.simulate(config, results)
+        elapsed = time.perf_counter() - start
+        print(f"{simulation.time[-1]:.0f} s at {step * 1e3:g} ms ({len(simulation.time)} steps): {elapsed * 1e3:.1f} ms, "
+              f"sprayed {simulation.consumed[-1] / LITRE:.3f} L, peak power {simulation.pump_power.sum(axis=1).max():.1f} W"
+              + (f", dry at {simulation.empty_at:.1f} s" if simulation.empty_at is not None else ""))
+
+    config['general_settings']['liquid_volume']['value'] = '100'
+    simulator.time_step = 1e-3
+    simulation = simulator.simulate(config, results)
+    columns = {key: i for i, key in enumerate(simulation.outputs)}
+    flow_ss = np.array([next(o.flow for r in results if r.pump_index == p for o in r.outputs if o.output == n)
+                        for p, n in simulation.outputs])
+    start = time.perf_counter()
+    reference = _step_loop(simulation.windows, columns, flow_ss, 1e-3, simulator.spin_up)
+    loop = time.perf_counter() - start
+    print(f"Python step loop: {loop * 1e3:.0f} ms, sprayed {reference / LITRE:.3f} L "
+          f"(vectorized {simulation.consumed[-1] / LITRE:.3f} L)")
+    key = next(iter(simulation.nozzle_share))
+    print(f"Nozzle {key[2]} on pump {key[0] + 1} output {key[1]} "
+          f"({len(simulation.nozzle_share)} nozzles): {simulation.nozzle_flow(*key).max() / LITRES_PER_MINUTE:.3f} L/min at full speed")
@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.catalog_columns import find_column, lookup_column
+from utils.hydraulics import _as_float
+from utils.nozzle_catalog import NozzleCatalog, washing_component_rows
+from utils.pump_catalog import _number
+
+# Surface washed when the component catalog gives no size, e.g. a camera window
+DEFAULT_SURFACE_MM = (100.0, 60.0)
+# Even a solid jet widens a little before it lands
+MIN_HALF_ANGLE_DEG = 2.0
+RESOLUTION = 64
+
+
+class CoverageRaster(NamedTuple):
+    """Spray footprint on a component surface, cell (row, column) = (y, x) from the top left corner"""
+    flux: np.ndarray        # (rows, columns) share of the nozzle flow landing per m2
+    width: float            # m
+    height: float           # m
+    coverage: float         # share of the surface the spray reaches
+    captured: float         # share of the nozzle flow landing on the surface
+
+    @property
+    def cell_area(self) -> float:
+        rows, columns = self.flux.shape
+        return self.width * self.height / (rows * columns)
+
+
+class CoverageEngine:
+    """
+    Rasterizes spray footprints onto component surfaces.
+
+    The nozzle sits D_C_N away from the centre of the surface, its jet
+    axis tilted from the surface normal by the integration angle. The jet
+    is a cone of the catalog spray angle with a uniform flow per solid
+    angle; a surface cell inside the cone receives flow in proportion to
+    cos(incidence) / r^2. Rasters are cached per (nozzle, distance,
+    angle, surface) key and missing ones are computed in one batch.
+    """
+
+    CACHE_SIZE = 1024
+
+    def __init__(self, nozzle_catalog: NozzleCatalog, component_records: Optional[List[Dict[str, Any]]] = None,
+                 resolution: int = RESOLUTION):
+        self.nozzle_catalog = nozzle_catalog
+        self.resolution = resolution
+        self._surfaces = self._surface_sizes(component_records or [])
+        self._rasters: "OrderedDict[Tuple, CoverageRaster]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_data_manager(cls, data_manager, **options) -> "CoverageEngine":
+        try:
+            records = data_manager.get_component_data()
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Component catalog unavailable, using default surfaces: {e}")
+            records = []
+        return cls(data_manager.get_nozzle_catalog(), records, **options)
+
+    @staticmethod
+    def _surface_sizes(records: List[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+        """Surface width and height (mm) of the catalog components that give them"""
+        columns = list(records[0].keys()) if records else []
+        name_column = lookup_column('washing_components', 'name', columns)
+        width_column = find_column(columns, ['Width (mm)', 'Width'], ['width'])
+        height_column = find_column(columns, ['Height (mm)', 'Height'], ['height'])
+        sizes = {}
+        for record in records:
+            width, height = _number(record.get(width_column)), _number(record.get(height_column))
+            if name_column and width and height:
+                sizes[str(record.get(name_column))] = (width, height)
+        return sizes
+
+    def surface(self, component: Optional[str]) -> Tuple[float, float]:
+        """Width and height (mm) of a component surface"""
+        return self._surfaces.get(component, DEFAULT_SURFACE_MM)
+
+    # --- Rasters ---
+
+    def raster(self, nozzle_ref: str, distance_mm: float, angle_deg: float,
+               component: Optional[str] = None) -> CoverageRaster:
+        return self.rasters([(nozzle_ref, distance_mm, angle_deg, component)])[0]
+
+    def rasters(self, items: List[Tuple[str, float, float, Optional[str]]]) -> List[CoverageRaster]:
+        """Raster of each (nozzle ref, D_C_N mm, integration angle deg, component name)"""
+        keys, rasters, missing = [], [], []
+        for position, (ref, distance, angle, component) in enumerate(items):
+            key = (ref, float(distance), float(angle), self.surface(component))
+            with self._lock:
+                raster = self._rasters.get(key)
+                if raster is not None:
+                    self._rasters.move_to_end(key)
+            keys.append(key)
+            rasters.append(raster)
+            if raster is None:
+                missing.append(position)
+
+        if missing:
+            unique = list(dict.fromkeys(keys[position] for position in missing))
+            computed = dict(zip(unique, self._rasterize(unique)))
+            with self._lock:
+                for key, raster in computed.items():
+                    self._rasters[key] = raster
+                while len(self._rasters) > self.CACHE_SIZE:
+                    self._rasters.popitem(last=False)
+            for position in missing:
+                rasters[position] = computed[keys[position]]
+        return rasters
+
+    def _rasterize(self, keys: List[Tuple]) -> List[CoverageRaster]:
+        """Footprints of many keys at once, one (keys, rows, columns) array per quantity"""
+        n = self.resolution
+        half_angle = np.radians(np.maximum([self._spray_angle(ref) / 2.0 for ref, *_ in keys],
+                                           MIN_HALF_ANGLE_DEG))[:, None, None]
+        distance = np.maximum([key[1] for key in keys], 1.0)[:, None, None] * 1e-3
+        tilt = np.radians([key[2] for key in keys])[:, None, None]
+        width = np.array([key[3][0] for key in keys])[:, None, None] * 1e-3
+        height = np.array([key[3][1] for key in keys])[:, None, None] * 1e-3
+
+        # Cell centres on the surface plane, origin at its centre
+        unit = (np.arange(n) + 0.5) / n - 0.5
+        x = unit[None, None, :] * width
+        y = -unit[None, :, None] * height
+
+        # Vector from the nozzle, at distance * (sin tilt, 0, cos tilt), to each cell
+        vx = x - distance * np.sin(tilt)
+        vz = -distance * np.cos(tilt)
+        r2 = vx ** 2 + y ** 2 + vz ** 2
+        r = np.sqrt(r2)
+        # Angle to the jet axis -(sin tilt, 0, cos tilt) and incidence on the surface
+        cos_axis = -(vx * np.sin(tilt) + vz * np.cos(tilt)) / r
+        cos_incidence = -vz / r
+
+        solid_angle = 2.0 * np.pi * (1.0 - np.cos(half_angle))
+        flux = np.where(cos_axis >= np.cos(half_angle), cos_incidence / (r2 * solid_angle), 0.0)
+
+        cell_area = (width * height)[:, 0, 0] / (n * n)
+        # A footprint smaller than a cell lands on the cell under the jet axis, the centre
+        spot = ~(flux > 0).any(axis=(1, 2))
+        flux[spot, n // 2, n // 2] = 1.0 / cell_area[spot]
+        coverage = (flux > 0).mean(axis=(1, 2))
+        captured = flux.sum(axis=(1, 2)) * cell_area
+        return [
+            CoverageRaster(flux[k], float(width[k, 0, 0]), float(height[k, 0, 0]), float(coverage[k]),
+                           float(min(captured[k], 1.0)))
+            for k in range(len(keys))
+        ]
+
+    def _spray_angle(self, ref: str) -> float:
+        info = self.nozzle_catalog.info(ref)
+        return info.spray_angle if info else 0.0
+
+    # --- Configurations ---
+
+    def configuration_coverage(self, config_data: Dict[str, Any]) -> Dict[str, CoverageRaster]:
+        """Raster of every washing component of a configuration, by component name"""
+        rows = washing_component_rows(config_data)
+        items = [(str(row.get('Nozzle Ref', '')), _as_float(row.get('D_C_N (mm)'), 0.0),
+                  _as_float(row.get('Intergration Angle'), 0.0), name) for name, row in rows.items()]
+        return dict(zip(rows, self.rasters(items)))
+
+    def clear_cache(self):
+        with self._lock:
+            self._rasters.clear()
+
+
+if __name__ == "__main__":
+    from utils.nozzle_catalog import FALLBACK_NOZZLE_ROWS
+
+    engine = CoverageEngine(NozzleCatalog(FALLBACK_NOZZLE_ROWS))
+    refs = engine.nozzle_catalog.names()
+    items = [(refs[i % 3], 50.0 + 10 * (i % 20), 5.0 * (i % 12), None) for i in range(200)]
+
+    start = time.perf_counter()
+    rasters = engine.rasters(items)
+    batched = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.rasters(items)
+    cached = time.perf_counter() - start
+    engine.clear_cache()
+    start = time.perf_counter()
+    for item in items:
+        engine.raster(*item)
+    separate = time.perf_counter() - start
+    print(f"{len(items)} components ({engine.resolution}x{engine.resolution}): batch {batched * 1e3:.1f} ms "
+          f"({batched / len(items) * 1e3:.3f} ms each), one by one {separate / len(items) * 1e3:.3f} ms each, "
+          f"cached {cached * 1e3:.2f} ms")
+    for item, raster in list(zip(items, rasters))[:3]:
+        print(f"{item[0]} at {item[1]:.0f} mm, {item[2]:.0f} deg: coverage {raster.coverage:.1%}, "
+              f"captured {raster.captured:.1%}")
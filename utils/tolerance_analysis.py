@@ -0,0 +1,273 @@
+import os
+import threading
+import time
+from concurrent.futures import as_completed
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.hydraulics import (DEFAULT_LIQUID, HydraulicSolver, NozzleSpec, VariantResult, circuit_entries,
+                              operating_temperature, operating_voltage, solver_pool, worker_solver)
+from utils.pump_catalog import LITRES_PER_MINUTE
+from utils.sequence_simulation import schedule
+
+PERCENTILES = (5.0, 50.0, 95.0)
+# Pressure grid of the variant solves: within 0.1 % of a 1024-sample grid,
+# far inside the tolerance bands, at a quarter of the default cost
+PRESSURE_SAMPLES = 64
+
+
+class Tolerances(NamedTuple):
+    """Standard deviations of the deviations from nominal, sampled as truncated normals"""
+    length: float = 0.03        # relative, each pipe on its own
+    diameter: float = 0.02      # relative, each pipe on its own
+    temperature: float = 5.0    # °C, whole configuration
+    pump: float = 0.05          # relative pump speed, Q ~ s and p ~ s^2
+    limit: float = 3.0          # samples are cut at this many standard deviations
+
+
+class NozzleBands(NamedTuple):
+    """Percentiles (see ToleranceResult.percentiles) of one nozzle over all variants"""
+    pump_index: int
+    output: int
+    name: str
+    pressure: np.ndarray        # Pa at the nozzle inlet
+    flow: np.ndarray            # m3/s
+    consumption: np.ndarray     # m3 over its sequence window, nan when it has no task
+
+
+class ToleranceResult(NamedTuple):
+    variants: int
+    percentiles: Tuple[float, ...]
+    nozzles: List[NozzleBands]
+    elapsed: float              # s
+
+
+class _Chunk(NamedTuple):
+    """Variants first .. first + count - 1 of every circuit of a configuration"""
+    circuits: List[Tuple[int, Dict[str, Any], str, Dict[Any, NozzleSpec]]]   # (pump_index, circuit, pump, nozzles)
+    voltage: float
+    liquid_name: str
+    temperature: float
+    tolerances: Tolerances
+    seed: int
+    first: int
+    count: int
+
+
+def _run_chunk(chunk: _Chunk) -> List[Tuple[int, VariantResult]]:
+    """Module level so process pools can pickle it"""
+    return evaluate_chunk(worker_solver(), chunk)
+
+
+def evaluate_chunk(solver: HydraulicSolver, chunk: _Chunk) -> List[Tuple[int, VariantResult]]:
+    """
+    Sample and solve one chunk of variants. The samples depend only on the
+    seed and the chunk position, so results do not depend on how chunks
+    are spread over workers.
+    """
+    tolerances = chunk.tolerances
+
+    def deviations(rng, shape):
+        return np.clip(rng.standard_normal(shape), -tolerances.limit, tolerances.limit)
+
+    # One temperature per variant, shared by every pump of the configuration
+    rng = np.random.default_rng([chunk.seed, chunk.first])
+    temperatures = chunk.temperature + tolerances.temperature * deviations(rng, chunk.count)
+
+    results = []
+    for pump_index, circuit, pump_name, nozzles in chunk.circuits:
+        network = solver.network(circuit)
+        rng = np.random.default_rng([chunk.seed, chunk.first, pump_index])
+        connections = len(network.connections)
+        length_scale = np.maximum(1.0 + tolerances.length * deviations(rng, (chunk.count, connections)), 0.0)
+        diameter_scale = np.maximum(1.0 + tolerances.diameter * deviations(rng, (chunk.count, connections)), 0.1)
+        pump_scale = np.maximum(1.0 + tolerances.pump * deviations(rng, chunk.count), 0.1)
+        for variant in solver.solve_variants(network, pump_name, chunk.voltage, chunk.liquid_name, temperatures,
+                                             length_scale, diameter_scale, pump_scale, nozzles,
+                                             samples=PRESSURE_SAMPLES):
+            results.append((pump_index, variant))
+    return results
+
+
+class ToleranceAnalysis:
+    """
+    Monte Carlo tolerance analysis of a configuration.
+
+    Pipe lengths and diameters, the liquid temperature and the pump curve
+    are sampled around nominal and every variant is solved with the
+    batched hydraulic solver. Variants are split into chunks spread over a
+    process pool whose workers get the catalogs once, at start-up. start()
+    runs the analysis on a background thread; the UI polls progress() and
+    result() from `after` callbacks so it never blocks.
+    """
+
+    def __init__(self, hydraulic_solver: HydraulicSolver, tolerances: Tolerances = Tolerances(),
+                 variants: int = 2000, chunk_size: int = 100, workers: Optional[int] = None,
+                 seed: Optional[int] = None):
+        self.solver = hydraulic_solver
+        self.tolerances = tolerances
+        self.variants = variants
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.seed = int(np.random.SeedSequence().entropy % 2 ** 32) if seed is None else seed
+        self._lock = threading.Lock()
+        self._done = 0
+        self._result: Optional[ToleranceResult] = None
+        self._error: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Background run ---
+
+    def start(self, config_data: Dict[str, Any]):
+        """Run the analysis on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, args=(config_data,), name="tolerance-analysis",
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self, config_data: Dict[str, Any]):
+        try:
+            self.run(config_data)
+        except Exception as e:
+            print(f"Tolerance analysis failed: {e}")
+            with self._lock:
+                self._error = str(e)
+
+    def progress(self) -> Tuple[int, int]:
+        """(variants solved, variants requested)"""
+        with self._lock:
+            return self._done, self.variants
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def result(self) -> Optional[ToleranceResult]:
+        with self._lock:
+            return self._result
+
+    def error(self) -> Optional[str]:
+        with self._lock:
+            return self._error
+
+    def cancel(self):
+        self._cancelled.set()
+
+    # --- Analysis ---
+
+    def chunks(self, config_data: Dict[str, Any]) -> List[_Chunk]:
+        """The variants of a configuration, split into chunks"""
+        general = config_data.get('general_settings', {}) or {}
+        pumps = config_data.get('pumps', []) or []
+        circuits = []
+        for entry in circuit_entries(config_data):
+            pump_index = entry.get('pump_index', 0)
+            pump_row = pumps[pump_index] if 0 <= pump_index < len(pumps) else {}
+            circuit = entry.get('circuit', {})
+            circuits.append((pump_index, circuit, pump_row.get('Pump Name', ''),
+                             self.solver.nozzle_specs(config_data, circuit)))
+        return [
+            _Chunk(circuits, operating_voltage(general), general.get('liquid_name') or DEFAULT_LIQUID,
+                   operating_temperature(general), self.tolerances, self.seed, first,
+                   min(self.chunk_size, self.variants - first))
+            for first in range(0, self.variants, self.chunk_size)
+        ]
+
+    def run(self, config_data: Dict[str, Any]) -> Optional[ToleranceResult]:
+        """Blocking analysis; returns None when cancelled"""
+        start = time.perf_counter()
+        chunks = self.chunks(config_data)
+        with self._lock:
+            self._done, self._result, self._error = 0, None, None
+        self._cancelled.clear()
+
+        collected: Dict[Tuple[int, int], List[VariantResult]] = {}
+
+        def collect(chunk, results):
+            for pump_index, variant in results:
+                collected.setdefault((pump_index, variant.output), []).append(variant)
+            with self._lock:
+                self._done += chunk.count
+
+        workers = self.workers or os.cpu_count() or 1
+        if workers <= 1 or len(chunks) == 1:
+            for chunk in chunks:
+                if self._cancelled.is_set():
+                    return None
+                collect(chunk, evaluate_chunk(self.solver, chunk))
+        else:
+            with solver_pool(self.solver, workers) as pool:
+                futures = {pool.submit(_run_chunk, chunk): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    if self._cancelled.is_set():
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return None
+                    collect(futures[future], future.result())
+
+        result = ToleranceResult(self.variants, PERCENTILES, self._bands(config_data, collected),
+                                 time.perf_counter() - start)
+        with self._lock:
+            self._result = result
+        return result
+
+    @staticmethod
+    def _bands(config_data: Dict[str, Any], collected: Dict[Tuple[int, int], List[VariantResult]]) -> List[NozzleBands]:
+        """Percentile bands of every nozzle; consumption uses the sequence window of its output"""
+        sequence = (config_data.get('sequences', {}) or {}).get('sequence_configuration', {}) or {}
+        duration = {(w.pump_index, w.output): w.end - w.start for w in schedule(sequence.get('tasks', []) or [])}
+
+        bands = []
+        for (pump_index, output), variants in sorted(collected.items()):
+            pressure = np.concatenate([v.nozzle_pressure for v in variants])
+            flow = np.concatenate([v.nozzle_flow for v in variants])
+            consumption = flow * duration.get((pump_index, output), np.nan)
+            pressure_bands = np.percentile(pressure, PERCENTILES, axis=0)
+            flow_bands = np.percentile(flow, PERCENTILES, axis=0)
+            consumption_bands = np.percentile(consumption, PERCENTILES, axis=0)
+            for i, name in enumerate(variants[0].nozzles):
+                bands.append(NozzleBands(pump_index, output, name, pressure_bands[:, i], flow_bands[:, i],
+                                         consumption_bands[:, i]))
+        return bands
+
+
+if __name__ == "__main__":
+    from utils.fluid_properties import FluidPropertyTable
+    from utils.hydraulics import _synthetic_circuit
+    from utils.pump_catalog import FALLBACK_PUMP_ROWS, PumpCatalog
+
+    solver = HydraulicSolver(FluidPropertyTable([]), PumpCatalog(FALLBACK_PUMP_ROWS))
+    pump = solver.pump_catalog.names()[0]
+    config = {
+        'general_settings': {},
+        'pumps': [{'Pump Name': pump} for _ in range(3)],
+        'circuits': [{'pump_index': i, 'circuit': _synthetic_circuit(4, 3)} for i in range(3)],
+        'sequences': {'sequence_configuration': {'tasks': [
+            {'name': 'WC 2', 'duration_seconds': 10.0, 'priority': 'P', 'pump_index': 0, 'output_num': 1}
+        ]}},
+    }
+
+    # Reference: one cached solve per variant would not apply, every variant differs
+    start = time.perf_counter()
+    for _ in range(20):
+        solver.clear_cache()
+        solver.solve_configuration(config)
+    print(f"Circuit solver, one variant at a time: {(time.perf_counter() - start) / 20 * 1e3:.1f} ms per variant")
+
+    for workers in (1, 2, 4):
+        analysis = ToleranceAnalysis(solver, variants=2000, chunk_size=100, workers=workers, seed=1)
+        analysis.start(config)
+        polls = 0
+        while analysis.is_running():
+            polls += 1
+            time.sleep(0.05)
+        result = analysis.result()
+        print(f"{result.variants} variants, {workers} worker(s): {result.elapsed * 1e3:.0f} ms "
+              f"({result.elapsed / result.variants * 1e3:.2f} ms per variant, polled {polls} times)")
+
+    nozzle = result.nozzles[1]
+    print(f"{nozzle.name} (pump {nozzle.pump_index + 1}, output {nozzle.output}): "
+          f"pressure {nozzle.pressure[0] / 1000:.1f} / {nozzle.pressure[1] / 1000:.1f} / {nozzle.pressure[2] / 1000:.1f} kPa, "
+          f"flow {nozzle.flow[0] / LITRES_PER_MINUTE:.3f} / {nozzle.flow[1] / LITRES_PER_MINUTE:.3f} / "
+          f"{nozzle.flow[2] / LITRES_PER_MINUTE:.3f} L/min, consumption {nozzle.consumption[1] * 1e6:.1f} mL (P50)")